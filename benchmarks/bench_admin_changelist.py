@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: benchmarks/bench_admin_changelist.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Admin MealEntry changelist latency on a large table. Rows are generated
+in SQL (recursive CTE), so tens of millions take minutes, not hours.
+
+    python benchmarks/bench_admin_changelist.py --meals 50000000
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def fill(meals: int, users: int, foods: int, days: int) -> None:
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < %s)
+            INSERT INTO calories_mealentry (user_id, date, food_id, quantity_g)
+            SELECT (SELECT MIN(id) FROM auth_user) + abs(random()) %% %s,
+                   date('now', '-' || (abs(random()) %% %s) || ' days'),
+                   (SELECT MIN(id) FROM calories_fooditem) + abs(random()) %% %s,
+                   20 + abs(random()) %% 380
+            FROM n
+            """,
+            [meals, users, days, foods],
+        )
+        cursor.execute("ANALYZE")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Admin changelist latency at scale.")
+    parser.add_argument("--meals", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--foods", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=5 * 365)
+    parser.add_argument("--db", help="reuse an already filled database file")
+    args = parser.parse_args()
+
+    from harness import bootstrap, seed
+
+    db = bootstrap(args.db)
+    from django.contrib.auth.models import User
+    from django.test import Client
+
+    from calories.models import MealEntry
+
+    if not MealEntry.objects.exists():
+        t0 = time.perf_counter()
+        seed(args.users, args.foods, 0)
+        fill(args.meals, args.users, args.foods, args.days)
+        print(f"filled {args.meals} meals in {time.perf_counter() - t0:.1f}s")
+    print(f"database: {db}")
+    admin = User.objects.create_superuser(f"admin{time.time_ns()}", password="bench-pass")
+    client = Client()
+    client.force_login(admin)
+    user_id = MealEntry.objects.values_list("user_id", flat=True).first()
+    cases = {
+        "changelist": {},
+        "page 20": {"p": 20},
+        "user filter": {"user__id__exact": user_id},
+        "year drill-down": {
+            "date__year": MealEntry.objects.values_list("date", flat=True).first().year,
+        },
+    }
+    for name, params in cases.items():
+        client.get("/admin/calories/mealentry/", params)  # warm
+        t0 = time.perf_counter()
+        r = client.get("/admin/calories/mealentry/", params)
+        assert r.status_code == 200
+        print(f"{name:<16} {(time.perf_counter() - t0) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
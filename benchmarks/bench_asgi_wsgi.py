@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: benchmarks/bench_asgi_wsgi.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Throughput of the same app deployed as WSGI (sync views, thread pool) vs.
+ASGI (async views, one event loop), driven in-process.
+
+    python benchmarks/bench_asgi_wsgi.py --concurrency 16 --seconds 5
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PATHS = ["/", "/meals/", "/foods/search/?q=food+12"]
+
+
+def run_wsgi(usernames: list[str], concurrency: int, seconds: float) -> int:
+    from django.contrib.auth.models import User
+    from django.test import Client
+
+    deadline = time.perf_counter() + seconds
+    done = []
+    lock = threading.Lock()
+
+    def worker(i: int) -> None:
+        client = Client()
+        client.force_login(User.objects.get(username=usernames[i % len(usernames)]))
+        n = 0
+        while time.perf_counter() < deadline:
+            assert client.get(PATHS[n % len(PATHS)]).status_code == 200
+            n += 1
+        with lock:
+            done.append(n)
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    return sum(done)
+
+
+def run_asgi(usernames: list[str], concurrency: int, seconds: float) -> int:
+    from django.contrib.auth.models import User
+    from django.test import AsyncClient
+
+    async def worker(i: int) -> int:
+        client = AsyncClient()
+        await client.aforce_login(await User.objects.aget(username=usernames[i % len(usernames)]))
+        deadline = time.perf_counter() + seconds
+        n = 0
+        while time.perf_counter() < deadline:
+            assert (await client.get(PATHS[n % len(PATHS)])).status_code == 200
+            n += 1
+        return n
+
+    async def main() -> int:
+        return sum(await asyncio.gather(*(worker(i) for i in range(concurrency))))
+
+    return asyncio.run(main())
+
+
+def child(args: argparse.Namespace) -> None:
+    from harness import bootstrap
+
+    bootstrap(args.db, CALORIES_ASYNC_VIEWS=args.mode == "asgi")
+    usernames = json.loads(Path(args.db + ".users").read_text())
+    runner = run_asgi if args.mode == "asgi" else run_wsgi
+    total = runner(usernames, args.concurrency, args.seconds)
+    print(json.dumps({"mode": args.mode, "requests": total, "rps": total / args.seconds}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="WSGI vs ASGI throughput.")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--foods", type=int, default=2000)
+    parser.add_argument("--meals-per-user", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--mode", choices=["wsgi", "asgi"], help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+    if args.mode:
+        child(args)
+        return
+
+    from harness import bootstrap, seed
+
+    db = bootstrap()
+    usernames = seed(args.users, args.foods, args.meals_per_user)
+    Path(db + ".users").write_text(json.dumps(usernames))
+    results = []
+    for mode in ("wsgi", "asgi"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--db", db,
+             "--concurrency", str(args.concurrency), "--seconds", str(args.seconds)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    for r in results:
+        print(f"{r['mode']}: {r['requests']} requests, {r['rps']:.1f} req/s")
+    print(f"asgi/wsgi = {results[1]['rps'] / results[0]['rps']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: benchmarks/bench_catalog.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+kcal for every meal: lazy FoodItem fetches vs. a select_related join vs.
+meal rows plus the memory-mapped catalog snapshot.
+
+    python benchmarks/bench_catalog.py --foods 50000 --meals-per-user 2000
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Meal kcal via join vs. catalog snapshot.")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--foods", type=int, default=50000)
+    parser.add_argument("--meals-per-user", type=int, default=2000)
+    args = parser.parse_args()
+
+    from harness import bootstrap, seed
+
+    bootstrap()
+    seed(args.users, args.foods, args.meals_per_user)
+
+    from calories import catalog
+    from calories.models import MealEntry
+
+    t0 = time.perf_counter()
+    snap = catalog.get_snapshot()
+    print(f"snapshot build+map: {time.perf_counter() - t0:.3f}s for {len(snap)} foods "
+          f"({snap.columns.nbytes / 1e6:.1f} MB)")
+
+    meals = MealEntry.objects.order_by()[:2000]
+    t0 = time.perf_counter()
+    lazy = sum(m.food.calories_per_100g * m.quantity_g / 100 for m in meals)
+    print(f"lazy fetch (2000 meals):   {time.perf_counter() - t0:.3f}s")
+
+    t0 = time.perf_counter()
+    joined = sum(m.calories for m in MealEntry.objects.order_by().select_related("food"))
+    t_join = time.perf_counter() - t0
+    print(f"select_related (all):      {t_join:.3f}s")
+
+    t0 = time.perf_counter()
+    ids, qty = zip(*MealEntry.objects.order_by().values_list("food_id", "quantity_g"))
+    mapped = float(snap.kcal(ids, qty).sum())
+    t_snap = time.perf_counter() - t0
+    print(f"values_list + snapshot:    {t_snap:.3f}s  ({t_join / t_snap:.1f}x)")
+    assert abs(mapped - joined) / joined < 1e-3 and lazy > 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: benchmarks/bench_energy_batch.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Compare the per-row BMR/TDEE/target loop with the columnar batch engine.
+
+    python benchmarks/bench_energy_batch.py --rows 500000
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from calories.utils import (  # noqa: E402
+    energy_targets_batch,
+    mifflin_st_jeor,
+    target_calories_from_goal,
+    tdee_from_bmr,
+)
+
+
+def make_columns(rows: int, seed: int) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return {
+        "sex": rng.choice(np.array(["M", "F"]), rows),
+        "age": rng.integers(18, 80, rows),
+        "height_cm": rng.uniform(150, 200, rows),
+        "weight_kg": rng.uniform(45, 130, rows),
+        "activity_level": rng.choice(
+            np.array(["sedentary", "light", "moderate", "active", "very_active"]), rows
+        ),
+        "goal": rng.choice(np.array(["lose", "maintain", "gain"]), rows),
+    }
+
+
+def run_loop(cols: dict[str, np.ndarray]) -> list[float]:
+    rows = zip(
+        cols["sex"].tolist(), cols["age"].tolist(), cols["height_cm"].tolist(),
+        cols["weight_kg"].tolist(), cols["activity_level"].tolist(), cols["goal"].tolist(),
+    )
+    out = []
+    for sex, age, height, weight, activity, goal in rows:
+        bmr = mifflin_st_jeor(sex, age, height, weight)
+        out.append(target_calories_from_goal(tdee_from_bmr(bmr, activity), goal))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-row loop vs. batch energy targets.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cols = make_columns(args.rows, args.seed)
+
+    loop_best = batch_best = float("inf")
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        expected = run_loop(cols)
+        loop_best = min(loop_best, time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        result = energy_targets_batch(**cols)
+        batch_best = min(batch_best, time.perf_counter() - t0)
+
+    assert np.array_equal(result.target_calories, np.asarray(expected)), "batch != loop"
+    print(f"rows={args.rows}")
+    print(f"loop : {loop_best * 1000:9.2f} ms")
+    print(f"batch: {batch_best * 1000:9.2f} ms  ({loop_best / batch_best:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
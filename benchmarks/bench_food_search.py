@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: benchmarks/bench_food_search.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Build a FoodSearchIndex over a synthetic catalog and report lookup latency.
+
+    python benchmarks/bench_food_search.py --foods 500000 --queries 2000
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+from calories.search import FoodSearchIndex  # noqa: E402
+
+BASES = [
+    "chicken", "beef", "pork", "salmon", "tuna", "rice", "pasta", "bread", "cheese", "yogurt",
+    "apple", "banana", "orange", "potato", "tomato", "lentils", "beans", "oats", "almonds",
+    "milk", "spinach", "broccoli", "carrot", "egg", "tofu", "quinoa", "avocado", "butter",
+    "honey", "cereal",
+]
+STYLES = [
+    "raw", "cooked", "grilled", "fried", "baked", "canned", "frozen", "dried", "roasted", "smoked",
+    "organic", "low fat", "whole", "sliced", "steamed", "boiled", "sweetened", "unsalted",
+]
+
+
+def make_names(n: int, rng: random.Random) -> list[str]:
+    names = set()
+    while len(names) < n:
+        parts = [rng.choice(BASES), rng.choice(STYLES), rng.choice(BASES)]
+        names.add(f"{parts[0].title()} {parts[1]} with {parts[2]} #{rng.randrange(10**6)}")
+    return list(names)
+
+
+def typo(word: str, rng: random.Random) -> str:
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1:]
+
+
+def make_queries(n: int, rng: random.Random) -> list[str]:
+    queries = []
+    for _ in range(n):
+        kind = rng.random()
+        base = rng.choice(BASES)
+        if kind < 0.4:
+            queries.append(base[: rng.randint(2, len(base))])
+        elif kind < 0.7:
+            queries.append(f"{base} {rng.choice(STYLES)}")
+        else:
+            queries.append(typo(base, rng))
+    return queries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Food search latency benchmark.")
+    parser.add_argument("--foods", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = make_names(args.foods, rng)
+    t0 = time.perf_counter()
+    index = FoodSearchIndex(enumerate(names, start=1))
+    build = time.perf_counter() - t0
+
+    queries = make_queries(args.queries, rng)
+    timings = []
+    for q in queries:
+        t0 = time.perf_counter()
+        index.search(q, args.limit)
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+
+    def pct(p: float) -> float:
+        return timings[min(len(timings) - 1, int(p / 100 * len(timings)))]
+
+    print(f"foods={args.foods} build={build:.2f}s queries={args.queries}")
+    print(f"p50={pct(50):.2f} ms  p95={pct(95):.2f} ms  p99={pct(99):.2f} ms  "
+          f"max={timings[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: benchmarks/bench_load.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Load test of the whole app: simulated users log in, register, log meals,
+search foods and poll the dashboard concurrently, in threads and in
+several processes (like WSGI workers sharing one database).
+
+Requests go to ``config.wsgi.application`` in-process (the test client) or,
+with ``--transport http``, over sockets to a threaded local server started
+on the seeded database. Reports throughput, p50/p95/p99 latency and errors
+per URL name; "database_locked" counts SQLite lock failures. Settings
+profiles are environment variables (``--env``), recorded with the results so
+runs can be compared with ``--baseline``.
+
+    python benchmarks/bench_load.py --mix mixed --concurrency 8 --seconds 10
+    python benchmarks/bench_load.py --processes 4 --env DJANGO_SQLITE_TUNING=False \
+        --out default.json
+    python benchmarks/bench_load.py --processes 4 --out tuned.json --baseline default.json
+    python benchmarks/bench_load.py --transport http --mix "dashboard=5,log_meal=2,register=1"
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import platform
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+PASSWORD = "bench-pass"  # harness.seed()
+SIGNUP_PASSWORD = "load-Test-pass-42"  # passes the password validators
+MIXES = {
+    "browse": {"dashboard": 5, "meal_list": 3, "food_search": 3, "report": 1},
+    "logging": {"log_meal": 5, "bulk_log": 1, "dashboard": 3, "food_search": 3},
+    "mixed": {
+        "dashboard": 6, "meal_list": 2, "food_search": 4, "log_meal": 3,
+        "bulk_log": 1, "report": 1, "plan": 1, "register": 1,
+    },
+}
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    """A named mix, or ``action=weight,...``."""
+    if spec in MIXES:
+        return MIXES[spec]
+    mix = {}
+    for part in spec.split(","):
+        action, _, weight = part.partition("=")
+        if action not in ACTIONS:
+            raise ValueError(f"unknown action {action!r}; choose from {', '.join(sorted(ACTIONS))}")
+        mix[action] = int(weight or 1)
+    return mix
+
+
+def error_kind(exc: BaseException) -> str:
+    from django.db import OperationalError
+
+    if isinstance(exc, OperationalError) and "locked" in str(exc):
+        return "database_locked"
+    return type(exc).__name__
+
+
+# -- sessions: one simulated browser ------------------------------------------
+
+class InProcessSession:
+    """Requests through django.test.Client; view exceptions are caught and classified."""
+
+    def __init__(self) -> None:
+        from django.test import Client
+
+        self.client = Client()
+
+    def request(
+        self, method: str, path: str, data: dict | None = None, body: str | None = None,
+    ) -> tuple[int, str | None]:
+        try:
+            if body is not None:
+                response = self.client.post(path, body, content_type="application/json")
+            elif method == "POST":
+                response = self.client.post(path, data or {})
+            else:
+                response = self.client.get(path, data or {})
+        except Exception as exc:  # what the server would turn into a 500
+            return 500, error_kind(exc)
+        return response.status_code, None
+
+
+class HttpSession:
+    """Requests over HTTP with a cookie jar, sending the CSRF token like a browser."""
+
+    def __init__(self, base_url: str) -> None:
+        import http.cookiejar
+        import urllib.request
+
+        class NoRedirect(urllib.request.HTTPRedirectHandler):
+            def redirect_request(self, *args: Any) -> None:
+                return None
+
+        self.base_url = base_url.rstrip("/")
+        self.jar = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.jar), NoRedirect
+        )
+
+    def request(
+        self, method: str, path: str, data: dict | None = None, body: str | None = None,
+    ) -> tuple[int, str | None]:
+        import urllib.error
+        import urllib.parse
+        import urllib.request
+
+        url, payload, headers = self.base_url + path, None, {}
+        if method == "GET" and data:
+            url += "?" + urllib.parse.urlencode(data)
+        elif method == "POST":
+            token = next((c.value for c in self.jar if c.name == "csrftoken"), "")
+            headers["X-CSRFToken"] = token
+            if body is not None:
+                payload, headers["Content-Type"] = body.encode(), "application/json"
+            else:
+                payload = urllib.parse.urlencode(data or {}).encode()
+        request = urllib.request.Request(url, payload, headers, method=method)
+        try:
+            with self.opener.open(request, timeout=30) as r:
+                r.read()
+                return r.status, None
+        except urllib.error.HTTPError as exc:
+            exc.read()
+            return exc.code, None
+        except OSError as exc:
+            return 599, type(exc).__name__
+
+
+# -- actions -------------------------------------------------------------------
+
+class VirtualUser:
+    """One simulated user: logs in once, then runs actions from the mix."""
+
+    def __init__(self, session_factory: Callable[[], Any], username: str, food_ids: list[int],
+                 rng: random.Random,
+                 record: Callable[[str, float, int, int, str | None], None]) -> None:
+        from django.urls import reverse
+
+        self.new_session = session_factory
+        self.session = session_factory()
+        self.username = username
+        self.food_ids = food_ids
+        self.rng = rng
+        self.record = record
+        self.url = reverse
+
+    def call(self, name: str, method: str, expect: int, data: dict | None = None,
+             body: str | None = None, session: Any = None) -> bool:
+        t0 = time.perf_counter()
+        status, error = (session or self.session).request(method, self.url(name), data, body)
+        self.record(name, time.perf_counter() - t0, status, expect, error)
+        return status == expect
+
+    def login(
+        self, username: str | None = None, password: str = PASSWORD, session: Any = None,
+    ) -> bool:
+        self.call("login", "GET", 200, session=session)
+        credentials = {"username": username or self.username, "password": password}
+        return self.call("login", "POST", 302, credentials, session=session)
+
+    def dashboard(self) -> None:
+        self.call("dashboard", "GET", 200)
+
+    def meal_list(self) -> None:
+        self.call("meal_list", "GET", 200)
+
+    def report(self) -> None:
+        self.call("report", "GET", 200)
+
+    def food_search(self) -> None:
+        query = f"food {self.rng.randrange(10000):04d}"
+        self.call("food_search", "GET", 200, {"q": query, "limit": 10})
+
+    def plan(self) -> None:
+        self.call("plan_api", "GET", 200, {"kcal": self.rng.randrange(1400, 3200, 100),
+                                           "seed": self.rng.randrange(1000)})
+
+    def log_meal(self) -> None:
+        if self.call("meal_create", "GET", 200):
+            self.call("meal_create", "POST", 302, {
+                "date": date.today().isoformat(),
+                "food": self.rng.choice(self.food_ids),
+                "quantity_g": self.rng.randrange(20, 400),
+            })
+
+    def bulk_log(self) -> None:
+        entries = [
+            {"date": date.today().isoformat(), "food": self.rng.choice(self.food_ids),
+             "quantity_g": self.rng.randrange(20, 400)}
+            for _ in range(5)
+        ]
+        self.call("meal_bulk", "POST", 201, body=json.dumps({"entries": entries}))
+
+    def register(self) -> None:
+        """A new visitor signs up and logs in, in a session of their own."""
+        session = self.new_session()
+        username = f"load-{os.getpid()}-{threading.get_ident()}-{self.rng.randrange(10 ** 9)}"
+        self.call("register", "GET", 200, session=session)
+        form = {"username": username, "email": f"{username}@example.com",
+                "password1": SIGNUP_PASSWORD, "password2": SIGNUP_PASSWORD}
+        if self.call("register", "POST", 302, form, session=session):
+            self.login(username, SIGNUP_PASSWORD, session=session)
+
+
+ACTIONS = {
+    name for name in vars(VirtualUser) if not name.startswith("_")
+} - {"call", "login"}
+
+
+class Recorder:
+    """Latency samples and error counts per URL name, shared by threads."""
+
+    def __init__(self, start_at: float) -> None:
+        self.start_at = start_at
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, Counter] = defaultdict(Counter)
+        self.lock = threading.Lock()
+
+    def __call__(
+        self, name: str, elapsed: float, status: int, expect: int, error: str | None,
+    ) -> None:
+        if time.perf_counter() < self.start_at:
+            return  # warm-up
+        with self.lock:
+            self.samples[name].append(round(elapsed * 1000, 3))
+            if error or status != expect:
+                self.errors[name][error or f"http_{status}"] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        errors = {k: dict(v) for k, v in self.errors.items()}
+        return {"samples": dict(self.samples), "errors": errors}
+
+
+def run_threads(session_factory: Callable[[], Any], usernames: list[str], food_ids: list[int],
+                mix: dict[str, int], concurrency: int, seconds: float, warmup: float,
+                think_ms: float, seed: int) -> dict[str, Any]:
+    """Run ``concurrency`` virtual users for ``warmup + seconds``; returns raw samples."""
+    from django.db import connection
+
+    start_at = time.perf_counter() + warmup
+    deadline = start_at + seconds
+    recorder = Recorder(start_at)
+    actions, weights = list(mix), list(mix.values())
+
+    def worker(i: int) -> None:
+        rng = random.Random(seed * 1000 + i)
+        username = usernames[(seed * 1000 + i) % len(usernames)]
+        user = VirtualUser(session_factory, username, food_ids, rng, recorder)
+        try:
+            user.login()
+            while time.perf_counter() < deadline:
+                getattr(user, rng.choices(actions, weights)[0])()
+                if think_ms:
+                    time.sleep(rng.expovariate(1000.0 / think_ms))
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return recorder.as_dict()
+
+
+# -- aggregation ----------------------------------------------------------------
+
+def _percentile(samples: list[float], q: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def summarize(parts: list[dict[str, Any]], seconds: float) -> dict[str, Any]:
+    """Merge the raw results of every process into per-URL-name statistics."""
+    samples: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, Counter] = defaultdict(Counter)
+    for part in parts:
+        for name, values in part["samples"].items():
+            samples[name] += values
+        for name, kinds in part["errors"].items():
+            errors[name].update(kinds)
+    urls = {}
+    for name in sorted(samples):
+        values = sorted(samples[name])
+        failed = sum(errors[name].values())
+        urls[name] = {
+            "count": len(values),
+            "rps": round(len(values) / seconds, 2),
+            "mean_ms": round(statistics.fmean(values), 3),
+            "p50_ms": _percentile(values, 0.50),
+            "p95_ms": _percentile(values, 0.95),
+            "p99_ms": _percentile(values, 0.99),
+            "errors": failed,
+            "error_rate": round(failed / len(values), 4),
+            "error_kinds": dict(errors[name]),
+        }
+    total = sum(u["count"] for u in urls.values())
+    failed = sum(u["errors"] for u in urls.values())
+    kinds: Counter = Counter()
+    for counter in errors.values():
+        kinds.update(counter)
+    return {
+        "requests": total,
+        "rps": round(total / seconds, 2),
+        "errors": failed,
+        "error_rate": round(failed / total, 4) if total else 0.0,
+        "error_kinds": dict(kinds),
+        "urls": urls,
+    }
+
+
+def report(result: dict[str, Any]) -> None:
+    totals = result["totals"]
+    print(f"{result['label']}: {result['transport']}, "
+          f"{result['processes']} x {result['concurrency']} users, {result['seconds']:g} s  "
+          f"{totals['requests']} requests  {totals['rps']:.1f} req/s  "
+          f"errors {totals['errors']} ({totals['error_rate']:.2%})")
+    print(f"{'url name':<16}{'count':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'errors':>8}")
+    for name, u in totals["urls"].items():
+        print(f"{name:<16}{u['count']:>8}{u['rps']:>9.1f}{u['p50_ms']:>9.1f}"
+              f"{u['p95_ms']:>9.1f}{u['p99_ms']:>9.1f}{u['errors']:>8}")
+    for kind, n in sorted(totals["error_kinds"].items(), key=lambda kv: -kv[1]):
+        print(f"  {kind}: {n}")
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> None:
+    """Throughput and p95 per URL name against an earlier run; p95 ratio >1.0 is slower."""
+    old, new = baseline["totals"], current["totals"]
+    print(f"{baseline['label']} -> {current['label']}: {old['rps']:.1f} -> {new['rps']:.1f} req/s, "
+          f"errors {old['error_rate']:.2%} -> {new['error_rate']:.2%}")
+    for name, stats in new["urls"].items():
+        before = old["urls"].get(name)
+        if before:
+            print(f"{name:<16} {before['rps']:8.1f} -> {stats['rps']:8.1f} req/s  "
+                  f"p95 {before['p95_ms']:8.1f} -> {stats['p95_ms']:8.1f} ms "
+                  f"({stats['p95_ms'] / max(before['p95_ms'], 1e-9):.2f}x)")
+
+
+# -- processes ------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(args: argparse.Namespace) -> None:
+    """Threaded HTTP server for config.wsgi.application on the seeded database."""
+    from harness import bootstrap
+
+    bootstrap(args.db)
+    from django.core.servers.basehttp import run
+    from django.core.signals import got_request_exception
+
+    from config.wsgi import application
+
+    lock = threading.Lock()
+    errors = Path(f"{args.db}.errors")
+
+    def note(sender: Any, request: Any = None, **kwargs: Any) -> None:
+        kind = error_kind(sys.exc_info()[1]) if sys.exc_info()[1] else "unknown"
+        with lock, errors.open("a") as fh:
+            fh.write(kind + "\n")
+
+    got_request_exception.connect(note, weak=False)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    run("127.0.0.1", args.port, application, threading=True)
+
+
+def child(args: argparse.Namespace) -> None:
+    from harness import bootstrap
+
+    bootstrap(args.db)
+    from calories.models import FoodItem
+
+    usernames = json.loads(Path(args.db + ".users").read_text())
+    food_ids = list(FoodItem.objects.values_list("id", flat=True))
+    factory: Callable[[], Any] = InProcessSession
+    if args.url:
+        factory = functools.partial(HttpSession, args.url)
+    raw = run_threads(factory, usernames, food_ids, parse_mix(args.mix), args.concurrency,
+                      args.seconds, args.warmup, args.think_ms, args.seed)
+    print(json.dumps(raw))
+
+
+def _wait_for(port: int, server: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"server exited with {server.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit("server did not start")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent load test of the whole app.")
+    parser.add_argument("--users", type=int, default=50, help="seeded users to log in as")
+    parser.add_argument("--foods", type=int, default=2000)
+    parser.add_argument("--meals-per-user", type=int, default=300)
+    parser.add_argument("--mix", default="mixed", help=f"{', '.join(MIXES)}, or action=weight,...")
+    parser.add_argument("--transport", choices=["inprocess", "http"], default="inprocess")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="driver processes, each with its own app instance")
+    parser.add_argument("--concurrency", type=int, default=8, help="simulated users per process")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds run before recording")
+    parser.add_argument("--think-ms", type=float, default=0.0,
+                        help="mean pause between actions (0: closed loop)")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE",
+                        help="settings profile as environment variables; repeatable")
+    parser.add_argument("--label", help="name for this run (default: the --env values)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write the results as JSON")
+    parser.add_argument("--baseline", help="earlier --out file to compare against")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args)
+        return
+    if args.child:
+        child(args)
+        return
+
+    mix = parse_mix(args.mix)
+    env = dict(e.split("=", 1) for e in args.env)
+    os.environ.update(env)  # read by config.settings here and in every child
+
+    from harness import bootstrap, seed
+
+    db = bootstrap()
+    t0 = time.perf_counter()
+    usernames = seed(args.users, args.foods, args.meals_per_user, seed=args.seed)
+    seeded = time.perf_counter() - t0
+    Path(db + ".users").write_text(json.dumps(usernames))
+    from django.db import connections
+
+    connections.close_all()
+
+    server, url = None, None
+    if args.transport == "http":
+        port = _free_port()
+        command = [sys.executable, __file__, "--serve", "--db", db, "--port", str(port)]
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        _wait_for(port, server)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        drivers = [
+            subprocess.Popen(
+                [sys.executable, __file__, "--child", "--db", db, "--mix", args.mix,
+                 "--concurrency", str(args.concurrency), "--seconds", str(args.seconds),
+                 "--warmup", str(args.warmup), "--think-ms", str(args.think_ms),
+                 "--seed", str(args.seed + p), *(["--url", url] if url else [])],
+                stdout=subprocess.PIPE, text=True,
+            )
+            for p in range(args.processes)
+        ]
+        parts = []
+        for d in drivers:
+            out, _ = d.communicate()
+            if d.returncode:
+                raise SystemExit(f"driver exited with {d.returncode}")
+            parts.append(json.loads(out.strip().splitlines()[-1]))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    totals = summarize(parts, args.seconds)
+    errors = Path(f"{db}.errors")
+    if errors.exists():
+        totals["server_exceptions"] = dict(Counter(errors.read_text().split()))
+
+    import django
+
+    result = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "label": args.label or (" ".join(args.env) or "default"),
+        "env": env,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "transport": args.transport,
+        "processes": args.processes,
+        "concurrency": args.concurrency,
+        "seconds": args.seconds,
+        "think_ms": args.think_ms,
+        "mix": mix,
+        "data": {"users": args.users, "foods": args.foods, "meals_per_user": args.meals_per_user,
+                 "seed": args.seed, "seed_s": round(seeded, 2)},
+        "totals": totals,
+    }
+    report(result)
+    if "server_exceptions" in totals:
+        print(f"server exceptions: {totals['server_exceptions']}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, indent=2) + "\n")
+        print(f"wrote {args.out}")
+    if args.baseline:
+        compare(result, json.loads(Path(args.baseline).read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: benchmarks/bench_planner.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Meal plan latency and hit rate over catalogs of several sizes, for a spread
+of calorie targets and macro splits. Plans should stay under 200 ms.
+
+    python benchmarks/bench_planner.py --foods 1000,10000,100000 --plans 50
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+SPLITS = [(0.25, 0.45, 0.30), (0.30, 0.40, 0.30), (0.20, 0.55, 0.25), (0.35, 0.30, 0.35)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Meal planner latency per catalog size.")
+    parser.add_argument("--foods", default="1000,10000,100000", help="comma list of catalog sizes")
+    parser.add_argument("--plans", type=int, default=50, help="plans per catalog size")
+    parser.add_argument("--items", type=int, default=5)
+    args = parser.parse_args()
+
+    from harness import bootstrap, seed
+
+    for foods in [int(n) for n in args.foods.split(",")]:
+        bootstrap()
+        seed(users=1, foods=foods, meals_per_user=1)
+
+        from calories import catalog, planner
+
+        catalog.catalog_changed()  # bulk-seeded foods skip the model signals
+        t0 = time.perf_counter()
+        catalog.get_snapshot()
+        built = time.perf_counter() - t0
+        rng = random.Random(foods)
+        samples, hits, attempts = [], 0, 0
+        for i in range(args.plans):
+            t0 = time.perf_counter()
+            plan = planner.plan_meals(
+                rng.uniform(1400, 3200), split=rng.choice(SPLITS), items=args.items, seed=i
+            )
+            samples.append(time.perf_counter() - t0)
+            hits += plan.within_tolerance
+            attempts += plan.attempts
+        samples.sort()
+        print(f"{foods:>7} foods  snapshot {built * 1000:7.1f} ms  "
+              f"p50 {samples[len(samples) // 2] * 1000:6.1f} ms  "
+              f"p95 {samples[int(len(samples) * 0.95)] * 1000:6.1f} ms  "
+              f"max {samples[-1] * 1000:6.1f} ms  mean {statistics.fmean(samples) * 1000:6.1f} ms  "
+              f"within tolerance {hits}/{args.plans}  attempts/plan {attempts / args.plans:.1f}")
+
+
+if __name__ == "__main__":
+    main()
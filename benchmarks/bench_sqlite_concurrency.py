@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: benchmarks/bench_sqlite_concurrency.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Dashboard-style reads while meal writers are active, with SQLite's defaults
+vs. the tuned profile (WAL, synchronous=NORMAL, mmap, BEGIN IMMEDIATE).
+
+    python benchmarks/bench_sqlite_concurrency.py --writers 4 --readers 4 --seconds 5
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+
+def run(writers: int, readers: int, seconds: float) -> dict:
+    from django.db import OperationalError, connection, transaction
+
+    from calories import rollups
+    from calories.models import FoodItem, MealEntry
+
+    user_ids = list(MealEntry.objects.values_list("user_id", flat=True).distinct())
+    food = FoodItem.objects.first()
+    today = date.today()
+    deadline = time.perf_counter() + seconds
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+
+    def bump(key: str) -> None:
+        with lock:
+            counts[key] += 1
+
+    def writer(i: int) -> None:
+        rng = random.Random(i)
+        while time.perf_counter() < deadline:
+            try:
+                with transaction.atomic():
+                    meal = MealEntry.objects.create(
+                        user_id=rng.choice(user_ids), date=today, food=food, quantity_g=100,
+                    )
+                    rollups.meal_added(meal)
+                bump("writes")
+            except OperationalError:
+                bump("locked")
+        connection.close()
+
+    def reader(i: int) -> None:
+        rng = random.Random(1000 + i)
+        while time.perf_counter() < deadline:
+            uid = rng.choice(user_ids)
+            try:
+                list(MealEntry.objects.filter(user_id=uid, date=today).select_related("food"))
+                rollups.day_totals(uid, today)
+                bump("reads")
+            except OperationalError:
+                bump("locked")
+        connection.close()
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {
+        **counts,
+        "reads_per_s": round(counts["reads"] / seconds, 1),
+        "writes_per_s": round(counts["writes"] / seconds, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite read throughput under concurrent writes.")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--foods", type=int, default=1000)
+    parser.add_argument("--meals-per-user", type=int, default=200)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--profile", choices=["default", "tuned"], help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+    if args.profile:
+        from harness import bootstrap
+
+        bootstrap(args.db)
+        result = run(args.writers, args.readers, args.seconds)
+        print(json.dumps({"profile": args.profile, **result}))
+        return
+
+    results = []
+    for profile in ("default", "tuned"):
+        # A separate seeded file per profile: WAL mode persists in the file.
+        env = {**os.environ, "DJANGO_SQLITE_TUNING": str(profile == "tuned")}
+        db = subprocess.run(
+            [sys.executable, "-c", "import sys; sys.path.insert(0, sys.argv[1]); "
+             "from harness import bootstrap, seed; db = bootstrap(); "
+             "seed(*map(int, sys.argv[2:5])); print(db)",
+             str(Path(__file__).resolve().parent), str(args.users), str(args.foods),
+             str(args.meals_per_user)],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout.strip().splitlines()[-1]
+        out = subprocess.run(
+            [sys.executable, __file__, "--profile", profile, "--db", db,
+             "--writers", str(args.writers), "--readers", str(args.readers),
+             "--seconds", str(args.seconds)],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    for r in results:
+        print(f"{r['profile']:>7}: {r['reads_per_s']:8.1f} reads/s  "
+              f"{r['writes_per_s']:7.1f} writes/s  {r['locked']} 'database is locked' errors")
+
+
+if __name__ == "__main__":
+    main()
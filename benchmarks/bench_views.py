@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: benchmarks/bench_views.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Time the main views and the energy formulas at several seeded data sizes
+and write the results as JSON, so runs can be compared across releases.
+
+    python benchmarks/bench_views.py --sizes small,medium --out results.json
+    python benchmarks/bench_views.py --baseline results.json
+===========================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# name -> (users, foods, meals per user)
+SIZES = {
+    "small": (10, 500, 50),
+    "medium": (50, 5000, 500),
+    "large": (200, 50000, 2000),
+}
+PATHS = {
+    "dashboard_view": "/",
+    "meal_list_view": "/meals/",
+    "food_list_view": "/foods/",
+    "calculator_view": "/calculator/",
+}
+
+
+def _stats(samples: list[float]) -> dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "n": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95)] * 1000, 3),
+    }
+
+
+def time_views(username: str, repeat: int) -> dict[str, dict]:
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    client = Client()
+    client.force_login(User.objects.get(username=username))
+    out = {}
+    for name, path in PATHS.items():
+        assert client.get(path).status_code == 200  # warm caches and templates
+        samples = []
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                client.get(path)
+                samples.append(time.perf_counter() - t0)
+        out[name] = {**_stats(samples), "queries": len(ctx.captured_queries) // repeat}
+    return out
+
+
+def time_formulas(repeat: int) -> dict[str, dict]:
+    from calories.utils import mifflin_st_jeor, target_calories_from_goal, tdee_from_bmr
+
+    calls = {
+        "mifflin_st_jeor": lambda: mifflin_st_jeor("M", 30, 180, 80),
+        "tdee_from_bmr": lambda: tdee_from_bmr(1780, "moderate"),
+        "target_calories_from_goal": lambda: target_calories_from_goal(2759, "lose"),
+    }
+    out = {}
+    for name, fn in calls.items():
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(1000):
+                fn()
+            samples.append((time.perf_counter() - t0) / 1000)
+        out[name] = {"n": len(samples), "mean_us": round(statistics.fmean(samples) * 1e6, 4)}
+    return out
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict) -> None:
+    """Print the p50 ratio per view and size; >1.0 means slower than the baseline."""
+    for size, result in current["sizes"].items():
+        old = baseline.get("sizes", {}).get(size)
+        if not old:
+            continue
+        for view, stats in result["views"].items():
+            before = old["views"].get(view)
+            if before:
+                ratio = stats["p50_ms"] / before["p50_ms"]
+                print(f"{size:>6} {view:<16} p50 {before['p50_ms']:8.2f} -> "
+                      f"{stats['p50_ms']:8.2f} ms ({ratio:.2f}x), "
+                      f"queries {before['queries']} -> {stats['queries']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="View and formula benchmarks.")
+    parser.add_argument("--sizes", default="small,medium", help=f"comma list of {', '.join(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="bench-results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    import django
+    from harness import bootstrap, seed
+
+    result = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": _git_revision(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "formulas": time_formulas(args.repeat),
+        "sizes": {},
+    }
+    for size in args.sizes.split(","):
+        users, foods, meals = SIZES[size]
+        bootstrap()
+        t0 = time.perf_counter()
+        usernames = seed(users, foods, meals, seed=args.seed)
+        seeded = time.perf_counter() - t0
+        result["sizes"][size] = {
+            "users": users,
+            "foods": foods,
+            "meals_per_user": meals,
+            "seed_s": round(seeded, 2),
+            "views": time_views(usernames[0], args.repeat),
+        }
+        for view, stats in result["sizes"][size]["views"].items():
+            print(f"{size:>6} {view:<16} p50 {stats['p50_ms']:8.2f} ms  "
+                  f"p95 {stats['p95_ms']:8.2f} ms  queries {stats['queries']}")
+
+    Path(args.out).write_text(json.dumps(result, indent=2) + "\n")
+    print(f"wrote {args.out}")
+    if args.baseline:
+        compare(result, json.loads(Path(args.baseline).read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: benchmarks/harness.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Shared setup for benchmarks: boot Django against a throwaway SQLite file
+and seed it deterministically.
+===========================================================================
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+
+def bootstrap(db_path: str | None = None, **overrides: object) -> str:
+    """Configure Django on a fresh SQLite file (created if missing) and create tables.
+    Safe to call again to switch to another file."""
+    import django
+    from django.conf import settings
+    from django.db import connections
+
+    db_path = db_path or os.path.join(tempfile.mkdtemp(prefix="calories-bench-"), "bench.sqlite3")
+    django.setup()
+    connections.close_all()
+    settings.DATABASES["default"]["NAME"] = db_path
+    settings.CALORIES_CATALOG_DIR = os.path.join(os.path.dirname(db_path), "catalog")
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    settings.ALLOWED_HOSTS = ["*"]
+    for key, value in overrides.items():
+        setattr(settings, key, value)
+
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+    return db_path
+
+
+def seed(users: int, foods: int, meals_per_user: int, seed: int = 1, days: int = 365) -> list[str]:
+    """Create ``users`` users with profiles, a ``foods``-item catalog and
+    ``meals_per_user`` entries each spread over the last ``days`` days
+    (always including today). Returns the usernames; every password is "bench-pass"."""
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+
+    from calories import favorites, rollups
+    from calories.models import FoodItem, MealEntry, UserProfile
+
+    rng = random.Random(seed)
+    password = make_password("bench-pass")
+    FoodItem.objects.bulk_create(
+        FoodItem(
+            name=f"Food {i:07d}",
+            calories_per_100g=round(rng.uniform(20, 900), 1),
+            protein_g=round(rng.uniform(0, 40), 1),
+            carbs_g=round(rng.uniform(0, 90), 1),
+            fat_g=round(rng.uniform(0, 60), 1),
+        )
+        for i in range(foods)
+    )
+    food_ids = list(FoodItem.objects.values_list("id", flat=True))
+    created = User.objects.bulk_create(
+        User(username=f"bench{i:06d}", password=password) for i in range(users)
+    )
+    usernames = [u.username for u in created]
+    user_ids = list(User.objects.filter(username__in=usernames).values_list("id", flat=True))
+    UserProfile.objects.bulk_create(
+        UserProfile(
+            user_id=uid,
+            sex=rng.choice("MF"),
+            age=rng.randint(18, 75),
+            height_cm=rng.uniform(150, 200),
+            weight_kg=rng.uniform(45, 130),
+            activity_level=rng.choice(["sedentary", "light", "moderate", "active", "very_active"]),
+            goal=rng.choice(["lose", "maintain", "gain"]),
+        )
+        for uid in user_ids
+    )
+    today = date.today()
+    batch: list[MealEntry] = []
+    for uid in user_ids:
+        for i in range(meals_per_user):
+            offset = 0 if i % 10 == 0 else rng.randrange(days)
+            batch.append(MealEntry(
+                user_id=uid, date=today - timedelta(days=offset),
+                food_id=rng.choice(food_ids), quantity_g=rng.uniform(20, 400),
+            ))
+            if len(batch) >= 5000:
+                MealEntry.objects.bulk_create(batch)
+                batch = []
+    MealEntry.objects.bulk_create(batch)
+    rollups.rebuild()
+    favorites.rebuild()
+    return usernames
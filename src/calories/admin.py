@@ -10,8 +10,50 @@ Updated: 2025-11-01
 License: MIT License (see LICENSE file for details)
 ===========================================================================
 """
+from django import forms  # type: ignore
 from django.contrib import admin  # type: ignore
-from .models import UserProfile, FoodItem, MealEntry
+from django.contrib.admin.widgets import AutocompleteSelect  # type: ignore
+from django.contrib.auth import get_user_model  # type: ignore
+from django.db import transaction  # type: ignore
+from . import rollups
+from .models import UserProfile, FoodItem, MealEntry, DailyNutritionSummary, Job
+from .pagination import EstimatedCountPaginator
+
+
+class UserAutocompleteFilter(admin.SimpleListFilter):
+    """Sidebar user filter backed by the admin autocomplete endpoint, so no
+    query lists every user; only the selected one is looked up."""
+
+    title = "user"
+    parameter_name = "user__id__exact"
+    template = "admin/calories/autocomplete_filter.html"
+
+    def __init__(self, request, params, model, model_admin):
+        super().__init__(request, params, model, model_admin)
+        self.field = forms.ModelChoiceField(
+            get_user_model()._default_manager.all(),
+            required=False,
+            widget=AutocompleteSelect(model._meta.get_field("user"), model_admin.admin_site),
+        )
+
+    def has_output(self):
+        return True
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(user_id=self.value())
+        return queryset
+
+    def choices(self, changelist):
+        yield {
+            "widget": self.field.widget.render(self.parameter_name, self.value()),
+            "hidden": [(k, v) for k, v in changelist.params.items() if k != self.parameter_name],
+            "clear_query_string": changelist.get_query_string(remove=[self.parameter_name]),
+            "selected": self.value() is not None,
+        }
 
 
 @admin.register(UserProfile)
@@ -24,10 +66,70 @@ class UserProfileAdmin(admin.ModelAdmin):
 class FoodItemAdmin(admin.ModelAdmin):
     list_display = ("name", "calories_per_100g", "protein_g", "carbs_g", "fat_g")
     search_fields = ("name",)
+    ordering = ("name",)
+
+    # Name prefix match on food_name_upper_idx instead of a LIKE '%term%'
+    # scan; this also serves the food autocomplete on the meal form.
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        return queryset.name_prefix(term), False
 
 
 @admin.register(MealEntry)
 class MealEntryAdmin(admin.ModelAdmin):
     list_display = ("user", "date", "food", "quantity_g", "calories")
-    list_filter = ("date", "user")
+    list_filter = ("date", UserAutocompleteFilter)
+    list_select_related = ("user", "food")
     autocomplete_fields = ("food", "user")
+    # Drill-down links come from index seeks (templatetags/calories_admin.py),
+    # not SELECT DISTINCT over the table.
+    date_hierarchy = "date"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    @property
+    def media(self):
+        field = MealEntry._meta.get_field("user")
+        return super().media + AutocompleteSelect(field, self.admin_site).media
+
+    # Keep DailyNutritionSummary in step with edits made here, as the views do.
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            before = rollups.MealSnapshot.of(MealEntry.objects.get(pk=obj.pk)) if change else None
+            super().save_model(request, obj, form, change)
+            if before is None:
+                rollups.meal_added(obj)
+            else:
+                rollups.meal_changed(before, obj)
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            rollups.meal_removed(obj)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            meals = list(queryset.select_related("food"))
+            super().delete_queryset(request, queryset)
+            rollups.meals_removed(meals)
+
+
+@admin.register(DailyNutritionSummary)
+class DailyNutritionSummaryAdmin(admin.ModelAdmin):
+    list_display = ("user", "date", "kcal", "protein_g", "carbs_g", "fat_g", "entries")
+    search_fields = ("user__username",)
+    readonly_fields = ("user", "date", "kcal", "protein_g", "carbs_g", "fat_g", "entries")
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "attempts", "run_after", "locked_by", "updated_at")
+    list_filter = ("status", "kind")
+    ordering = ("-id",)
+    readonly_fields = [f.name for f in Job._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
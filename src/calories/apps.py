@@ -16,3 +16,14 @@ from django.apps import AppConfig  # type: ignore
 class CaloriesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "calories"
+
+    def ready(self) -> None:
+        from django.conf import settings  # type: ignore
+
+        from . import checks, signals, tasks  # noqa: F401  (registers checks, receivers, job handlers)
+
+        if "calories.instrumentation.RequestTimingMiddleware" in settings.MIDDLEWARE:
+            # Before any worker thread opens a connection, so all queries are seen.
+            from .instrumentation import install
+
+            install()
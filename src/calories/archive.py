@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/archive.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Monthly columnar archive of old MealEntry rows.
+
+``manage.py archive_meals`` moves every whole month older than
+CALORIES_ARCHIVE_AFTER_DAYS out of the table into
+``CALORIES_ARCHIVE_DIR/meals-YYYY-MM.npz``. Each file holds packed,
+compressed arrays (id, user, date, food, quantity, per-100 g nutrients,
+...) sorted by (user, date, id). The arrays are cut into row groups, so
+one user's month only decompresses the groups that hold that user.
+``manifest.json`` lists the partitions and their date range.
+
+Archived rows keep their ids and the nutrient values they had when
+archived, so history no longer changes with later food edits.
+DailyNutritionSummary rows are left in place, so reports and the
+dashboard never read the archive. The meal list, exports and rollup
+rebuilds merge archived rows with live ones. ``manage.py restore_meals
+YYYY-MM`` moves a partition back into the table, e.g. to edit it.
+
+Archiving is idempotent: a month that gains rows again (back-dated
+entries, or a run that failed before its DELETE committed) is rewritten
+with the union, deduplicated by id. Until then readers skip archived rows
+whose id is still live, since the partition is written before the DELETE
+commits and a failed run leaves both copies.
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from django.conf import settings  # type: ignore
+from django.db import transaction  # type: ignore
+from django.db.models import F  # type: ignore
+from django.db.models.functions import Coalesce  # type: ignore
+from django.utils import timezone  # type: ignore
+
+from . import freshness
+from .models import LOGGED_COLUMNS, NUTRIENT_COLUMNS, NUTRIENT_FIELDS, FoodItem, MealEntry
+from .pagination import decode_cursor
+
+MANIFEST = "manifest.json"
+GROUP_ROWS = 65536
+KEY_WIDTH = MealEntry._meta.get_field("client_key").max_length
+PER_100G = tuple(f"{name}_100g" for name in NUTRIENT_FIELDS)
+
+
+@dataclass
+class ArchivedMeal:
+    """Read-only stand-in for a MealEntry that lives in the archive."""
+    id: int
+    user_id: int
+    date: date
+    food_id: int
+    quantity_g: float
+    per_100g: tuple[float, ...]
+    logged: bool
+    client_key: str | None = None
+    food: Any = None
+    archived = True
+
+    @property
+    def pk(self) -> int:
+        return self.id
+
+    def nutrients(self) -> dict[str, float]:
+        return {k: v * self.quantity_g / 100.0 for k, v in zip(NUTRIENT_FIELDS, self.per_100g)}
+
+    @property
+    def calories(self) -> float:
+        return round(self.per_100g[0] * self.quantity_g / 100.0, 2)
+
+
+# -- files and manifest ------------------------------------------------------
+
+def _directory() -> Path:
+    return Path(settings.CALORIES_ARCHIVE_DIR)
+
+
+def _month_key(day: date) -> str:
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def month_bounds(month: str) -> tuple[date, date]:
+    """First and last day of ``YYYY-MM``; raises ValueError if malformed."""
+    first = date.fromisoformat(f"{month}-01")
+    following = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return first, following - timedelta(days=1)
+
+
+def _atomic_write(path: Path, write: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as fh:
+        write(fh)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+_manifest: tuple[tuple[str, float], dict[str, Any]] | None = None
+
+
+def manifest() -> dict[str, dict[str, Any]]:
+    """``{month: {"file", "rows", "first_date", "last_date", ...}}``, re-read
+    only when the file changes."""
+    global _manifest
+    path = _directory() / MANIFEST
+    try:
+        stamp = (str(path), path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        return {}
+    if _manifest is None or _manifest[0] != stamp:
+        _manifest = (stamp, json.loads(path.read_text())["partitions"])
+    return _manifest[1]
+
+
+def _save_manifest(partitions: dict[str, dict[str, Any]]) -> None:
+    body = json.dumps({"version": 1, "partitions": dict(sorted(partitions.items()))}, indent=2)
+    _atomic_write(_directory() / MANIFEST, lambda fh: fh.write(body.encode()))
+
+
+def months_in(start: date | None, end: date | None) -> list[str]:
+    """Archived months overlapping ``[start, end]``, oldest first."""
+    return [
+        month for month, part in sorted(manifest().items())
+        if (start is None or date.fromisoformat(part["last_date"]) >= start)
+        and (end is None or date.fromisoformat(part["first_date"]) <= end)
+    ]
+
+
+# -- reading ------------------------------------------------------------------
+
+class Partition:
+    """One month's archive file; columns are loaded lazily per row group."""
+
+    COLUMNS = ("id", "user_id", "date", "food_id", "quantity_g", *PER_100G, "logged", "client_key")
+
+    def __init__(self, month: str) -> None:
+        self.month = month
+        self.path = _directory() / manifest()[month]["file"]
+
+    def _groups(self, npz: Any, user_id: int | None) -> list[int]:
+        first, last = npz["group_first_user"], npz["group_last_user"]
+        if user_id is None:
+            return list(range(len(first)))
+        return np.flatnonzero((first <= user_id) & (last >= user_id)).tolist()
+
+    def arrays(self, user_id: int | None = None) -> dict[str, np.ndarray]:
+        """All columns (of ``user_id``'s rows only, if given), sorted by (user, date, id),
+        without rows that are live again or still live."""
+        with np.load(self.path) as npz:
+            groups = self._groups(npz, user_id)
+            out = {
+                c: np.concatenate([npz[f"{c}.{g}"] for g in groups]) if groups else _empty(c)
+                for c in self.COLUMNS
+            }
+        mask = np.ones(len(out["id"]), dtype=bool)
+        if user_id is not None:
+            mask &= out["user_id"] == user_id
+        live = _live_ids(self.month, user_id)
+        if len(live):
+            mask &= ~np.isin(out["id"], live)
+        if not mask.all():
+            out = {c: v[mask] for c, v in out.items()}
+        return out
+
+
+def _live_ids(month: str, user_id: int | None) -> np.ndarray:
+    rows = MealEntry.objects.filter(date__range=month_bounds(month))
+    if user_id is not None:
+        rows = rows.filter(user_id=user_id)
+    return np.fromiter(rows.values_list("id", flat=True), dtype=np.int64)
+
+
+def _empty(column: str) -> np.ndarray:
+    return np.array([], dtype=_DTYPES[column])
+
+
+_DTYPES = {
+    "id": np.int64, "user_id": np.int64, "date": np.int32, "food_id": np.int64,
+    "quantity_g": np.float64, **{c: np.float64 for c in PER_100G}, "logged": np.bool_,
+    "client_key": f"<U{KEY_WIDTH}",
+}
+
+
+def _meals(arrays: dict[str, np.ndarray], order: np.ndarray | None = None) -> list[ArchivedMeal]:
+    idx = order if order is not None else np.arange(len(arrays["id"]))
+    per_100g = np.stack([arrays[c] for c in PER_100G], axis=1)
+    return [
+        ArchivedMeal(
+            id=int(arrays["id"][i]),
+            user_id=int(arrays["user_id"][i]),
+            date=date.fromordinal(int(arrays["date"][i])),
+            food_id=int(arrays["food_id"][i]),
+            quantity_g=float(arrays["quantity_g"][i]),
+            per_100g=tuple(per_100g[i].tolist()),
+            logged=bool(arrays["logged"][i]),
+            client_key=str(arrays["client_key"][i]) or None,
+        )
+        for i in idx.tolist()
+    ]
+
+
+def _attach_foods(meals: list[ArchivedMeal]) -> list[ArchivedMeal]:
+    foods = FoodItem.objects.in_bulk({m.food_id for m in meals})
+    for meal in meals:
+        meal.food = foods.get(meal.food_id) or FoodItem(
+            id=meal.food_id, name=f"(deleted food #{meal.food_id})"
+        )
+    return meals
+
+
+def _window(arrays: dict[str, np.ndarray], start: date | None, end: date | None) -> np.ndarray:
+    mask = np.ones(len(arrays["id"]), dtype=bool)
+    if start:
+        mask &= arrays["date"] >= start.toordinal()
+    if end:
+        mask &= arrays["date"] <= end.toordinal()
+    return mask
+
+
+def history_merge(
+    user_id: int,
+    start: date | None,
+    end: date | None,
+    ordering: Sequence[str],
+    after: str | None = None,
+    before: str | None = None,
+) -> Callable[[list[Any], int], list[Any]] | None:
+    """A ``merge`` hook for pagination.paginate() that folds the user's archived
+    rows into a live (-date, -id) keyset window; None if no partition overlaps
+    ``[start, end]``. Partitions are opened only once the page reaches them."""
+    months = months_in(start, end)
+    if not months:
+        return None
+    backward = before is not None
+    cursor = before or after
+
+    def merge(live: list[Any], size: int) -> list[Any]:
+        boundary = decode_cursor(cursor, MealEntry.objects.all(), ordering) if cursor else None
+        extra: list[ArchivedMeal] = []
+        # Walk months in window order; stop once enough archived rows are in
+        # hand or the live rows fill the window ahead of the next month.
+        for month in months if backward else months[::-1]:
+            first, last = month_bounds(month)
+            if boundary is not None and (last < boundary[0] if backward else first > boundary[0]):
+                continue
+            if len(extra) > size or (len(live) > size and (
+                first > live[size].date if backward else last < live[size].date
+            )):
+                break
+            arrays = Partition(month).arrays(user_id)
+            mask = _window(arrays, start, end)
+            if boundary is not None:
+                day, pk = boundary[0].toordinal(), boundary[1]
+                if backward:
+                    mask &= (arrays["date"] > day) | ((arrays["date"] == day) & (arrays["id"] > pk))
+                else:
+                    mask &= (arrays["date"] < day) | ((arrays["date"] == day) & (arrays["id"] < pk))
+            extra += _meals(arrays, np.flatnonzero(mask))
+        if not extra:
+            return live
+        rows = sorted([*live, *extra], key=lambda m: (m.date, m.id), reverse=not backward)
+        rows = rows[: size + 1]
+        _attach_foods([m for m in rows if isinstance(m, ArchivedMeal)])
+        return rows
+
+    return merge
+
+
+def iter_months(
+    user_id: int | None = None, start: date | None = None, end: date | None = None,
+) -> Iterator[list[ArchivedMeal]]:
+    """Archived meals one partition at a time, each list in (date, id) order."""
+    for month in months_in(start, end):
+        arrays = Partition(month).arrays(user_id)
+        order = np.flatnonzero(_window(arrays, start, end))
+        order = order[np.lexsort((arrays["id"][order], arrays["date"][order]))]
+        if len(order):
+            yield _meals(arrays, order)
+
+
+def daily_totals(days: Iterable[tuple[int, date]] | None = None) -> Iterator[dict[str, Any]]:
+    """Archived per-(user, date) totals shaped like ``grouped_totals("user_id",
+    "date")`` rows, ordered by (date, user_id); only ``days`` if given."""
+    wanted = None if days is None else set(days)
+    months = None if wanted is None else {_month_key(d) for _, d in wanted}
+    for month in months_in(None, None):
+        if months is not None and month not in months:
+            continue
+        a = Partition(month).arrays()
+        if not len(a["id"]):
+            continue
+        grams = a["quantity_g"] / 100.0
+        # Group on (date, user) with one sort and reduceat per nutrient.
+        order = np.lexsort((a["user_id"], a["date"]))
+        key_date, key_user = a["date"][order], a["user_id"][order]
+        starts = np.flatnonzero(np.r_[True, (np.diff(key_date) != 0) | (np.diff(key_user) != 0)])
+        sums = {
+            name: np.add.reduceat((a[column] * grams)[order], starts)
+            for name, column in zip(NUTRIENT_FIELDS, PER_100G)
+        }
+        entries = np.diff(np.r_[starts, len(order)])
+        for j, s in enumerate(starts.tolist()):
+            key = (int(key_user[s]), date.fromordinal(int(key_date[s])))
+            if wanted is not None and key not in wanted:
+                continue
+            yield {"user_id": key[0], "date": key[1], "entries": int(entries[j]),
+                   **{name: float(sums[name][j]) for name in NUTRIENT_FIELDS}}
+
+
+# -- archiving and restoring ----------------------------------------------------
+
+def cutoff(after_days: int | None = None, today: date | None = None) -> date:
+    """First day of the oldest month that stays live: only whole months older
+    than ``after_days`` are archived."""
+    days = settings.CALORIES_ARCHIVE_AFTER_DAYS if after_days is None else after_days
+    return ((today or timezone.localdate()) - timedelta(days=days)).replace(day=1)
+
+
+def archivable_months(before: date) -> list[str]:
+    return [_month_key(d) for d in MealEntry.objects.filter(date__lt=before).dates("date", "month")]
+
+
+def _live_arrays(first: date, last: date) -> dict[str, np.ndarray]:
+    per_100g = {
+        f"{name}_100g": Coalesce(F(LOGGED_COLUMNS[name]), F(f"food__{NUTRIENT_COLUMNS[name]}"))
+        for name in NUTRIENT_FIELDS
+    }
+    rows = list(
+        MealEntry.objects.select_for_update(of=("self",))
+        .filter(date__range=(first, last))
+        .annotate(**per_100g)
+        .order_by()
+        .values_list("id", "user_id", "date", "food_id", "quantity_g", *PER_100G,
+                     "logged_kcal_100g", "client_key")
+        .iterator(chunk_size=5000)
+    )
+    if not rows:
+        return {c: _empty(c) for c in Partition.COLUMNS}
+    columns = list(zip(*rows))
+    return {
+        "id": np.array(columns[0], dtype=np.int64),
+        "user_id": np.array(columns[1], dtype=np.int64),
+        "date": np.array([d.toordinal() for d in columns[2]], dtype=np.int32),
+        "food_id": np.array(columns[3], dtype=np.int64),
+        "quantity_g": np.array(columns[4], dtype=np.float64),
+        **{c: np.array(columns[5 + i], dtype=np.float64) for i, c in enumerate(PER_100G)},
+        "logged": np.array([v is not None for v in columns[9]], dtype=np.bool_),
+        "client_key": np.array([k or "" for k in columns[10]], dtype=f"<U{KEY_WIDTH}"),
+    }
+
+
+def _write_partition(month: str, arrays: dict[str, np.ndarray]) -> dict[str, Any]:
+    order = np.lexsort((arrays["id"], arrays["date"], arrays["user_id"]))
+    arrays = {c: v[order] for c, v in arrays.items()}
+    members: dict[str, np.ndarray] = {}
+    starts = range(0, len(order), GROUP_ROWS)
+    for g, s in enumerate(starts):
+        for c, v in arrays.items():
+            members[f"{c}.{g}"] = v[s:s + GROUP_ROWS]
+    members["group_first_user"] = np.array([arrays["user_id"][s] for s in starts], dtype=np.int64)
+    members["group_last_user"] = np.array(
+        [arrays["user_id"][min(s + GROUP_ROWS, len(order)) - 1] for s in starts], dtype=np.int64
+    )
+    name = f"meals-{month}.npz"
+    _atomic_write(_directory() / name, lambda fh: np.savez_compressed(fh, **members))
+    return {
+        "file": name,
+        "rows": int(len(order)),
+        "users": int(len(np.unique(arrays["user_id"]))),
+        "first_date": date.fromordinal(int(arrays["date"].min())).isoformat(),
+        "last_date": date.fromordinal(int(arrays["date"].max())).isoformat(),
+        "archived_at": timezone.now().isoformat(timespec="seconds"),
+    }
+
+
+def archive_month(month: str) -> int:
+    """Move ``month``'s live rows into its partition; returns rows moved."""
+    first, last = month_bounds(month)
+    with transaction.atomic():
+        live = _live_arrays(first, last)
+        if not len(live["id"]):
+            return 0
+        partitions = dict(manifest())
+        if month in partitions:
+            old = Partition(month).arrays()
+            keep = ~np.isin(old["id"], live["id"])
+            live = {c: np.concatenate([old[c][keep], live[c]]) for c in live}
+        partitions[month] = _write_partition(month, live)
+        _save_manifest(partitions)
+        # Summaries stay as they are: the rows still count, just elsewhere.
+        moved = MealEntry.objects.filter(
+            date__range=(first, last), id__in=live["id"].tolist()
+        ).delete()[0]
+    freshness.changed(freshness.ARCHIVE)
+    return moved
+
+
+def restore_month(month: str) -> tuple[int, int]:
+    """Move a partition back into MealEntry. Returns (restored, skipped):
+    rows whose food has since been deleted are skipped and stay archived."""
+    from . import rollups
+
+    if month not in manifest():
+        raise ValueError(f"No archived partition for {month}")
+    arrays = Partition(month).arrays()
+    meals = _meals(arrays)
+    live_foods = set(
+        FoodItem.objects.filter(pk__in={m.food_id for m in meals}).values_list("id", flat=True)
+    )
+    restorable = [m for m in meals if m.food_id in live_foods]
+    with transaction.atomic():
+        MealEntry.objects.bulk_create(
+            [
+                MealEntry(
+                    id=m.id, user_id=m.user_id, date=m.date, food_id=m.food_id,
+                    quantity_g=m.quantity_g, client_key=m.client_key,
+                    **(dict(zip(LOGGED_COLUMNS.values(), m.per_100g)) if m.logged else {}),
+                )
+                for m in restorable
+            ],
+            batch_size=2000,
+            ignore_conflicts=True,  # rows left live by an interrupted archive run
+        )
+        partitions = dict(manifest())
+        left = ~np.isin(arrays["id"], [m.id for m in restorable])
+        if left.any():
+            partitions[month] = _write_partition(month, {c: v[left] for c, v in arrays.items()})
+        else:
+            del partitions[month]
+        _save_manifest(partitions)
+        # Restored rows without logged values follow the food again.
+        rollups.recompute({(m.user_id, m.date) for m in restorable if not m.logged})
+    if not left.any():
+        (_directory() / f"meals-{month}.npz").unlink(missing_ok=True)
+    freshness.changed(freshness.ARCHIVE)
+    return len(restorable), int(left.sum())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/async_views.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Async twins of the hot views, for ASGI deployments.
+
+Enabled with CALORIES_ASYNC_VIEWS=True (see config/settings.py); URL names
+stay the same. Reads use the async ORM and cache API. Work that needs a
+transaction or renders a ModelChoiceField goes through sync_to_async,
+since Django does not support either in async mode.
+===========================================================================
+"""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from datetime import date
+from functools import wraps
+from typing import Any
+
+from asgiref.sync import sync_to_async  # type: ignore
+from django.contrib import messages  # type: ignore
+from django.contrib.auth.views import redirect_to_login  # type: ignore
+from django.db import IntegrityError, transaction  # type: ignore
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.shortcuts import redirect, render
+from django.views.decorators.http import require_http_methods
+
+from . import archive, energy, freshness, http, rollups, search, sync
+from .forms import MealEntryForm
+from .models import MealEntry
+from .pagination import InvalidCursorError, apaginate
+from .views import MEAL_ORDERING
+
+AsyncView = Callable[..., Awaitable[HttpResponse]]
+
+
+def alogin_required(view: AsyncView) -> AsyncView:
+    """login_required for coroutines; also pins request.user so templates never
+    fall back to the synchronous lazy user loader."""
+
+    @wraps(view)
+    async def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        user = await request.auser()
+        request.user = user
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+@alogin_required
+@freshness.conditional(freshness.USER, freshness.CATALOG, daily=True)
+async def dashboard_view(request: HttpRequest) -> HttpResponse:
+    today = date.today()
+    # Awaited one after another: the async ORM runs every query on the same
+    # thread, so gathering them would not overlap anything.
+    profile = await energy.aget_energy_profile(request.user.pk)
+    if profile is None:
+        raise Http404("No profile for this user.")
+    meals_qs = MealEntry.objects.filter(user=request.user, date=today).select_related("food")
+    meals = await _alist(meals_qs)
+    totals = await rollups.aday_totals(request.user, today)
+    ctx = {
+        **profile.rounded(),
+        "today": today,
+        "meals": meals,
+        "consumed": totals["kcal"],
+        "totals": totals,
+        "remaining": round(max(profile.target - totals["kcal"], 0), 2),
+    }
+    return render(request, "calories/dashboard.html", ctx)
+
+
+async def _alist(qs: Any) -> list[Any]:
+    return [obj async for obj in qs]
+
+
+@alogin_required
+@freshness.conditional(freshness.USER, freshness.CATALOG, freshness.ARCHIVE)
+async def meal_list_view(request: HttpRequest) -> HttpResponse:
+    try:
+        start, end = http.date_param(request, "from"), http.date_param(request, "to")
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    meals = MealEntry.objects.filter(user=request.user).select_related("food")
+    if start:
+        meals = meals.filter(date__gte=start)
+    if end:
+        meals = meals.filter(date__lte=end)
+    after, before = request.GET.get("after"), request.GET.get("before")
+    try:
+        page = await apaginate(
+            meals,
+            MEAL_ORDERING,
+            after=after,
+            before=before,
+            size=http.size_param(request),
+            merge=archive.history_merge(request.user.pk, start, end, MEAL_ORDERING, after, before),
+        )
+    except InvalidCursorError:
+        return HttpResponseBadRequest("Invalid page cursor")
+    ctx = {
+        "meals": page.items, "page": page, "date_from": start, "date_to": end,
+        **http.page_urls(request, page),
+    }
+    return render(request, "calories/meal_list.html", ctx)
+
+
+def _create_meal(form: MealEntryForm, user: Any) -> MealEntry | None:
+    if not form.is_valid():
+        return None
+    meal = form.save(commit=False)
+    meal.user = user
+    with transaction.atomic():
+        meal.save()
+        rollups.meal_added(meal)
+    return meal
+
+
+@alogin_required
+@require_http_methods(["GET", "POST"])
+async def meal_create_view(request: HttpRequest) -> HttpResponse:
+    # building the food picker's options reads the cache and database
+    form = await sync_to_async(MealEntryForm)(request.POST or None, user=request.user)
+    if request.method == "POST" and await sync_to_async(_create_meal)(form, request.user):
+        messages.success(request, "Meal recorded.")
+        return redirect("meal_list")
+    return render(request, "calories/meal_form.html", {"form": form})
+
+
+@alogin_required
+@require_http_methods(["GET"])
+async def food_search_view(request: HttpRequest) -> JsonResponse:
+    query, limit = http.search_params(request)
+    hits = await sync_to_async(search.search_foods)(query, limit)
+    return http.search_response(query, hits)
+
+
+@alogin_required
+@require_http_methods(["POST"])
+async def meal_bulk_view(request: HttpRequest) -> JsonResponse:
+    entries, error = http.bulk_entries(request)
+    if error is not None:
+        return error
+    try:
+        result = await sync_to_async(sync.log_meals)(request.user, entries)
+    except IntegrityError:
+        return http.bulk_conflict()
+    return http.bulk_response(result)
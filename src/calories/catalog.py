@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/catalog.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Read-only FoodItem nutrient snapshot shared by all worker processes.
+
+The catalog is written to ``CALORIES_CATALOG_DIR/catalog-<version>.npy`` as a
+(4, max_id + 1) float64 array: kcal, protein, carbs and fat per 100 g, one
+contiguous column each, indexed directly by food id (NaN for missing ids).
+Workers open it with ``mmap_mode="r"``, so the pages are shared through the
+OS page cache and lookups are O(1) without touching the database.
+
+The version is a random token in ``CALORIES_CATALOG_DIR/VERSION``, replaced
+whenever the table changes (FoodItem signals, bulk imports). Every process
+on the host reads the same file (a stat per lookup, re-read only when it
+changes), so an edit made through one worker retires the snapshot in all
+of them. A worker that sees a new token maps the matching file, building it
+first if no one has yet.
+===========================================================================
+"""
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings  # type: ignore
+
+from .models import NUTRIENT_FIELDS
+
+VERSION_FILE = "VERSION"
+COLUMNS = ("calories_per_100g", "protein_g", "carbs_g", "fat_g")
+
+
+class CatalogSnapshot:
+    def __init__(self, version: str, columns: np.ndarray) -> None:
+        self.version = version
+        self.columns = columns
+
+    @classmethod
+    def open(cls, path: Path, version: str) -> CatalogSnapshot:
+        return cls(version, np.load(path, mmap_mode="r"))
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(~np.isnan(self.columns[0])))
+
+    def __contains__(self, food_id: int) -> bool:
+        return 0 <= food_id < self.columns.shape[1] and not np.isnan(self.columns[0, food_id])
+
+    def nutrients(self, food_id: int, quantity_g: float) -> dict[str, float] | None:
+        """Nutrients for ``quantity_g`` grams of ``food_id``; None if unknown."""
+        if food_id not in self:
+            return None
+        factor = quantity_g / 100.0
+        return {f: v * factor for f, v in zip(NUTRIENT_FIELDS, self.columns[:, food_id].tolist())}
+
+    def kcal(self, food_ids: Iterable[int], quantities_g: Iterable[float]) -> np.ndarray:
+        """Vectorised kcal per meal; NaN where a food id is unknown."""
+        ids = np.asarray(food_ids, dtype=np.int64)
+        qty = np.asarray(quantities_g, dtype=np.float64)
+        known = (ids >= 0) & (ids < self.columns.shape[1])
+        out = np.full(ids.shape, np.nan)
+        out[known] = self.columns[0, ids[known]] * qty[known] / 100.0
+        return out
+
+
+def _directory() -> Path:
+    return Path(settings.CALORIES_CATALOG_DIR)
+
+
+def _path(version: str) -> Path:
+    return _directory() / f"catalog-{version}.npy"
+
+
+def write_snapshot(path: Path) -> int:
+    """Dump the FoodItem table to ``path`` atomically; returns the row count."""
+    from .models import FoodItem
+
+    rows = np.array(
+        list(FoodItem.objects.order_by().values_list("id", *COLUMNS)), dtype=np.float64,
+    ).reshape(-1, len(COLUMNS) + 1)
+    ids = rows[:, 0].astype(np.int64)
+    columns = np.full((len(COLUMNS), int(ids.max()) + 1 if len(ids) else 0), np.nan)
+    columns[:, ids] = rows[:, 1:].T
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as fh:
+        np.save(fh, columns)
+    os.replace(tmp, path)
+    return len(ids)
+
+
+def _prune(keep: Path) -> None:
+    # Unlinking is safe for processes that still map an old file (POSIX); on
+    # platforms that refuse, the file is left for a later pass.
+    for old in _directory().glob("catalog-*.npy"):
+        if old != keep:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+_snapshot: CatalogSnapshot | None = None
+_snapshot_lock = threading.Lock()
+
+
+_version: tuple[tuple[str, int, int], str] | None = None
+
+
+def current_version() -> str:
+    global _version
+    path = _directory() / VERSION_FILE
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        catalog_changed()
+        stat = path.stat()
+    # os.replace() gives every new token a new inode.
+    seen = (str(path), stat.st_ino, stat.st_mtime_ns)
+    cached = _version
+    if cached is not None and cached[0] == seen:
+        return cached[1]
+    version = path.read_text().strip()
+    _version = (seen, version)
+    return version
+
+
+def get_snapshot() -> CatalogSnapshot:
+    """The mapped snapshot for the current version, built on first use."""
+    global _snapshot
+    version = current_version()
+    if _snapshot is None or _snapshot.version != version:
+        with _snapshot_lock:
+            if _snapshot is None or _snapshot.version != version:
+                path = _path(version)
+                try:
+                    _snapshot = CatalogSnapshot.open(path, version)
+                except FileNotFoundError:
+                    write_snapshot(path)
+                    _snapshot = CatalogSnapshot.open(path, version)
+                    _prune(keep=path)
+    return _snapshot
+
+
+def catalog_changed() -> None:
+    """Retire the current snapshot in every process; the next lookup rebuilds."""
+    path = _directory() / VERSION_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{VERSION_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(uuid.uuid4().hex)
+    os.replace(tmp, path)
+
+
+def nutrients(food_id: int, quantity_g: float) -> dict[str, float] | None:
+    return get_snapshot().nutrients(food_id, quantity_g)
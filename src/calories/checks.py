@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/checks.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Deployment checks for state kept in Django's cache.
+
+Conditional GET (calories.freshness) trusts version stamps in the default
+cache; with a per-process cache another worker answers 304 for pages that
+changed. check_shared_cache (calories.W001) therefore warns when DEBUG is
+off and the cache is per-process. A deployment that really runs a single
+process can add "calories.W001" to SILENCED_SYSTEM_CHECKS.
+===========================================================================
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings  # type: ignore
+from django.core.checks import Tags, Warning, register  # type: ignore
+
+# Backends whose entries only the process that wrote them can see.
+PER_PROCESS_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def shared_cache(alias: str = "default") -> bool:
+    """Whether the ``alias`` cache is visible to every process (Redis, Memcached, DB, files)."""
+    return settings.CACHES.get(alias, {}).get("BACKEND") not in PER_PROCESS_CACHES
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs: Any = None, **kwargs: Any) -> list[Warning]:
+    if settings.DEBUG or shared_cache():
+        return []
+    return [Warning(
+        "The default cache is per-process, so page version stamps are not shared "
+        "between workers and conditional GET can answer 304 with stale pages.",
+        hint="Set DJANGO_CACHE_BACKEND/DJANGO_CACHE_LOCATION to a shared cache (e.g. Redis), "
+        "or silence calories.W001 if only one process serves requests.",
+        obj=settings.CACHES["default"]["BACKEND"],
+        id="calories.W001",
+    )]
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/energy.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Per-user cached energy profile (BMR, TDEE, target calories).
+
+Values live in Django's cache so every worker shares them. Saving or
+deleting a UserProfile (views, admin, shell) invalidates the entry through
+the signal handlers in calories.signals, by giving the user a new version
+token. Entries are keyed by the token read before the database, so a miss
+racing an invalidation stores its stale value under a retired key.
+===========================================================================
+"""
+from __future__ import annotations
+
+import threading
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from django.conf import settings  # type: ignore
+from django.core.cache import cache  # type: ignore
+
+from .instrumentation import span
+from .utils import mifflin_st_jeor, target_calories_from_goal, tdee_from_bmr
+
+KEY_PREFIX = "calories:energy:v1:"
+VERSION_PREFIX = "calories:energy:version:"
+
+
+@dataclass(frozen=True)
+class EnergyProfile:
+    bmr: float
+    tdee: float
+    target: float
+
+    def rounded(self) -> dict[str, float]:
+        return {k: round(v, 2) for k, v in asdict(self).items()}
+
+
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def cache_stats() -> dict[str, int]:
+    """Hit/miss/invalidation counters for this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _key(user_id: int, version: str) -> str:
+    return f"{KEY_PREFIX}{user_id}:{version}"
+
+
+def _version_key(user_id: int) -> str:
+    return f"{VERSION_PREFIX}{user_id}"
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex
+
+
+def _version(user_id: int) -> str:
+    return cache.get_or_set(_version_key(user_id), _new_version, None)
+
+
+def _timeout() -> int | None:
+    return getattr(settings, "CALORIES_ENERGY_CACHE_TIMEOUT", 24 * 3600)
+
+
+def compute(profile: Any) -> EnergyProfile:
+    with span("formula"):
+        bmr = mifflin_st_jeor(profile.sex, profile.age, profile.height_cm, profile.weight_kg)
+        tdee = tdee_from_bmr(bmr, profile.activity_level)
+        return EnergyProfile(bmr, tdee, target_calories_from_goal(tdee, profile.goal))
+
+
+def prime(profile: Any, version: str | None = None) -> EnergyProfile:
+    """Compute from an in-hand profile and store it, skipping the database.
+    ``version`` is the token read before ``profile`` was loaded, if any."""
+    energy = compute(profile)
+    version = version or _version(profile.user_id)
+    cache.set(_key(profile.user_id, version), energy, _timeout())
+    return energy
+
+
+def get_energy_profile(user_id: int) -> EnergyProfile | None:
+    """Cached energy profile for ``user_id``; None if the user has no UserProfile."""
+    version = _version(user_id)
+    energy = cache.get(_key(user_id, version))
+    if energy is not None:
+        _count("hits")
+        return energy
+    _count("misses")
+    from .models import UserProfile
+
+    profile = UserProfile.objects.filter(user_id=user_id).first()
+    return prime(profile, version) if profile is not None else None
+
+
+async def aget_energy_profile(user_id: int) -> EnergyProfile | None:
+    """Async twin of get_energy_profile() for the ASGI views."""
+    version = await cache.aget_or_set(_version_key(user_id), _new_version, None)
+    energy = await cache.aget(_key(user_id, version))
+    if energy is not None:
+        _count("hits")
+        return energy
+    _count("misses")
+    from .models import UserProfile
+
+    profile = await UserProfile.objects.filter(user_id=user_id).afirst()
+    if profile is None:
+        return None
+    energy = compute(profile)
+    await cache.aset(_key(user_id, version), energy, _timeout())
+    return energy
+
+
+def invalidate(user_id: int) -> None:
+    _count("invalidations")
+    cache.set(_version_key(user_id), _new_version(), None)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/exports.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Streaming meal-history export (CSV / NDJSON).
+
+Rows come straight from a server-side cursor over tuples (no model
+instances) and are encoded one at a time, so memory stays flat. Archived
+months (calories.archive) are merged in date order, one partition at a time.
+===========================================================================
+"""
+from __future__ import annotations
+
+import csv
+import heapq
+import json
+from collections.abc import AsyncIterator, Generator, Iterable, Iterator
+from datetime import date
+from itertools import islice
+from typing import Any
+
+from asgiref.sync import sync_to_async  # type: ignore
+from django.contrib.auth import get_user_model  # type: ignore
+
+from . import archive
+from .models import NUTRIENT_FIELDS, FoodItem, MealEntry
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+COLUMNS = ("id", "user", "date", "food", "quantity_g", *NUTRIENT_FIELDS)
+CHUNK_SIZE = 2000
+# Spreadsheets run text cells starting with these as formulas.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def meal_rows(
+    user: Any = None, start: date | None = None, end: date | None = None
+) -> Iterator[tuple[Any, ...]]:
+    """Yield export tuples in ``COLUMNS`` order, oldest first, archived rows included."""
+    qs = MealEntry.objects.all()
+    if user is not None:
+        qs = qs.filter(user=user)
+    if start:
+        qs = qs.filter(date__gte=start)
+    if end:
+        qs = qs.filter(date__lte=end)
+    rows = (
+        qs.with_nutrients()
+        .order_by("date", "id")
+        .values_list("id", "user__username", "date", "food__name", "quantity_g", *NUTRIENT_FIELDS)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    live = ((*row[:5], *(round(v, 2) for v in row[5:])) for row in rows)
+    archived = _archived_rows(user.pk if user is not None else None, start, end)
+    yield from heapq.merge(live, archived, key=lambda row: (row[2], row[0]))
+
+
+def _archived_rows(
+    user_id: int | None, start: date | None, end: date | None,
+) -> Iterator[tuple[Any, ...]]:
+    for meals in archive.iter_months(user_id, start, end):
+        users = dict(
+            get_user_model().objects.filter(pk__in={m.user_id for m in meals})
+            .values_list("id", "username")
+        )
+        foods = dict(
+            FoodItem.objects.filter(pk__in={m.food_id for m in meals}).values_list("id", "name")
+        )
+        for m in meals:
+            yield (m.id, users.get(m.user_id), m.date, foods.get(m.food_id), m.quantity_g,
+                   *(round(v, 2) for v in m.nutrients().values()))
+
+
+class _Echo:
+    """File-like object whose write() just hands the line back (for csv.writer)."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _cell(value: Any) -> Any:
+    """Quote text a spreadsheet would run as a formula (CSV injection)."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def encode(rows: Iterable[tuple[Any, ...]], fmt: str) -> Generator[str, None, None]:
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(COLUMNS)
+        for row in rows:
+            yield writer.writerow([_cell(v) for v in row])
+    elif fmt == "ndjson":
+        for row in rows:
+            record = dict(zip(COLUMNS, row))
+            record["date"] = record["date"].isoformat()
+            yield json.dumps(record) + "\n"
+    else:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+
+
+async def astream(chunks: Generator[str, None, None], batch: int = 500) -> AsyncIterator[str]:
+    """Hand ``chunks`` to an ASGI StreamingHttpResponse, which would buffer a
+    sync iterator whole. The generator keeps running on the request's sync
+    thread (its database cursor lives there), ``batch`` chunks per hop."""
+    pull = sync_to_async(lambda: list(islice(chunks, batch)))
+    try:
+        while part := await pull():
+            yield "".join(part)
+    finally:
+        await sync_to_async(chunks.close)()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/favorites.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Each user's recent and frequent foods, offered first by the meal form's
+food picker so it never lists the whole catalog.
+
+FoodUsage holds a use count and the latest date per (user, food).
+calories.rollups updates it on every MealEntry write (used() / unused()),
+so reading it never scans meal history. The chosen food ids are cached per
+user and the entry is dropped once a write to that user's usage commits.
+Names are read fresh by primary key, so renamed or deleted foods never
+show up stale.
+===========================================================================
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from django.core.cache import cache  # type: ignore
+from django.db import transaction  # type: ignore
+from django.db.models import Case, Count, DateField, F, Max, Value, When  # type: ignore
+from django.db.models.functions import Greatest  # type: ignore
+
+from .models import FoodItem, FoodUsage, MealEntry
+
+KEY_PREFIX = "calories:favorites:v1:"
+RECENT = 5
+FREQUENT = 10
+
+
+def _key(user_id: int) -> str:
+    return f"{KEY_PREFIX}{user_id}"
+
+
+def _changed(users: Iterable[int]) -> None:
+    keys = [_key(u) for u in users]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def used(meals: Iterable[Any]) -> None:
+    """Count newly logged ``meals`` (MealEntry or MealSnapshot) toward their users' foods."""
+    counts: dict[tuple[int, int], list[Any]] = {}
+    for meal in meals:
+        seen = counts.setdefault((meal.user_id, meal.food_id), [0, meal.date])
+        seen[0] += 1
+        seen[1] = max(seen[1], meal.date)
+    if not counts:
+        return
+    per_user: dict[int, dict[int, list[Any]]] = defaultdict(dict)
+    for (user_id, food_id), seen in counts.items():
+        per_user[user_id][food_id] = seen
+    # Callers are already in a transaction; no savepoint of our own.
+    with transaction.atomic(savepoint=False):
+        FoodUsage.objects.bulk_create(
+            [FoodUsage(user_id=u, food_id=f, last_used=day) for (u, f), (_, day) in counts.items()],
+            ignore_conflicts=True,
+        )
+        # One UPDATE per user (a batch is one user's), whatever the number of foods.
+        for user_id, foods in per_user.items():
+            FoodUsage.objects.filter(user_id=user_id, food_id__in=foods).update(
+                uses=F("uses") + Case(*(When(food_id=f, then=n) for f, (n, _) in foods.items())),
+                last_used=Greatest("last_used", Case(
+                    *(When(food_id=f, then=Value(day)) for f, (_, day) in foods.items()),
+                    output_field=DateField(),
+                )),
+            )
+    _changed(per_user)
+
+
+def unused(meals: Iterable[Any]) -> None:
+    """Take back the uses of removed ``meals``; a food is forgotten at zero."""
+    per_user: dict[int, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    for meal in meals:
+        per_user[meal.user_id][meal.food_id] += 1
+    if not per_user:
+        return
+    with transaction.atomic(savepoint=False):
+        for user_id, foods in per_user.items():
+            rows = FoodUsage.objects.filter(user_id=user_id, food_id__in=foods)
+            taken = Case(*(When(food_id=f, then=n) for f, n in foods.items()))
+            rows.update(uses=Greatest(F("uses") - taken, 0))
+            rows.filter(uses=0).delete()
+    _changed(per_user)
+
+
+def rebuild() -> int:
+    """Recreate every FoodUsage row from MealEntry (after bulk loads); returns rows written."""
+    written, users = 0, set()
+    with transaction.atomic():
+        FoodUsage.objects.all().delete()
+        rows = (
+            MealEntry.objects.order_by()
+            .values("user_id", "food_id")
+            .annotate(uses=Count("id"), last_used=Max("date"))
+            .iterator(chunk_size=5000)
+        )
+        batch: list[FoodUsage] = []
+        for row in rows:
+            batch.append(FoodUsage(**row))
+            users.add(row["user_id"])
+            if len(batch) >= 5000:
+                written += len(FoodUsage.objects.bulk_create(batch))
+                batch = []
+        written += len(FoodUsage.objects.bulk_create(batch))
+    _changed(users)
+    return written
+
+
+def food_ids(user_id: int) -> list[int]:
+    """The user's RECENT latest foods followed by their most frequent ones."""
+    key = _key(user_id)
+    ids = cache.get(key)
+    if ids is None:
+        rows = FoodUsage.objects.filter(user_id=user_id)
+        food_ids = rows.values_list("food_id", flat=True)
+        recent = food_ids.order_by("-last_used", "-uses")[:RECENT]
+        frequent = food_ids.order_by("-uses", "-last_used")[:RECENT + FREQUENT]
+        ids = list(dict.fromkeys([*recent, *frequent]))[:RECENT + FREQUENT]
+        cache.set(key, ids, None)
+    return ids
+
+
+def choices(user_id: int | None, selected: Any = None) -> list[tuple[Any, Any]]:
+    """Picker options: the user's foods as a group, plus ``selected`` when it
+    is not among them. One primary-key query whatever the catalog size."""
+    ids = food_ids(user_id) if user_id is not None else []
+    try:
+        current = int(selected) if selected not in (None, "") else None
+    except (TypeError, ValueError):
+        current = None
+    wanted = {*ids, current} - {None}
+    names = dict(FoodItem.objects.filter(pk__in=wanted).values_list("id", "name")) if wanted else {}
+    options: list[tuple[Any, Any]] = [("", "---------")]
+    if current in names and current not in ids:
+        options.append((current, names[current]))
+    mine = [(i, names[i]) for i in ids if i in names]
+    if mine:
+        options.append(("Recent and frequent", mine))
+    return options
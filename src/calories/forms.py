@@ -11,12 +11,20 @@ License: MIT License (see LICENSE file for details)
 ===========================================================================
 
 Forms for profiles, foods, and meals.
+
+The meal form's food field renders only the user's recent and frequent
+foods (calories.favorites) plus a search box that fetches matches from
+/foods/search/, so its size does not grow with the catalog.
 ===========================================================================
 """
 from __future__ import annotations
+from typing import Any
+
 from django import forms  # type: ignore
 from django.contrib.auth.forms import UserCreationForm  # type: ignore
 from django.contrib.auth.models import User  # type: ignore
+from django.urls import reverse  # type: ignore
+from . import favorites
 from .models import UserProfile, FoodItem, MealEntry
 
 
@@ -40,7 +48,25 @@ class FoodItemForm(forms.ModelForm):
         fields = ("name", "calories_per_100g", "protein_g", "carbs_g", "fat_g")
 
 
+class FoodPicker(forms.Select):
+    """A food <select> with a search box; food_picker.js adds search results as options."""
+    template_name = "calories/widgets/food_picker.html"
+
+    class Media:
+        js = ("calories/js/food_picker.js",)
+
+
 class MealEntryForm(forms.ModelForm):
     class Meta:
         model = MealEntry
         fields = ("date", "food", "quantity_g")
+        widgets = {"food": FoodPicker}
+
+    def __init__(self, *args: Any, user: Any = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Only the rendered options change: validation is still the field's
+        # single-row queryset.get() on the submitted id.
+        widget = self.fields["food"].widget
+        widget.attrs["data-search-url"] = reverse("food_search")
+        user_id = user.pk if user is not None else None
+        widget.choices = favorites.choices(user_id, self["food"].value())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/freshness.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Version stamps for conditional GET on the polled HTML pages.
+
+Each scope (the food catalog, one user's meals and profile, or archived
+history) has a stamp in Django's cache: a whole-second modification time
+plus a random token. Writers call changed() and the stamp is replaced once
+their transaction commits: FoodItem signals and imports for the catalog,
+calories.rollups and the UserProfile signal for users, calories.archive for
+the archive. Views wrapped in conditional() compute ETag and Last-Modified
+from the stamps alone and answer 304 without querying meals or rendering.
+Stamps must live in a cache shared by every worker; calories.checks
+warns without DEBUG on a per-process cache (calories.W001).
+===========================================================================
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, timezone
+from typing import Any
+
+from django.contrib import messages  # type: ignore
+from django.core.cache import cache  # type: ignore
+from django.db import transaction  # type: ignore
+from django.http import HttpRequest  # type: ignore
+from django.views.decorators.http import condition  # type: ignore
+
+KEY_PREFIX = "calories:stamp:v1:"
+CATALOG = "catalog"
+USER = "user"
+ARCHIVE = "archive"
+
+Stamp = tuple[int, str]
+
+
+def user_scope(user_id: int) -> str:
+    return f"{USER}:{user_id}"
+
+
+def _next(previous: Stamp | None) -> Stamp:
+    # Strictly increasing seconds, so If-Modified-Since never matches a
+    # change made within the same second as the copy the client holds.
+    now = int(time.time())
+    return max(now, previous[0] + 1) if previous else now, uuid.uuid4().hex[:16]
+
+
+def _bump(scopes: Iterable[str]) -> None:
+    keys = [KEY_PREFIX + s for s in scopes]
+    current = cache.get_many(keys)
+    cache.set_many({k: _next(current.get(k)) for k in keys}, None)
+
+
+def changed(*scopes: str) -> None:
+    """Replace the stamps of ``scopes`` once the current transaction commits.
+
+    Not before: a page read between the bump and the commit would be cached
+    by the client under the new stamp with the old data."""
+    transaction.on_commit(lambda: _bump(scopes))
+
+
+def stamps(scopes: Iterable[str]) -> list[Stamp]:
+    """Current stamps, starting any missing (never written or evicted) at now."""
+    keys = [KEY_PREFIX + s for s in scopes]
+    found = cache.get_many(keys)
+    return [
+        found[k] if k in found else cache.get_or_set(k, lambda: _next(None), None) for k in keys
+    ]
+
+
+def _validators(
+    request: HttpRequest, scopes: tuple[str, ...], daily: bool,
+) -> tuple[str, datetime] | None:
+    # Pending flash messages are part of the page; never answer 304 over them.
+    if request.method not in ("GET", "HEAD") or len(messages.get_messages(request)):
+        return None
+    user = request.user
+    values = stamps(user_scope(user.pk) if s == USER else s for s in scopes)
+    modified = max(ts for ts, _ in values)
+    parts = [
+        *(token for _, token in values),
+        str(user.pk),
+        user.get_username(),
+        request.get_full_path(),
+        # Forms on the page embed the CSRF secret, which rotates at login.
+        request.META.get("CSRF_COOKIE", ""),
+    ]
+    if daily:
+        today = date.today()
+        parts.append(today.isoformat())
+        modified = max(modified, int(datetime.combine(today, datetime.min.time()).timestamp()))
+    digest = hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest()
+    # Weak: the rendered CSRF token differs byte-for-byte between renders.
+    return f'W/"{digest}"', datetime.fromtimestamp(modified, tz=timezone.utc)
+
+
+def conditional(*scopes: str, daily: bool = False) -> Callable[[Any], Any]:
+    """``condition()`` for a page built from ``scopes`` (CATALOG, USER, ARCHIVE) and,
+    with ``daily``, today's date. Apply inside login_required."""
+
+    def validators(request: HttpRequest) -> tuple[str, datetime] | None:
+        if not hasattr(request, "_calories_validators"):
+            request._calories_validators = _validators(request, scopes, daily)
+        return request._calories_validators
+
+    def etag(request: HttpRequest, *args: Any, **kwargs: Any) -> str | None:
+        found = validators(request)
+        return found[0] if found else None
+
+    def last_modified(request: HttpRequest, *args: Any, **kwargs: Any) -> datetime | None:
+        found = validators(request)
+        return found[1] if found else None
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/http.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Request parsing and JSON response helpers shared by views and async_views.
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import asdict
+from datetime import date
+from typing import Any
+
+from django.http import HttpRequest, JsonResponse
+from django.utils.dateparse import parse_date
+
+from . import search, sync
+from .pagination import DEFAULT_PAGE_SIZE, KeysetPage
+
+
+def date_param(request: HttpRequest, name: str) -> date | None:
+    """Parse an optional ``YYYY-MM-DD`` query parameter; raises ValueError if malformed."""
+    raw = request.GET.get(name)
+    if not raw:
+        return None
+    parsed = parse_date(raw)
+    if parsed is None:
+        raise ValueError(f"Invalid date for {name!r}: {raw!r}")
+    return parsed
+
+
+def number_param(request: HttpRequest, name: str, default: float | None, cast: type = float) -> Any:
+    """Parse an optional numeric query parameter; raises ValueError if
+    malformed or not finite (``nan``, ``inf``)."""
+    raw = request.GET.get(name)
+    if raw in (None, ""):
+        return default
+    try:
+        value = cast(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be a number") from None
+    if not math.isfinite(value):
+        raise ValueError(f"{name} must be a finite number")
+    return value
+
+
+def id_list_param(request: HttpRequest, name: str) -> list[int]:
+    """Comma-separated ids, e.g. ``?exclude=3,17``; raises ValueError if malformed."""
+    raw = request.GET.get(name, "")
+    try:
+        return [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError(f"{name} must be a comma-separated list of ids") from None
+
+
+def list_param(request: HttpRequest, name: str, default: list[Any], cast: type = str) -> list[Any]:
+    """Repeated or comma-separated values, e.g. ``?goal=lose,gain`` or
+    ``?goal=lose&goal=gain``; raises ValueError if malformed or, for numbers,
+    not finite."""
+    raw = [part.strip() for value in request.GET.getlist(name) for part in value.split(",")]
+    raw = [part for part in raw if part]
+    if not raw:
+        return default
+    try:
+        values = [cast(part) for part in raw]
+    except ValueError:
+        raise ValueError(f"{name} must be a comma-separated list") from None
+    if any(isinstance(v, float) and not math.isfinite(v) for v in values):
+        raise ValueError(f"{name} must list finite numbers")
+    return values
+
+
+def size_param(request: HttpRequest, default: int = DEFAULT_PAGE_SIZE) -> int:
+    try:
+        return int(request.GET.get("size", default))
+    except ValueError:
+        return default
+
+
+def page_urls(request: HttpRequest, page: KeysetPage) -> dict[str, str | None]:
+    """Next/previous links that keep the current filters."""
+    def url(key: str, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+        params = request.GET.copy()
+        params.pop("after", None)
+        params.pop("before", None)
+        params[key] = cursor
+        return f"?{params.urlencode()}"
+
+    return {"next_url": url("after", page.next_cursor), "prev_url": url("before", page.prev_cursor)}
+
+
+def search_params(request: HttpRequest) -> tuple[str, int]:
+    try:
+        limit = int(request.GET.get("limit", 10))
+    except ValueError:
+        limit = 10
+    return request.GET.get("q", ""), limit
+
+
+def search_response(query: str, hits: list[search.SearchHit]) -> JsonResponse:
+    return JsonResponse({"query": query, "results": [asdict(h) for h in hits]})
+
+
+def bulk_entries(request: HttpRequest) -> tuple[list | None, JsonResponse | None]:
+    try:
+        payload = json.loads(request.body)
+    except (ValueError, UnicodeDecodeError):
+        return None, JsonResponse({"error": "Body must be JSON."}, status=400)
+    entries = payload.get("entries") if isinstance(payload, dict) else None
+    if not isinstance(entries, list) or not entries:
+        return None, JsonResponse({"error": "'entries' must be a non-empty list."}, status=400)
+    if len(entries) > sync.MAX_BATCH:
+        error = f"At most {sync.MAX_BATCH} entries per request."
+        return None, JsonResponse({"error": error}, status=400)
+    return entries, None
+
+
+def bulk_response(result: sync.SyncResult) -> JsonResponse:
+    body = {"created": result.created, "duplicates": result.duplicates, "results": result.results}
+    return JsonResponse(body, status=400 if result.errors else 201)
+
+
+def bulk_conflict() -> JsonResponse:
+    return JsonResponse({"error": "Conflicting concurrent sync; retry the request."}, status=409)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/imports.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Streaming FoodItem catalog import from CSV or NDJSON (optionally gzipped).
+
+Rows are validated with FoodItemForm's field rules and upserted on the
+unique ``name`` in fixed-size batches, one transaction per batch, so memory
+stays bounded whatever the file size.
+===========================================================================
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TextIO
+
+from django.core.exceptions import ValidationError  # type: ignore
+from django.db import transaction  # type: ignore
+
+from . import jobs
+from .forms import FoodItemForm
+from .models import NUTRIENT_COLUMNS, FoodItem
+
+FIELDS = FoodItemForm.Meta.fields
+UPDATE_FIELDS = [f for f in FIELDS if f != "name"]
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    created: int = 0
+    updated: int = 0
+    rejected: int = 0
+    rejects: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _open(path: str) -> AbstractContextManager[TextIO]:
+    if path == "-":
+        return nullcontext(sys.stdin)  # leave stdin open for the caller
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def detect_format(path: str) -> str:
+    suffixes = [s.lower() for s in Path(path).suffixes if s.lower() != ".gz"]
+    return "ndjson" if suffixes and suffixes[-1] in (".ndjson", ".jsonl", ".json") else "csv"
+
+
+def iter_records(path: str, fmt: str | None = None) -> Iterator[tuple[int, dict[str, Any] | None]]:
+    """Yield ``(line_no, record)``; ``record`` is None for unparseable NDJSON lines."""
+    fmt = fmt or detect_format(path)
+    with _open(path) as fh:
+        if fmt == "csv":
+            reader = csv.DictReader(fh)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for line_no, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None
+                yield line_no, record if isinstance(record, dict) else None
+
+
+def clean_record(record: dict[str, Any]) -> tuple[dict[str, Any] | None, dict[str, list[str]]]:
+    """Apply FoodItemForm's field validation (without its per-row unique query)."""
+    cleaned: dict[str, Any] = {}
+    errors: dict[str, list[str]] = {}
+    for name, form_field in FoodItemForm.base_fields.items():
+        try:
+            cleaned[name] = form_field.clean(record.get(name))
+        except ValidationError as exc:
+            errors[name] = exc.messages
+    return (None, errors) if errors else (cleaned, {})
+
+
+def _flush(batch: dict[str, dict[str, Any]], stats: ImportStats, dry_run: bool) -> None:
+    if not batch:
+        return
+    with transaction.atomic():
+        columns = list(NUTRIENT_COLUMNS.values())
+        rows = FoodItem.objects.filter(name__in=batch.keys()).values_list("name", "id", *columns)
+        existing = {name: (pk, values) for name, pk, *values in rows}
+        if not dry_run:
+            FoodItem.objects.bulk_create(
+                [FoodItem(**row) for row in batch.values()],
+                update_conflicts=True,
+                unique_fields=["name"],
+                update_fields=UPDATE_FIELDS,
+            )
+            # Upserts skip model signals; refresh summaries of foods whose values changed.
+            changed = sorted(
+                pk for name, (pk, values) in existing.items()
+                if values != [batch[name][c] for c in columns]
+            )
+            if changed:
+                jobs.enqueue("recompute_food_rollups", {"food_ids": changed})
+    stats.updated += len(existing)
+    stats.created += len(batch) - len(existing)
+    batch.clear()
+
+
+def import_foods(
+    path: str,
+    fmt: str | None = None,
+    batch_size: int = 2000,
+    dry_run: bool = False,
+    max_rejects_kept: int = 1000,
+    on_reject: Callable[[dict[str, Any]], None] | None = None,
+    on_progress: Callable[[ImportStats], None] | None = None,
+) -> ImportStats:
+    stats = ImportStats()
+    batch: dict[str, dict[str, Any]] = {}
+    for line_no, record in iter_records(path, fmt):
+        stats.read += 1
+        if record is None:
+            cleaned, errors = None, {"__all__": ["Invalid JSON object."]}
+        else:
+            cleaned, errors = clean_record(record)
+        if cleaned is None:
+            stats.rejected += 1
+            reject = {"line": line_no, "errors": errors, "record": record}
+            if len(stats.rejects) < max_rejects_kept:
+                stats.rejects.append(reject)
+            if on_reject:
+                on_reject(reject)
+            continue
+        batch[cleaned["name"]] = cleaned  # later duplicates in a batch win
+        if len(batch) >= batch_size:
+            _flush(batch, stats, dry_run)
+            if on_progress:
+                on_progress(stats)
+    _flush(batch, stats, dry_run)
+    if not dry_run and (stats.created or stats.updated):
+        from . import catalog, freshness, search
+
+        catalog.catalog_changed()
+        search.catalog_changed()
+        freshness.changed(freshness.CATALOG)
+    return stats
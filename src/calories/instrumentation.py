@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/instrumentation.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Opt-in per-request timing (enable with CALORIES_REQUEST_TIMING=True).
+
+RequestTimingMiddleware splits each request into SQL, template rendering,
+named spans (e.g. the energy formulas) and the remaining view time, and
+reports them in a ``Server-Timing`` header. Requests slower than
+CALORIES_SLOW_REQUEST_MS are logged as JSON to the ``calories.slow_requests``
+logger with their worst queries. Per-URL-name latency histograms are kept
+in Django's cache; ``manage.py request_timings`` runs in its own process, so
+it can only read them from a shared cache (DJANGO_CACHE_BACKEND), which then
+also sums every worker.
+===========================================================================
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction  # type: ignore
+from django.conf import settings  # type: ignore
+from django.core.cache import cache  # type: ignore
+from django.db import connections  # type: ignore
+from django.db.backends.signals import connection_created  # type: ignore
+from django.template.backends import django as django_backend  # type: ignore
+
+logger = logging.getLogger("calories.slow_requests")
+
+KEY_PREFIX = "calories:timing:v1:"
+# Histogram bucket upper bounds in ms; the last bucket is open-ended.
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+WORST_QUERIES = 5
+SQL_PREVIEW_CHARS = 500
+
+
+@dataclass
+class RequestTiming:
+    queries: int = 0
+    sql_s: float = 0.0
+    render_s: float = 0.0
+    spans: dict[str, float] = field(default_factory=dict)
+    worst: list[tuple[float, int, str]] = field(default_factory=list)
+
+    def add_query(self, sql: str, elapsed: float) -> None:
+        self.queries += 1
+        self.sql_s += elapsed
+        item = (elapsed, self.queries, sql)
+        if len(self.worst) < WORST_QUERIES:
+            heapq.heappush(self.worst, item)
+        elif elapsed > self.worst[0][0]:
+            heapq.heapreplace(self.worst, item)
+
+    def worst_queries(self) -> list[dict[str, Any]]:
+        return [
+            {"ms": round(s * 1000, 2), "sql": sql[:SQL_PREVIEW_CHARS]}
+            for s, _, sql in sorted(self.worst, reverse=True)
+        ]
+
+
+_current: ContextVar[RequestTiming | None] = ContextVar("calories_request_timing", default=None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Attribute the enclosed time to ``name`` in the current request's timing.
+    A no-op outside an instrumented request."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    sql_before = timing.sql_s
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0 - (timing.sql_s - sql_before)
+        timing.spans[name] = timing.spans.get(name, 0.0) + elapsed
+
+
+def _record_query(execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    t0 = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.add_query(sql, time.perf_counter() - t0)
+
+
+def _wrap_connection(connection: Any, **kwargs: Any) -> None:
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+_installed = False
+
+
+def install() -> None:
+    """Hook query execution and template rendering once per process. The hooks
+    only do work inside a request handled by RequestTimingMiddleware."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    # Connection objects are per thread (sync_to_async workers get their own),
+    # so wrap each one as it is created as well as those already open here.
+    create_connection = connections.create_connection
+
+    def create_wrapped(alias: str) -> Any:
+        connection = create_connection(alias)
+        _wrap_connection(connection)
+        return connection
+
+    connections.create_connection = create_wrapped
+    connection_created.connect(_wrap_connection, dispatch_uid="calories.instrumentation")
+    for connection in connections.all(initialized_only=True):
+        _wrap_connection(connection)
+
+    render = django_backend.Template.render
+
+    def timed_render(self: Any, context: Any = None, request: Any = None) -> Any:
+        timing = _current.get()
+        if timing is None:
+            return render(self, context, request)
+        sql_before = timing.sql_s
+        t0 = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            # Lazy querysets evaluated by the template count as SQL, not render.
+            timing.render_s += time.perf_counter() - t0 - (timing.sql_s - sql_before)
+
+    django_backend.Template.render = timed_render
+
+
+def _bucket(ms: float) -> str:
+    for bound in BUCKETS_MS:
+        if ms <= bound:
+            return str(bound)
+    return "inf"
+
+
+def _incr(key: str, delta: int = 1) -> None:
+    if not cache.add(key, delta, None):
+        try:
+            cache.incr(key, delta)
+        except ValueError:  # evicted between add() and incr()
+            cache.add(key, delta, None)
+
+
+def record(url_name: str, total_ms: float) -> None:
+    prefix = f"{KEY_PREFIX}{url_name}:"
+    _incr(prefix + _bucket(total_ms))
+    _incr(prefix + "sum_us", int(total_ms * 1000))
+
+
+def histograms(url_names: list[str]) -> dict[str, dict[str, Any]]:
+    """``{url_name: {"count", "mean_ms", "buckets": {bound: n}}}`` for names seen."""
+    bounds = [str(b) for b in BUCKETS_MS] + ["inf"]
+    keys = [f"{KEY_PREFIX}{n}:{s}" for n in url_names for s in bounds + ["sum_us"]]
+    stored = cache.get_many(keys)
+    out = {}
+    for name in url_names:
+        buckets = {b: stored.get(f"{KEY_PREFIX}{name}:{b}", 0) for b in bounds}
+        count = sum(buckets.values())
+        if count:
+            total_us = stored.get(f"{KEY_PREFIX}{name}:sum_us", 0)
+            mean_ms = round(total_us / count / 1000, 2)
+            out[name] = {"count": count, "mean_ms": mean_ms, "buckets": buckets}
+    return out
+
+
+def reset_histograms(url_names: list[str]) -> None:
+    bounds = [str(b) for b in BUCKETS_MS] + ["inf", "sum_us"]
+    cache.delete_many([f"{KEY_PREFIX}{n}:{s}" for n in url_names for s in bounds])
+
+
+class RequestTimingMiddleware:
+    """Put first in MIDDLEWARE so the total covers the whole stack."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.slow_ms = getattr(settings, "CALORIES_SLOW_REQUEST_MS", 500)
+        install()
+
+    def __call__(self, request: Any) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = _current.set(timing)
+        t0 = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timing, time.perf_counter() - t0)
+
+    async def __acall__(self, request: Any) -> Any:
+        timing = RequestTiming()
+        token = _current.set(timing)
+        t0 = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timing, time.perf_counter() - t0)
+
+    def _finish(self, request: Any, response: Any, timing: RequestTiming, total_s: float) -> Any:
+        spans_s = sum(timing.spans.values())
+        view_s = max(total_s - timing.sql_s - timing.render_s - spans_s, 0.0)
+        metrics = [
+            f'sql;dur={timing.sql_s * 1000:.2f};desc="{timing.queries} queries"',
+            f"render;dur={timing.render_s * 1000:.2f}",
+            *(f"{name};dur={s * 1000:.2f}" for name, s in timing.spans.items()),
+            f"view;dur={view_s * 1000:.2f}",
+            f"total;dur={total_s * 1000:.2f}",
+        ]
+        response["Server-Timing"] = ", ".join(metrics)
+
+        match = getattr(request, "resolver_match", None)
+        url_name = (match.url_name if match else None) or "<unresolved>"
+        total_ms = total_s * 1000
+        record(url_name, total_ms)
+        if total_ms >= self.slow_ms:
+            logger.warning(json.dumps({
+                "event": "slow_request",
+                "method": request.method,
+                "path": request.path,
+                "url_name": url_name,
+                "status": response.status_code,
+                "total_ms": round(total_ms, 2),
+                "sql_ms": round(timing.sql_s * 1000, 2),
+                "queries": timing.queries,
+                "render_ms": round(timing.render_s * 1000, 2),
+                "view_ms": round(view_s * 1000, 2),
+                "spans_ms": {k: round(v * 1000, 2) for k, v in timing.spans.items()},
+                "worst_queries": timing.worst_queries(),
+            }))
+        return response
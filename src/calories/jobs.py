@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/jobs.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Background jobs on a database-backed queue; no broker to run.
+
+Code enqueues a Job row inside its own transaction, so work is queued only
+if the change that caused it commits. ``manage.py run_jobs`` claims ready
+jobs and calls the handler registered for their ``kind``. A handler that
+returns a dict has more to do: the dict becomes the payload of a follow-up
+job, which keeps every transaction short and lets other work interleave.
+Failures are retried with backoff; jobs whose worker died are requeued
+(a job's lock is restamped when it starts, so a long batch is not).
+===========================================================================
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import traceback
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.db import transaction  # type: ignore
+from django.utils import timezone  # type: ignore
+
+from .models import Job
+
+logger = logging.getLogger("calories.jobs")
+
+MAX_ATTEMPTS = 5
+STALE_AFTER = timedelta(minutes=10)
+
+Handler = Callable[[dict[str, Any]], "dict[str, Any] | None"]
+HANDLERS: dict[str, Handler] = {}
+
+
+def task(kind: str) -> Callable[[Handler], Handler]:
+    """Register ``fn(payload) -> next_payload | None`` as the handler for ``kind``."""
+    def register(fn: Handler) -> Handler:
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def enqueue(
+    kind: str, payload: dict[str, Any] | None = None, delay: timedelta | None = None,
+) -> Job:
+    if kind not in HANDLERS:
+        raise ValueError(f"No job handler registered for {kind!r}")
+    return Job.objects.create(
+        kind=kind, payload=payload or {}, run_after=timezone.now() + (delay or timedelta()),
+    )
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(2 ** attempts * 5, 3600))
+
+
+def claim(worker: str, limit: int = 1, now: datetime | None = None) -> list[Job]:
+    """Mark up to ``limit`` ready jobs as running for ``worker`` and return them."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED, run_after__lte=now)
+            .order_by("run_after", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        Job.objects.filter(id__in=ids, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING, locked_by=worker, locked_at=now, updated_at=now,
+        )
+        return list(Job.objects.filter(id__in=ids, locked_by=worker, status=Job.Status.RUNNING))
+
+
+def start(job: Job, worker: str) -> bool:
+    """Restamp ``job.locked_at`` just before running it, so the rest of a
+    claimed batch is not requeued as stale while earlier jobs run. False if
+    the job was requeued (and possibly claimed elsewhere) in the meantime."""
+    now = timezone.now()
+    return bool(
+        Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING, locked_by=worker)
+        .update(locked_at=now, updated_at=now)
+    )
+
+
+def run(job: Job) -> None:
+    """Run one claimed job and record the outcome."""
+    job.attempts += 1
+    try:
+        with transaction.atomic():
+            follow_up = HANDLERS[job.kind](job.payload)
+            if follow_up is not None:
+                enqueue(job.kind, follow_up)
+            job.status, job.last_error = Job.Status.DONE, ""
+            job.save(update_fields=["status", "attempts", "last_error", "updated_at"])
+    except Exception:
+        job.last_error = traceback.format_exc(limit=20)
+        if job.attempts >= MAX_ATTEMPTS or job.kind not in HANDLERS:
+            job.status = Job.Status.FAILED
+        else:
+            job.status, job.run_after = Job.Status.QUEUED, timezone.now() + _backoff(job.attempts)
+        job.save(update_fields=["status", "attempts", "last_error", "run_after", "updated_at"])
+        logger.exception("job %s (%s) failed, attempt %s", job.pk, job.kind, job.attempts)
+
+
+def requeue_stale(older_than: timedelta = STALE_AFTER) -> int:
+    """Put jobs back whose worker stopped mid-run (crash, kill -9)."""
+    return Job.objects.filter(
+        status=Job.Status.RUNNING, locked_at__lt=timezone.now() - older_than,
+    ).update(status=Job.Status.QUEUED, locked_by="", locked_at=None)
+
+
+def purge(older_than: timedelta) -> int:
+    return Job.objects.filter(
+        status=Job.Status.DONE, updated_at__lt=timezone.now() - older_than,
+    ).delete()[0]
+
+
+def work(
+    worker: str,
+    burst: bool = False,
+    batch: int = 10,
+    idle_sleep: float = 1.0,
+    max_jobs: int | None = None,
+    stop: threading.Event | None = None,
+) -> int:
+    """Process jobs until stopped (or, with ``burst``, until the queue is empty).
+    Returns the number of jobs run."""
+    stop = stop or threading.Event()
+    done = 0
+    requeue_stale()
+    while not stop.is_set() and (max_jobs is None or done < max_jobs):
+        jobs = claim(worker, limit=min(batch, max_jobs - done) if max_jobs else batch)
+        if not jobs:
+            if burst:
+                break
+            stop.wait(idle_sleep)
+            requeue_stale()
+            continue
+        for job in jobs:
+            if not start(job, worker):
+                continue
+            run(job)
+            done += 1
+    return done
+
+
+def drain(worker: str = "inline") -> int:
+    """Run everything that is ready, in this process (tests, shell)."""
+    return work(worker, burst=True)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/management/commands/archive_meals.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Move whole months of old MealEntry rows into the columnar archive
+(calories.archive). Safe to run repeatedly, e.g. from a monthly cron job.
+
+    python manage.py archive_meals
+    python manage.py archive_meals --older-than-days 365 --dry-run
+===========================================================================
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand  # type: ignore
+
+from calories import archive
+
+
+class Command(BaseCommand):
+    help = "Archive MealEntry months older than CALORIES_ARCHIVE_AFTER_DAYS."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--older-than-days", type=int,
+                            help="Override CALORIES_ARCHIVE_AFTER_DAYS for this run.")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="List the months without moving them."
+        )
+
+    def handle(self, *args, **options) -> None:
+        before = archive.cutoff(options["older_than_days"])
+        months = archive.archivable_months(before)
+        if options["dry_run"]:
+            for month in months:
+                self.stdout.write(month)
+            self.stdout.write(f"{len(months)} months before {before} would be archived.")
+            return
+        total = 0
+        for month in months:
+            moved = archive.archive_month(month)
+            total += moved
+            self.stdout.write(f"{month}: {moved} meals archived.")
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} meals from {len(months)} months."))
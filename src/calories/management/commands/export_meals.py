@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/management/commands/export_meals.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Export meal history for every user (or one) as CSV or NDJSON.
+
+    python manage.py export_meals --format ndjson --from 2024-01-01 -o meals.ndjson
+===========================================================================
+"""
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model  # type: ignore
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+from django.utils.dateparse import parse_date  # type: ignore
+
+from calories import exports
+
+
+class Command(BaseCommand):
+    help = "Stream meal entries with computed calories and macros to a file or stdout."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--format", choices=sorted(exports.FORMATS), default="csv")
+        parser.add_argument("--from", dest="start", help="First date (YYYY-MM-DD), inclusive.")
+        parser.add_argument("--to", dest="end", help="Last date (YYYY-MM-DD), inclusive.")
+        parser.add_argument("--user", help="Only export this username.")
+        parser.add_argument("-o", "--output", help="Output path (default: stdout).")
+
+    def _date(self, raw: str | None):
+        if raw is None:
+            return None
+        parsed = parse_date(raw)
+        if parsed is None:
+            raise CommandError(f"Invalid date: {raw!r}")
+        return parsed
+
+    def handle(self, *args, **options) -> None:
+        user = None
+        if options["user"]:
+            try:
+                user = get_user_model().objects.get(username=options["user"])
+            except get_user_model().DoesNotExist as exc:
+                raise CommandError(f"No such user: {options['user']}") from exc
+        rows = exports.meal_rows(user, self._date(options["start"]), self._date(options["end"]))
+        lines = exports.encode(rows, options["format"])
+        if not options["output"]:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+        with open(options["output"], "w", encoding="utf-8", newline="") as out:
+            out.writelines(lines)
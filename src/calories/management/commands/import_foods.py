@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/management/commands/import_foods.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Bulk-load the food catalog from CSV or NDJSON.
+
+    python manage.py import_foods foods.csv.gz --batch-size 5000 --rejects rejects.ndjson
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+
+from calories.imports import ImportStats, import_foods
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV/NDJSON food file into FoodItem, upserting on name."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("path", help="CSV or NDJSON file (.gz allowed, '-' for stdin).")
+        parser.add_argument(
+            "--format", choices=["csv", "ndjson"], help="Override detection by extension."
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--rejects", help="Write rejected rows here as NDJSON.")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Validate and count without writing."
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["path"] == "-" and not options["format"]:
+            raise CommandError("--format is required when reading from stdin.")
+        started = time.monotonic()
+        rejects_fh = open(options["rejects"], "w", encoding="utf-8") if options["rejects"] else None
+
+        def on_reject(reject: dict) -> None:
+            if rejects_fh:
+                rejects_fh.write(json.dumps(reject, default=str) + "\n")
+
+        def on_progress(stats: ImportStats) -> None:
+            rate = stats.read / max(time.monotonic() - started, 1e-9)
+            self.stdout.write(
+                f"read={stats.read} created={stats.created} updated={stats.updated} "
+                f"rejected={stats.rejected} ({rate:,.0f} rows/s)"
+            )
+
+        try:
+            stats = import_foods(
+                options["path"],
+                fmt=options["format"],
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+                on_reject=on_reject,
+                on_progress=on_progress,
+            )
+        finally:
+            if rejects_fh:
+                rejects_fh.close()
+
+        for reject in stats.rejects[:10]:
+            self.stderr.write(f"line {reject['line']}: {reject['errors']}")
+        summary = (
+            f"Done in {time.monotonic() - started:.1f}s: read={stats.read} created={stats.created} "
+            f"updated={stats.updated} rejected={stats.rejected}"
+        )
+        if options["dry_run"]:
+            summary += " (dry run)"
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/management/commands/rebuild_daily_summaries.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Rebuild DailyNutritionSummary from MealEntry, or check it for drift.
+
+    python manage.py rebuild_daily_summaries           # full rebuild
+    python manage.py rebuild_daily_summaries --check   # report only
+===========================================================================
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+
+from calories import rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-user daily nutrition summaries from meal entries, or check them for drift."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--check", action="store_true", help="Only report drift; exit 1 if any."
+        )
+        parser.add_argument("--tolerance", type=float, default=0.01, help="Allowed absolute error.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options) -> None:
+        if options["check"]:
+            drift = rollups.find_drift(tolerance=options["tolerance"])
+            for d in drift[:50]:
+                self.stdout.write(f"user={d['user_id']} date={d['date']} "
+                                  f"expected={d['expected']} stored={d['stored']}")
+            if drift:
+                raise CommandError(f"{len(drift)} summary row(s) drifted; run without --check.")
+            self.stdout.write(self.style.SUCCESS("Daily summaries are consistent."))
+            return
+        written = rollups.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} daily summary row(s)."))
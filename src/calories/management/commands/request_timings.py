@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/management/commands/request_timings.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Per-URL-name latency histograms recorded by RequestTimingMiddleware.
+Needs a shared cache backend; the default per-process cache is refused.
+
+    python manage.py request_timings            # table
+    python manage.py request_timings --json     # machine readable
+    python manage.py request_timings --reset
+===========================================================================
+"""
+from __future__ import annotations
+
+import json
+
+from django.conf import settings  # type: ignore
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+from django.urls import URLPattern, URLResolver, get_resolver  # type: ignore
+
+from calories import checks, instrumentation
+
+
+def _url_names(patterns: list) -> list[str]:
+    names = []
+    for p in patterns:
+        if isinstance(p, URLResolver):
+            names += _url_names(p.url_patterns)
+        elif isinstance(p, URLPattern) and p.name:
+            names.append(p.name)
+    return names
+
+
+def _percentile(buckets: dict[str, int], q: float) -> str:
+    """Upper bound of the bucket holding the q-th request."""
+    rank, seen = q * sum(buckets.values()), 0
+    for bound, n in buckets.items():
+        seen += n
+        if n and seen >= rank:
+            return f"<={bound}" if bound != "inf" else f">{instrumentation.BUCKETS_MS[-1]}"
+    return "-"
+
+
+class Command(BaseCommand):
+    help = "Show per-URL-name request latency histograms recorded by RequestTimingMiddleware."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--json", action="store_true", help="Print raw histograms as JSON.")
+        parser.add_argument("--reset", action="store_true", help="Clear all recorded histograms.")
+
+    def handle(self, *args, **options) -> None:
+        if not checks.shared_cache():
+            raise CommandError(
+                "Request timings are recorded in each web process's own cache "
+                f"({settings.CACHES['default']['BACKEND']}), which this command cannot read. "
+                "Set DJANGO_CACHE_BACKEND to a shared cache (e.g. Redis)."
+            )
+        names = sorted(set(_url_names(get_resolver().url_patterns))) + ["<unresolved>"]
+        if options["reset"]:
+            instrumentation.reset_histograms(names)
+            self.stdout.write(self.style.SUCCESS("Request timing histograms cleared."))
+            return
+        stats = instrumentation.histograms(names)
+        if options["json"]:
+            self.stdout.write(json.dumps(stats, indent=2))
+            return
+        if not stats:
+            self.stdout.write("No requests recorded; is RequestTimingMiddleware enabled?")
+            return
+        self.stdout.write(
+            f"{'url name':<24}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        )
+        for name, s in sorted(stats.items(), key=lambda kv: -kv[1]["count"]):
+            b = s["buckets"]
+            self.stdout.write(
+                f"{name:<24}{s['count']:>8}{s['mean_ms']:>10}"
+                f"{_percentile(b, 0.5):>10}{_percentile(b, 0.95):>10}{_percentile(b, 0.99):>10}"
+            )
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/management/commands/restore_meals.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Move archived months back into the MealEntry table (calories.archive).
+
+    python manage.py restore_meals 2023-04 2023-05
+===========================================================================
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+
+from calories import archive
+
+
+class Command(BaseCommand):
+    help = "Restore archived MealEntry months (YYYY-MM) into the live table."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("months", nargs="+", help="Months to restore, as YYYY-MM.")
+
+    def handle(self, *args, **options) -> None:
+        for month in options["months"]:
+            try:
+                archive.month_bounds(month)
+                restored, skipped = archive.restore_month(month)
+            except ValueError as exc:
+                raise CommandError(str(exc)) from exc
+            note = f" ({skipped} kept archived: their food was deleted)" if skipped else ""
+            self.stdout.write(f"{month}: {restored} meals restored{note}.")
+        self.stdout.write(self.style.SUCCESS("Done."))
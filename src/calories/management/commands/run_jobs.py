@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/management/commands/run_jobs.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Background worker for calories.jobs. Run one or more alongside the web
+processes; SIGTERM/SIGINT finish the current job and exit.
+
+    python manage.py run_jobs
+    python manage.py run_jobs --burst        # drain the queue, then exit
+===========================================================================
+"""
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import threading
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand  # type: ignore
+
+from calories import jobs
+
+
+class Command(BaseCommand):
+    help = "Process queued background jobs (e.g. summary recomputation after food edits)."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--burst", action="store_true", help="Exit once no job is ready.")
+        parser.add_argument("--batch", type=int, default=10, help="Jobs claimed per poll.")
+        parser.add_argument(
+            "--sleep", type=float, default=1.0, help="Seconds between polls when idle."
+        )
+        parser.add_argument("--max-jobs", type=int, help="Exit after this many jobs.")
+        parser.add_argument("--purge-days", type=int, default=7,
+                            help="Delete finished jobs older than this on start (0 keeps them).")
+
+    def handle(self, *args, **options) -> None:
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        stop = threading.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: stop.set())
+        if options["purge_days"]:
+            purged = jobs.purge(timedelta(days=options["purge_days"]))
+            if purged:
+                self.stdout.write(f"Purged {purged} finished jobs.")
+        done = jobs.work(
+            worker,
+            burst=options["burst"],
+            batch=options["batch"],
+            idle_sleep=options["sleep"],
+            max_jobs=options["max_jobs"],
+            stop=stop,
+        )
+        self.stdout.write(self.style.SUCCESS(f"{worker} ran {done} jobs."))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/management/commands/sync_replicas.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Copy the SQLite primary into the local replica files (DJANGO_READ_REPLICAS),
+standing in for database replication during development and testing.
+
+    python manage.py sync_replicas
+    python manage.py sync_replicas --every 2     # keep copying until stopped
+===========================================================================
+"""
+from __future__ import annotations
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+
+from calories import replicas
+
+
+class Command(BaseCommand):
+    help = "Copy the SQLite primary database into the configured read replica files."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "aliases", nargs="*", help="Replica aliases (default: CALORIES_READ_REPLICAS)."
+        )
+        parser.add_argument(
+            "--every", type=float, help="Copy again every this many seconds until stopped."
+        )
+
+    def handle(self, *args, **options) -> None:
+        aliases = options["aliases"] or replicas.replica_aliases()
+        if not aliases:
+            raise CommandError("No read replicas configured; set DJANGO_READ_REPLICAS.")
+        stop = threading.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: stop.set())
+        while True:
+            for alias in aliases:
+                try:
+                    replicas.copy_to_replica(alias)
+                except ValueError as exc:
+                    raise CommandError(str(exc)) from exc
+            self.stdout.write(self.style.SUCCESS(f"Copied the primary to {', '.join(aliases)}."))
+            if options["every"] is None or stop.wait(options["every"]):
+                break
@@ -0,0 +1,159 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FoodItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("name", models.CharField(max_length=128, unique=True)),
+                ("calories_per_100g", models.FloatField()),
+                ("protein_g", models.FloatField(default=0.0)),
+                ("carbs_g", models.FloatField(default=0.0)),
+                ("fat_g", models.FloatField(default=0.0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="UserProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "sex",
+                    models.CharField(
+                        choices=[("M", "Male"), ("F", "Female")], default="M", max_length=1
+                    ),
+                ),
+                ("age", models.PositiveIntegerField()),
+                ("height_cm", models.FloatField(help_text="Height in centimeters")),
+                ("weight_kg", models.FloatField(help_text="Weight in kilograms")),
+                (
+                    "activity_level",
+                    models.CharField(
+                        choices=[
+                            ("sedentary", "Sedentary (x1.2)"),
+                            ("light", "Light (x1.375)"),
+                            ("moderate", "Moderate (x1.55)"),
+                            ("active", "Active (x1.725)"),
+                            ("very_active", "Very Active (x1.9)"),
+                        ],
+                        default="sedentary",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "goal",
+                    models.CharField(
+                        choices=[
+                            ("lose", "Lose weight"),
+                            ("maintain", "Maintain weight"),
+                            ("gain", "Gain weight"),
+                        ],
+                        default="maintain",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="DailyNutritionSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("kcal", models.FloatField(default=0.0)),
+                ("protein_g", models.FloatField(default=0.0)),
+                ("carbs_g", models.FloatField(default=0.0)),
+                ("fat_g", models.FloatField(default=0.0)),
+                ("entries", models.PositiveIntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("user", "date"), name="daily_summary_user_date")
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="MealEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("quantity_g", models.FloatField(help_text="Consumed grams")),
+                (
+                    "client_key",
+                    models.CharField(
+                        blank=True,
+                        editable=False,
+                        help_text="Client-supplied idempotency key (bulk sync)",
+                        max_length=64,
+                        null=True,
+                    ),
+                ),
+                (
+                    "food",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT, to="calories.fooditem"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date", "-id"],
+                "indexes": [models.Index(fields=["date", "id"], name="meal_date_id_idx")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("client_key__isnull", False)),
+                        fields=("user", "client_key"),
+                        name="meal_client_key_per_user",
+                    )
+                ],
+            },
+        ),
+    ]
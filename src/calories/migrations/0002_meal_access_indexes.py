@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:26
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("calories", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="fooditem",
+            index=models.Index(
+                django.db.models.functions.text.Upper("name"), name="food_name_upper_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mealentry",
+            index=models.Index(fields=["user", "date", "id"], name="meal_user_date_id_idx"),
+        ),
+        # Drop the single-column user index only once the composite one covers it.
+        migrations.AlterField(
+            model_name="mealentry",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_food_usage(apps, schema_editor):
+    MealEntry = apps.get_model("calories", "MealEntry")
+    FoodUsage = apps.get_model("calories", "FoodUsage")
+    rows = (
+        MealEntry.objects.order_by()
+        .values("user_id", "food_id")
+        .annotate(uses=models.Count("id"), last_used=models.Max("date"))
+        .iterator(chunk_size=5000)
+    )
+    batch = []
+    for row in rows:
+        batch.append(FoodUsage(**row))
+        if len(batch) >= 5000:
+            FoodUsage.objects.bulk_create(batch)
+            batch = []
+    FoodUsage.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("calories", "0003_job_queue_and_logged_nutrients"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FoodUsage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("uses", models.PositiveIntegerField(default=0)),
+                ("last_used", models.DateField()),
+                (
+                    "food",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="calories.fooditem"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["user", "-last_used"], name="food_usage_recent_idx"),
+                    models.Index(fields=["user", "-uses"], name="food_usage_frequent_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(fields=("user", "food"), name="food_usage_user_food")
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_food_usage, migrations.RunPython.noop),
+    ]
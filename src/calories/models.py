@@ -10,12 +10,20 @@ Updated: 2025-11-01
 License: MIT License (see LICENSE file for details)
 ===========================================================================
 
-Domain models: UserProfile, FoodItem, MealEntry.
+Domain models: UserProfile, FoodItem, MealEntry, DailyNutritionSummary, Job.
 ===========================================================================
 """
 from __future__ import annotations
+from datetime import date
+from typing import Any
+
 from django.conf import settings  # type: ignore
 from django.db import models  # type: ignore
+from django.db.models import Count, F, FloatField, Sum, Value  # type: ignore
+from django.db.models.functions import Coalesce, Upper  # type: ignore
+from django.utils import timezone  # type: ignore
+
+NUTRIENT_FIELDS = ("kcal", "protein_g", "carbs_g", "fat_g")
 
 
 class UserProfile(models.Model):
@@ -47,6 +55,16 @@ class UserProfile(models.Model):
         return f"Profile({self.user.username})"
 
 
+class FoodItemQuerySet(models.QuerySet):
+    def name_prefix(self, term: str) -> FoodItemQuerySet:
+        """Case-insensitive "starts with", written as a range on UPPER(name)
+        so it can use food_name_upper_idx (LIKE/ILIKE cannot)."""
+        term = term.upper()
+        return self.alias(name_upper=Upper("name")).filter(
+            name_upper__gte=term, name_upper__lt=term + "\U0010ffff"
+        )
+
+
 class FoodItem(models.Model):
     name = models.CharField(max_length=128, unique=True)
     calories_per_100g = models.FloatField()
@@ -54,22 +72,217 @@ class FoodItem(models.Model):
     carbs_g = models.FloatField(default=0.0)
     fat_g = models.FloatField(default=0.0)
 
+    objects = FoodItemQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(Upper("name"), name="food_name_upper_idx")]
+
     def __str__(self) -> str:  # pragma: no cover
         return self.name
 
 
+# MealEntry nutrient name -> FoodItem per-100g column it is derived from.
+NUTRIENT_COLUMNS = {
+    "kcal": "calories_per_100g",
+    "protein_g": "protein_g",
+    "carbs_g": "carbs_g",
+    "fat_g": "fat_g",
+}
+# MealEntry nutrient name -> per-100g value copied onto the entry when it was
+# logged (CALORIES_SNAPSHOT_NUTRIENTS); NULL means "follow the food".
+LOGGED_COLUMNS = {
+    "kcal": "logged_kcal_100g",
+    "protein_g": "logged_protein_100g",
+    "carbs_g": "logged_carbs_100g",
+    "fat_g": "logged_fat_100g",
+}
+
+
+def _per_portion(name: str) -> Any:
+    per_100g = Coalesce(F(LOGGED_COLUMNS[name]), F(f"food__{NUTRIENT_COLUMNS[name]}"))
+    return per_100g * F("quantity_g") / 100.0
+
+
+def _nutrient_sums() -> dict[str, Any]:
+    return {name: Sum(_per_portion(name), output_field=FloatField()) for name in NUTRIENT_FIELDS}
+
+
+class MealEntryQuerySet(models.QuerySet):
+    """SQL-side nutrient math so totals never need model instances."""
+
+    def with_nutrients(self) -> MealEntryQuerySet:
+        """Annotate each entry with kcal/protein_g/carbs_g/fat_g for its portion."""
+        return self.annotate(
+            **{name: models.ExpressionWrapper(_per_portion(name), output_field=FloatField())
+               for name in NUTRIENT_FIELDS}
+        )
+
+    def totals(self) -> dict[str, float]:
+        """Sum nutrients over the queryset in a single aggregate query."""
+        sums = {name: Coalesce(expr, Value(0.0)) for name, expr in _nutrient_sums().items()}
+        row = self.order_by().aggregate(entries=Count("id"), **sums)
+        return {k: (round(v, 2) if k != "entries" else v) for k, v in row.items()}
+
+    def grouped_totals(self, *fields: str) -> MealEntryQuerySet:
+        """``values(*fields)`` rows carrying entry count and nutrient sums per group."""
+        return self.order_by().values(*fields).annotate(entries=Count("id"), **_nutrient_sums())
+
+    def daily_totals(self, user: Any, date_range: tuple[date, date]) -> list[dict[str, Any]]:
+        """Per-day nutrient totals for ``user`` in ``[start, end]``, one GROUP BY query."""
+        start, end = date_range
+        rows = self.filter(user=user, date__range=(start, end)).grouped_totals("date")
+        rows = rows.order_by("date")
+        return [{**r, **{k: round(r[k] or 0.0, 2) for k in NUTRIENT_FIELDS}} for r in rows]
+
+
 class MealEntry(models.Model):
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Indexed through meal_user_date_id_idx, whose leading column is user.
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False)
     date = models.DateField()
     food = models.ForeignKey(FoodItem, on_delete=models.PROTECT)
     quantity_g = models.FloatField(help_text="Consumed grams")
+    client_key = models.CharField(
+        max_length=64, null=True, blank=True, editable=False,
+        help_text="Client-supplied idempotency key (bulk sync)",
+    )
+    logged_kcal_100g = models.FloatField(null=True, blank=True, editable=False)
+    logged_protein_100g = models.FloatField(null=True, blank=True, editable=False)
+    logged_carbs_100g = models.FloatField(null=True, blank=True, editable=False)
+    logged_fat_100g = models.FloatField(null=True, blank=True, editable=False)
+
+    objects = MealEntryQuerySet.as_manager()
 
     class Meta:
         ordering = ["-date", "-id"]
+        indexes = [
+            # Dashboard (user, date) and meal list (user, -date, -id) pages.
+            models.Index(fields=["user", "date", "id"], name="meal_user_date_id_idx"),
+            # Unfiltered admin changelist order and its date drill-down seeks.
+            models.Index(fields=["date", "id"], name="meal_date_id_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "client_key"],
+                condition=models.Q(client_key__isnull=False),
+                name="meal_client_key_per_user",
+            ),
+        ]
+
+    def log_nutrients(self, food: FoodItem | None = None) -> None:
+        """Copy the food's current per-100g values onto the entry."""
+        food = food or self.food
+        for name, column in LOGGED_COLUMNS.items():
+            setattr(self, column, getattr(food, NUTRIENT_COLUMNS[name]))
+
+    def logged_per_100g(self) -> dict[str, float] | None:
+        if self.logged_kcal_100g is None:
+            return None
+        return {name: getattr(self, column) for name, column in LOGGED_COLUMNS.items()}
+
+    @classmethod
+    def from_db(cls, db: str, field_names: Any, values: Any) -> MealEntry:
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_food_id = instance.__dict__.get("food_id")
+        return instance
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        # Logged entries are re-logged only when pointed at another food;
+        # quantity edits keep the values they were logged with.
+        if self.logged_kcal_100g is None:
+            if getattr(settings, "CALORIES_SNAPSHOT_NUTRIENTS", False):
+                self.log_nutrients()
+        elif self.food_id != getattr(self, "_loaded_food_id", self.food_id):
+            self.log_nutrients()
+        super().save(*args, **kwargs)
+        self._loaded_food_id = self.food_id
 
     @property
     def calories(self) -> float:
+        if self.logged_kcal_100g is not None:
+            return round(self.logged_kcal_100g * (self.quantity_g / 100.0), 2)
+        if not MealEntry.food.is_cached(self):
+            # Avoid a lazy FoodItem fetch per row; see calories.catalog.
+            from . import catalog
+
+            values = catalog.nutrients(self.food_id, self.quantity_g)
+            if values is not None:
+                return round(values["kcal"], 2)
         return round(self.food.calories_per_100g * (self.quantity_g / 100.0), 2)
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.user} · {self.food} · {self.quantity_g}g"
+
+
+class DailyNutritionSummaryQuerySet(models.QuerySet):
+    def for_range(self, user: Any, start: date, end: date) -> DailyNutritionSummaryQuerySet:
+        return self.filter(user=user, date__range=(start, end)).order_by("date")
+
+
+class DailyNutritionSummary(models.Model):
+    """Per-user, per-day rollup of MealEntry nutrients, kept in step by calories.rollups."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    date = models.DateField()
+    kcal = models.FloatField(default=0.0)
+    protein_g = models.FloatField(default=0.0)
+    carbs_g = models.FloatField(default=0.0)
+    fat_g = models.FloatField(default=0.0)
+    entries = models.PositiveIntegerField(default=0)
+
+    objects = DailyNutritionSummaryQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["-date"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "date"], name="daily_summary_user_date"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.user} · {self.date} · {self.kcal:.0f} kcal"
+
+
+class Job(models.Model):
+    """A unit of background work in the database-backed queue (calories.jobs)."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    kind = models.CharField(max_length=64)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [models.Index(fields=["status", "run_after", "id"], name="job_ready_idx")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
+class FoodUsage(models.Model):
+    """How often and how lately a user logged a food, kept in step by calories.favorites."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    food = models.ForeignKey(FoodItem, on_delete=models.CASCADE)
+    uses = models.PositiveIntegerField(default=0)
+    last_used = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "food"], name="food_usage_user_food"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "-last_used"], name="food_usage_recent_idx"),
+            models.Index(fields=["user", "-uses"], name="food_usage_frequent_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.user} · {self.food} · {self.uses}"
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/pagination.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Keyset (cursor) pagination.
+
+Pages are selected with a WHERE on the ordering key instead of OFFSET, so
+page N costs the same as page 1. Cursors are opaque URL-safe strings that
+encode the ordering values of a boundary row.
+
+EstimatedCountPaginator is the offset paginator for the admin: it reports
+the database's row estimate instead of COUNT(*) for large unfiltered tables.
+===========================================================================
+"""
+from __future__ import annotations
+
+import base64
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from asgiref.sync import sync_to_async  # type: ignore
+from django.core.exceptions import ValidationError  # type: ignore
+from django.core.paginator import Paginator  # type: ignore
+from django.db import connections  # type: ignore
+from django.db.models import Q, QuerySet  # type: ignore
+from django.utils.functional import cached_property  # type: ignore
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Below this many (estimated) rows an exact COUNT(*) is cheap enough.
+ESTIMATE_THRESHOLD = 100_000
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass
+class KeysetPage:
+    items: list[Any]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    size: int = DEFAULT_PAGE_SIZE
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+
+def _split(ordering: Sequence[str]) -> list[tuple[str, bool]]:
+    return [(o.lstrip("-"), o.startswith("-")) for o in ordering]
+
+
+def encode_cursor(obj: Any, ordering: Sequence[str]) -> str:
+    values = [getattr(obj, name) for name, _ in _split(ordering)]
+    raw = json.dumps([v.isoformat() if hasattr(v, "isoformat") else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, qs: QuerySet, ordering: Sequence[str]) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        fields = [qs.model._meta.get_field(name) for name, _ in _split(ordering)]
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise InvalidCursorError(cursor)
+        return [f.to_python(v) for f, v in zip(fields, values)]
+    except (ValueError, TypeError, ValidationError) as exc:
+        raise InvalidCursorError(cursor) from exc
+
+
+def _beyond(ordering: Sequence[str], values: list[Any], forward: bool) -> Q:
+    """Rows strictly after (forward) or before the boundary in ``ordering``."""
+    cond = Q()
+    prefix: dict[str, Any] = {}
+    for (name, desc), value in zip(_split(ordering), values):
+        op = "lt" if desc == forward else "gt"
+        cond |= Q(**prefix, **{f"{name}__{op}": value})
+        prefix[name] = value
+    return cond
+
+
+def _window(
+    qs: QuerySet, ordering: Sequence[str], after: str | None, before: str | None, size: int
+) -> QuerySet:
+    """The sliced queryset for one page plus a look-ahead row (reversed when paging back)."""
+    if before:
+        reverse = [o[1:] if o.startswith("-") else f"-{o}" for o in ordering]
+        boundary = decode_cursor(before, qs, ordering)
+        return qs.filter(_beyond(ordering, boundary, forward=False)).order_by(*reverse)[: size + 1]
+    if after:
+        qs = qs.filter(_beyond(ordering, decode_cursor(after, qs, ordering), forward=True))
+    return qs.order_by(*ordering)[: size + 1]
+
+
+def _page(
+    rows: list[Any], ordering: Sequence[str], after: str | None, before: str | None, size: int,
+) -> KeysetPage:
+    more = len(rows) > size
+    if before:
+        items = rows[:size][::-1]
+        return KeysetPage(
+            items,
+            next_cursor=encode_cursor(items[-1], ordering) if items else None,
+            prev_cursor=encode_cursor(items[0], ordering) if more else None,
+            size=size,
+        )
+    items = rows[:size]
+    return KeysetPage(
+        items,
+        next_cursor=encode_cursor(items[-1], ordering) if more else None,
+        prev_cursor=encode_cursor(items[0], ordering) if after and items else None,
+        size=size,
+    )
+
+
+def paginate(
+    qs: QuerySet,
+    ordering: Sequence[str],
+    after: str | None = None,
+    before: str | None = None,
+    size: int = DEFAULT_PAGE_SIZE,
+    merge: Callable[[list[Any], int], list[Any]] | None = None,
+) -> KeysetPage:
+    """Return one page of ``qs`` ordered by ``ordering`` (which must be unique).
+
+    ``merge(rows, size)`` may fold rows from another source into the fetched
+    window (``size + 1`` rows in window order) and return it in the same shape."""
+    size = max(1, min(size, MAX_PAGE_SIZE))
+    rows = list(_window(qs, ordering, after, before, size))
+    if merge is not None:
+        rows = merge(rows, size)
+    return _page(rows, ordering, after, before, size)
+
+
+async def apaginate(
+    qs: QuerySet,
+    ordering: Sequence[str],
+    after: str | None = None,
+    before: str | None = None,
+    size: int = DEFAULT_PAGE_SIZE,
+    merge: Callable[[list[Any], int], list[Any]] | None = None,
+) -> KeysetPage:
+    """Async twin of paginate(), fetching rows with async iteration."""
+    size = max(1, min(size, MAX_PAGE_SIZE))
+    rows = [row async for row in _window(qs, ordering, after, before, size)]
+    if merge is not None:
+        rows = await sync_to_async(merge)(rows, size)
+    return _page(rows, ordering, after, before, size)
+
+
+def estimated_row_count(model: Any, using: str = "default") -> int | None:
+    """Planner statistics for ``model``'s table, or None when unavailable.
+
+    PostgreSQL: pg_class.reltuples (kept by autovacuum). SQLite: the row
+    count ANALYZE stores in sqlite_stat1, else MAX(id) - MIN(id) + 1 read
+    from the primary key (overcounts deleted rows)."""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table]
+            )
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] >= 0 else None
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            )
+            if cursor.fetchone():
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+                row = cursor.fetchone()
+                if row:
+                    return int(row[0].split()[0])
+            pk = connection.ops.quote_name(model._meta.pk.column)
+            quoted = connection.ops.quote_name(table)
+            cursor.execute(f"SELECT MAX({pk}) - MIN({pk}) + 1 FROM {quoted}")
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] is not None else 0
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Offset paginator that never counts more than ``threshold`` rows.
+
+    Unfiltered querysets report the table estimate once it passes the
+    threshold. Filtered ones are counted exactly up to the threshold and
+    reported as the threshold beyond it: later rows are reached by narrowing
+    the filter rather than paging."""
+
+    threshold = ESTIMATE_THRESHOLD
+
+    @cached_property
+    def count(self) -> int:
+        qs = self.object_list
+        if not isinstance(qs, QuerySet):
+            return super().count
+        if not qs.query.where:
+            estimate = estimated_row_count(qs.model, qs.db)
+            if estimate is not None and estimate >= self.threshold:
+                return estimate
+        return qs.order_by()[: self.threshold].count()
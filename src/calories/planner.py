@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/planner.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Meal plans: a handful of foods and gram amounts that add up to a calorie
+target and macro split.
+
+Works on the nutrient columns of the catalog snapshot (calories.catalog),
+so the whole catalog is scanned with numpy and never loaded row by row:
+
+1. Prune foods that cannot help (no energy, portions too small or too big)
+   and keep a small pool: the foods closest to the wanted split, the
+   densest in each macro, and a random sample for variety.
+2. Greedily add the food and amount that most reduce the weighted error,
+   then refit the amounts with bounded coordinate descent.
+3. Swap foods in and out of the plan while that helps, with randomized
+   restarts, until a plan is within tolerance or the time budget is spent.
+===========================================================================
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import numpy as np
+
+from . import catalog
+from .models import NUTRIENT_FIELDS
+
+# Shares of energy from protein, carbs and fat.
+DEFAULT_SPLIT = (0.25, 0.45, 0.30)
+KCAL_PER_GRAM = np.array([4.0, 4.0, 9.0])
+DEFAULT_ITEMS = 5
+MAX_ITEMS = 10
+DEFAULT_TOLERANCE = 0.10
+TIME_BUDGET_MS = 150.0
+MIN_GRAMS, MAX_GRAMS, STEP_GRAMS = 30.0, 400.0, 5.0
+# Error weights for kcal, protein, carbs, fat: missing the calories matters most.
+WEIGHTS = np.array([3.0, 1.0, 1.0, 1.0])
+POOL_CLOSEST, POOL_PER_MACRO, POOL_RANDOM = 24, 12, 16
+
+
+@dataclass
+class MealPlan:
+    target: dict[str, float]
+    split: dict[str, float]
+    tolerance: float
+    items: list[dict[str, Any]] = field(default_factory=list)
+    totals: dict[str, float] = field(default_factory=dict)
+    deviation_pct: dict[str, float | None] = field(default_factory=dict)
+    within_tolerance: bool = False
+    attempts: int = 0
+    elapsed_ms: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def macro_targets(kcal: float, split: Iterable[float] = DEFAULT_SPLIT) -> np.ndarray:
+    """kcal, protein g, carbs g and fat g for ``kcal`` at the given energy split."""
+    return np.concatenate([[kcal], kcal * np.asarray(tuple(split)) / KCAL_PER_GRAM])
+
+
+def _smallest(values: np.ndarray, k: int) -> np.ndarray:
+    if len(values) <= k:
+        return np.arange(len(values))
+    return np.argpartition(values, k)[:k]
+
+
+def candidate_pool(
+    columns: np.ndarray,
+    target: np.ndarray,
+    split: np.ndarray,
+    rng: np.random.Generator,
+    exclude: Iterable[int] = (),
+) -> np.ndarray:
+    """Ids of the few foods worth searching over, from the full (4, n) columns."""
+    kcal = columns[0]
+    with np.errstate(invalid="ignore"):  # NaN marks ids with no food
+        usable = (kcal > 0) & (columns[1:] >= 0).all(axis=0)
+        # Worth at least 2% of the target at the largest portion, and no
+        # more than the whole target at the smallest.
+        usable &= kcal * MAX_GRAMS / 100 >= 0.02 * target[0]
+        usable &= kcal * MIN_GRAMS / 100 <= target[0]
+    usable[[i for i in exclude if 0 <= i < len(usable)]] = False
+    ids = np.flatnonzero(usable)
+    if not len(ids):
+        return ids
+    energy = columns[1:, ids] * KCAL_PER_GRAM[:, None]
+    share = energy / np.maximum(energy.sum(axis=0), 1e-9)
+    picks = [_smallest(np.abs(share - split[:, None]).sum(axis=0), POOL_CLOSEST)]
+    picks += [_smallest(-share[m], POOL_PER_MACRO) for m in range(3)]
+    picks.append(rng.choice(len(ids), size=min(POOL_RANDOM, len(ids)), replace=False))
+    return ids[np.unique(np.concatenate(picks))]
+
+
+class _Search:
+    """Bounded least squares over a pool: ``A @ grams ~= b``, where column j
+    of A is food j's weighted contribution per gram relative to the target.
+    Nutrients with a zero target have no relative error and are left out."""
+
+    def __init__(self, columns: np.ndarray, target: np.ndarray) -> None:
+        scale = np.sqrt(WEIGHTS) * (target > 0)
+        relative = np.divide(scale, target, out=np.zeros_like(scale), where=target > 0)
+        self.A = columns / 100.0 * relative[:, None]
+        self.b = scale
+        self.norms = np.maximum((self.A ** 2).sum(axis=0), 1e-12)
+
+    def _best_amounts(self, residual: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Best clipped amount of every pool food for ``residual``, and the error left."""
+        grams = np.clip(self.A.T @ residual / self.norms, MIN_GRAMS, MAX_GRAMS)
+        return grams, ((residual[:, None] - self.A * grams) ** 2).sum(axis=0)
+
+    def error(self, chosen: list[int], grams: np.ndarray) -> float:
+        r = self.b - self.A[:, chosen] @ grams
+        return float(r @ r)
+
+    def refit(self, chosen: list[int], grams: np.ndarray, passes: int = 8) -> np.ndarray:
+        a = self.A[:, chosen]
+        r = self.b - a @ grams
+        for _ in range(passes):
+            for j in range(len(chosen)):
+                r += a[:, j] * grams[j]
+                grams[j] = np.clip(a[:, j] @ r / self.norms[chosen[j]], MIN_GRAMS, MAX_GRAMS)
+                r -= a[:, j] * grams[j]
+        return grams
+
+    def greedy(self, items: int, rng: np.random.Generator | None) -> tuple[list[int], np.ndarray]:
+        """Add foods one at a time; with ``rng``, pick among the three best each step."""
+        chosen: list[int] = []
+        amounts: list[float] = []
+        r = self.b.copy()
+        for _ in range(min(items, self.A.shape[1])):
+            grams, err = self._best_amounts(r)
+            err[chosen] = np.inf
+            best = np.argsort(err)[:3] if rng is not None else [int(np.argmin(err))]
+            pick = int(rng.choice(best)) if rng is not None else best[0]
+            chosen.append(pick)
+            amounts.append(float(grams[pick]))
+            r -= self.A[:, pick] * grams[pick]
+        return chosen, self.refit(chosen, np.array(amounts))
+
+    def improve(
+        self, chosen: list[int], grams: np.ndarray, deadline: float,
+    ) -> tuple[list[int], np.ndarray]:
+        """Best-improvement swaps of one food for another until none helps."""
+        err = self.error(chosen, grams)
+        while time.perf_counter() < deadline:
+            r = self.b - self.A[:, chosen] @ grams
+            best = None
+            for j, food in enumerate(chosen):
+                rj = r + self.A[:, food] * grams[j]
+                amounts, errs = self._best_amounts(rj)
+                errs[chosen] = np.inf
+                c = int(np.argmin(errs))
+                if errs[c] < err - 1e-12 and (best is None or errs[c] < best[0]):
+                    best = (errs[c], j, c, amounts[c])
+            if best is None:
+                break
+            _, j, c, amount = best
+            chosen = chosen[:j] + [c] + chosen[j + 1:]
+            grams = grams.copy()
+            grams[j] = amount
+            grams = self.refit(chosen, grams)
+            err = self.error(chosen, grams)
+        return chosen, grams
+
+
+def _food_names(food_ids: list[int]) -> dict[int, str]:
+    from .models import FoodItem
+
+    return dict(FoodItem.objects.filter(pk__in=food_ids).values_list("id", "name"))
+
+
+def _deviation(totals: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """``totals / target - 1``, and 0 for nutrients with a zero target."""
+    return np.divide(totals, target, out=np.ones_like(totals), where=target > 0) - 1
+
+
+def _rounded(grams: np.ndarray) -> np.ndarray:
+    return np.clip(np.round(grams / STEP_GRAMS) * STEP_GRAMS, MIN_GRAMS, MAX_GRAMS)
+
+
+def plan_meals(
+    kcal: float,
+    split: Iterable[float] = DEFAULT_SPLIT,
+    items: int = DEFAULT_ITEMS,
+    tolerance: float = DEFAULT_TOLERANCE,
+    seed: int = 0,
+    exclude: Iterable[int] = (),
+    time_budget_ms: float = TIME_BUDGET_MS,
+    columns: np.ndarray | None = None,
+) -> MealPlan:
+    """Pick ``items`` foods and gram amounts for ``kcal`` at ``split`` (protein,
+    carbs, fat shares of energy). Returns the best plan found within the time
+    budget; ``within_tolerance`` says whether every nutrient is within
+    ``tolerance`` of its target. ``columns`` defaults to the catalog snapshot."""
+    split = np.asarray(tuple(split), dtype=np.float64)
+    if not 0 < kcal < np.inf:
+        raise ValueError("kcal must be positive")
+    if split.shape != (3,) or not (split >= 0).all() or not abs(split.sum() - 1.0) <= 0.01:
+        raise ValueError("split must be three non-negative shares summing to 1")
+    if not 1 <= items <= MAX_ITEMS:
+        raise ValueError(f"items must be between 1 and {MAX_ITEMS}")
+    if not 0 < tolerance < 1:
+        raise ValueError("tolerance must be between 0 and 1")
+
+    started = time.perf_counter()
+    deadline = started + time_budget_ms / 1000.0
+    if columns is None:
+        columns = catalog.get_snapshot().columns
+    target = macro_targets(kcal, split)
+    rng = np.random.default_rng(seed)
+    plan = MealPlan(
+        target=dict(zip(NUTRIENT_FIELDS, np.round(target, 1).tolist())),
+        split=dict(zip(("protein", "carbs", "fat"), split.tolist())),
+        tolerance=tolerance,
+    )
+    pool = candidate_pool(columns, target, split, rng, exclude)
+    if not len(pool):
+        plan.elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        return plan
+
+    nutrients = np.asarray(columns[:, pool], dtype=np.float64)
+    search = _Search(nutrients, target)
+    best: tuple[float, list[int], np.ndarray] | None = None
+    while True:
+        plan.attempts += 1
+        chosen, grams = search.greedy(items, rng if plan.attempts > 1 else None)
+        chosen, grams = search.improve(chosen, grams, deadline)
+        grams = _rounded(grams)
+        err = search.error(chosen, grams)
+        if best is None or err < best[0]:
+            best = (err, chosen, grams)
+        totals = nutrients[:, chosen] @ grams / 100.0
+        if (np.abs(_deviation(totals, target)) <= tolerance).all():
+            # Within tolerance beats a lower weighted error that is not.
+            best = (err, chosen, grams)
+            break
+        if time.perf_counter() >= deadline:
+            break
+
+    _, chosen, grams = best
+    totals = nutrients[:, chosen] @ grams / 100.0
+    deviation = _deviation(totals, target)
+    food_ids = pool[chosen].tolist()
+    names = _food_names(food_ids)
+    for j, food_id in enumerate(food_ids):
+        values = nutrients[:, chosen[j]] * grams[j] / 100.0
+        plan.items.append({
+            "food_id": food_id,
+            "name": names.get(food_id, ""),
+            "grams": float(grams[j]),
+            **dict(zip(NUTRIENT_FIELDS, np.round(values, 1).tolist())),
+        })
+    plan.items.sort(key=lambda item: -item["kcal"])
+    plan.totals = dict(zip(NUTRIENT_FIELDS, np.round(totals, 1).tolist()))
+    plan.deviation_pct = {
+        name: round(float(d) * 100, 1) if t > 0 else None
+        for name, d, t in zip(NUTRIENT_FIELDS, deviation, target)
+    }
+    plan.within_tolerance = bool((np.abs(deviation) <= tolerance).all())
+    plan.elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    return plan
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/projection.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+What-if scenarios and week-by-week body weight projections.
+
+A scenario is one activity level, goal and starting weight (the profile's
+weight plus a delta) for a fixed sex, age and height. All scenarios are
+simulated together as numpy columns with the batch formulas in
+calories.utils: each week BMR and TDEE are recomputed from the current
+weight, and the energy balance (intake minus TDEE) moves the weight by
+1 kg per KCAL_PER_KG kcal. Intake stays at the starting target, so the
+deficit shrinks as BMR falls; with ``adaptive`` it is recomputed weekly.
+
+Results depend only on the parameters, so they are cached by a key built
+from them and shared between users; nothing is written to the database.
+===========================================================================
+"""
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import math
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import numpy as np
+from django.conf import settings  # type: ignore
+from django.core.cache import cache  # type: ignore
+
+from .models import UserProfile
+from .utils import energy_targets_batch
+
+KEY_PREFIX = "calories:projection:v1:"
+# Energy stored or released per kg of body weight change (the 3500 kcal/lb rule).
+KCAL_PER_KG = 7700.0
+DEFAULT_WEEKS = 26
+MAX_WEEKS = 156
+MAX_SCENARIOS = 500
+MIN_WEIGHT_KG = 30.0
+ACTIVITY_LEVELS = tuple(UserProfile.Activity.values)
+GOALS = tuple(UserProfile.Goal.values)
+
+
+@dataclass
+class Projection:
+    baseline: dict[str, Any]
+    weeks: int
+    adaptive: bool
+    scenarios: list[dict[str, Any]] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def checkpoints(self, count: int = 6) -> list[int]:
+        """About ``count`` evenly spaced weeks ending with the last one."""
+        step = max(1, -(-self.weeks // count))
+        return [*range(step, self.weeks, step), self.weeks]
+
+
+def simulate(
+    sex: str,
+    age: int,
+    height_cm: float,
+    start_weight_kg: np.ndarray,
+    activity_level: np.ndarray,
+    goal: np.ndarray,
+    weeks: int,
+    adaptive: bool = False,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Weekly weights, shape (scenarios, weeks + 1), plus each scenario's
+    intake and TDEE per week, shape (scenarios, weeks + 1)."""
+    weight = np.asarray(start_weight_kg, dtype=np.float64)
+    weights = np.empty((len(weight), weeks + 1))
+    intakes = np.empty_like(weights)
+    tdees = np.empty_like(weights)
+    intake = None
+    for week in range(weeks + 1):
+        targets = energy_targets_batch(sex, age, height_cm, weight, activity_level, goal)
+        if intake is None or adaptive:
+            intake = targets.target_calories
+        weights[:, week], intakes[:, week], tdees[:, week] = weight, intake, targets.tdee
+        weight = np.maximum(weight + (intake - targets.tdee) * 7 / KCAL_PER_KG, MIN_WEIGHT_KG)
+    return weights, intakes, tdees
+
+
+def _unique(values: Iterable[Any]) -> list[Any]:
+    return list(dict.fromkeys(values))
+
+
+def project(
+    sex: str,
+    age: int,
+    height_cm: float,
+    weight_kg: float,
+    activity_levels: Iterable[str] = ACTIVITY_LEVELS,
+    goals: Iterable[str] = GOALS,
+    weight_deltas_kg: Iterable[float] = (0.0,),
+    weeks: int = DEFAULT_WEEKS,
+    adaptive: bool = False,
+) -> Projection:
+    """Project every combination of ``activity_levels`` x ``goals`` x
+    ``weight_deltas_kg``; raises ValueError on bad input."""
+    activity_levels, goals = _unique(activity_levels), _unique(goals)
+    deltas = _unique(float(d) for d in weight_deltas_kg)
+    if sex not in UserProfile.Sex.values:
+        raise ValueError(f"sex must be one of {', '.join(UserProfile.Sex.values)}")
+    if not all(math.isfinite(v) for v in (age, height_cm, weight_kg, *deltas)):
+        raise ValueError("age, height_cm, weight_kg and weight deltas must be finite numbers")
+    if not 0 < age <= 120 or height_cm <= 0 or weight_kg <= 0:
+        raise ValueError("age, height_cm and weight_kg must be positive")
+    if unknown := [a for a in activity_levels if a not in ACTIVITY_LEVELS]:
+        raise ValueError(f"Unknown activity level {unknown[0]!r}")
+    if unknown := [g for g in goals if g not in GOALS]:
+        raise ValueError(f"Unknown goal {unknown[0]!r}")
+    if not 1 <= weeks <= MAX_WEEKS:
+        raise ValueError(f"weeks must be between 1 and {MAX_WEEKS}")
+    if any(weight_kg + d < MIN_WEIGHT_KG for d in deltas):
+        raise ValueError(f"starting weights must be at least {MIN_WEIGHT_KG:g} kg")
+    grid = list(itertools.product(activity_levels, goals, deltas))
+    if not grid or len(grid) > MAX_SCENARIOS:
+        raise ValueError(f"between 1 and {MAX_SCENARIOS} scenarios are allowed")
+
+    activity, goal, delta = (np.array(column) for column in zip(*grid))
+    weights, intakes, tdees = simulate(
+        sex, age, height_cm, weight_kg + delta, activity, goal, weeks, adaptive
+    )
+    projection = Projection(
+        baseline={"sex": sex, "age": age, "height_cm": height_cm, "weight_kg": weight_kg},
+        weeks=weeks,
+        adaptive=adaptive,
+    )
+    for i, (level, aim, d) in enumerate(grid):
+        projection.scenarios.append({
+            "activity_level": level,
+            "goal": aim,
+            "weight_delta_kg": d,
+            "intake_kcal": round(float(intakes[i, 0]), 1),
+            "final_intake_kcal": round(float(intakes[i, -1]), 1),
+            "tdee_kcal": round(float(tdees[i, 0]), 1),
+            "final_tdee_kcal": round(float(tdees[i, -1]), 1),
+            "start_weight_kg": round(float(weights[i, 0]), 1),
+            "final_weight_kg": round(float(weights[i, -1]), 1),
+            "change_kg": round(float(weights[i, -1] - weights[i, 0]), 1),
+            "weights_kg": np.round(weights[i], 1).tolist(),
+        })
+    return projection
+
+
+def _key(params: dict[str, Any]) -> str:
+    body = json.dumps(params, sort_keys=True).encode()
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return f"{KEY_PREFIX}{digest}"
+
+
+def cached_projection(**params: Any) -> Projection:
+    """project(**params), cached under a key derived from the parameters."""
+    params = {k: list(v) if isinstance(v, (tuple, list)) else v for k, v in params.items()}
+    key = _key(params)
+    projection = cache.get(key)
+    if projection is None:
+        projection = project(**params)
+        timeout = getattr(settings, "CALORIES_PROJECTION_CACHE_TIMEOUT", 24 * 3600)
+        cache.set(key, projection, timeout)
+    return projection
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/replicas.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Read replicas: GET requests read from a replica, everything else from the
+primary (``default``).
+
+ReplicaMiddleware marks each request and ReplicaRouter sends the reads made
+while serving a GET or HEAD to one healthy replica. Writes always go to the
+primary. Reads stay on the primary:
+
+- outside requests (jobs, commands, shell) and inside transactions;
+- for the rest of a request once it has written;
+- for CALORIES_REPLICA_STICKY_SECONDS after this browser (a cookie) or this
+  user (a cache entry, so their other devices see the change too) wrote:
+  read-your-writes. Other users' writes, catalog edits included, do not
+  count, and a missing entry (expired, evicted, flushed) means no recent
+  write;
+- when every replica is unreachable or more than
+  CALORIES_REPLICA_MAX_LAG_SECONDS behind. Each process checks a replica at
+  most every CALORIES_REPLICA_CHECK_SECONDS.
+
+Keep the lag limit below the sticky window. Locally a second SQLite file
+stands in for a replica: ``manage.py sync_replicas`` copies the primary into
+it, and its lag is how much older the copy is than the primary's last write.
+===========================================================================
+"""
+from __future__ import annotations
+
+import logging
+import random
+import sqlite3
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async  # type: ignore
+from django.conf import settings  # type: ignore
+from django.core.cache import cache  # type: ignore
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections  # type: ignore
+
+logger = logging.getLogger("calories.replicas")
+
+COOKIE = "calories_primary_until"
+WROTE_KEY_PREFIX = "calories:replicas:wrote:v1:"
+SAFE_METHODS = ("GET", "HEAD")
+
+
+@dataclass
+class _Reads:
+    """Routing state of the current request."""
+    replica: bool
+    alias: str | None = None
+    wrote: bool = False
+
+
+_current: ContextVar[_Reads | None] = ContextVar("calories_replica_reads", default=None)
+
+
+def replica_aliases() -> list[str]:
+    return list(getattr(settings, "CALORIES_READ_REPLICAS", []))
+
+
+# -- health -------------------------------------------------------------------
+
+_health: dict[str, tuple[float, bool]] = {}
+
+
+def _sqlite_last_write(alias: str = DEFAULT_DB_ALIAS) -> float | None:
+    name = str(connections[alias].settings_dict["NAME"])
+    times = [p.stat().st_mtime for p in (Path(name), Path(f"{name}-wal")) if p.is_file()]
+    return max(times) if times else None
+
+
+def replica_lag(alias: str) -> float | None:
+    """Seconds ``alias`` is behind the primary, or None if it cannot be used.
+
+    PostgreSQL: time since the last replayed transaction (overstates lag
+    while the primary is idle). SQLite stand-in: the primary's last write
+    minus the copy time sync_replicas stored in ``PRAGMA user_version``."""
+    connection = connections[alias]
+    try:
+        if connection.vendor == "sqlite":
+            if not Path(str(connection.settings_dict["NAME"])).is_file():
+                return None  # connecting would create an empty database
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA user_version")
+                synced_at = cursor.fetchone()[0]
+            if not synced_at:
+                return None
+            last_write = _sqlite_last_write()
+            return max(0.0, last_write - synced_at) if last_write is not None else 0.0
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())")
+                lag = cursor.fetchone()[0]
+            return max(0.0, float(lag)) if lag is not None else 0.0
+        connection.ensure_connection()
+        return 0.0
+    except DatabaseError:
+        logger.warning("replica %s unreachable", alias, exc_info=True)
+        return None
+
+
+def healthy(alias: str) -> bool:
+    now = time.monotonic()
+    checked = _health.get(alias)
+    if checked is not None and now - checked[0] < settings.CALORIES_REPLICA_CHECK_SECONDS:
+        return checked[1]
+    lag = replica_lag(alias)
+    ok = lag is not None and lag <= settings.CALORIES_REPLICA_MAX_LAG_SECONDS
+    if lag is not None and not ok:
+        logger.warning("replica %s is %.1f s behind; reading from the primary", alias, lag)
+    _health[alias] = (now, ok)
+    return ok
+
+
+def reset_health() -> None:
+    _health.clear()
+
+
+def copy_to_replica(alias: str, source: str = DEFAULT_DB_ALIAS) -> None:
+    """Copy the primary SQLite database into the replica file ``alias``."""
+    primary, replica = connections[source], connections[alias]
+    if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+        raise ValueError(
+            "sync_replicas only copies SQLite files; use database replication otherwise"
+        )
+    started = int(time.time())
+    primary.ensure_connection()
+    target = sqlite3.connect(str(replica.settings_dict["NAME"]))
+    try:
+        primary.connection.backup(target)
+        # The copy holds every write up to ``started``.
+        target.execute(f"PRAGMA user_version = {started}")
+        target.commit()
+    finally:
+        target.close()
+    _health.pop(alias, None)
+
+
+# -- routing --------------------------------------------------------------------
+
+class ReplicaRouter:
+    """Reads in marked GET requests go to a healthy replica; the rest to ``default``."""
+
+    def db_for_read(self, model: Any, **hints: Any) -> str:
+        reads = _current.get()
+        if reads is None or not reads.replica or reads.wrote:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if reads.alias is None:
+            # One replica per request, so its reads agree with each other.
+            usable = [a for a in replica_aliases() if healthy(a)]
+            reads.alias = random.choice(usable) if usable else DEFAULT_DB_ALIAS
+        return reads.alias
+
+    def db_for_write(self, model: Any, **hints: Any) -> str:
+        reads = _current.get()
+        if reads is not None:
+            reads.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> bool:
+        return True  # replicas hold the same rows as the primary
+
+    def allow_migrate(
+        self, db: str, app_label: str, model_name: str | None = None, **hints: Any,
+    ) -> bool | None:
+        return False if db in replica_aliases() else None
+
+
+class ReplicaMiddleware:
+    """Put right after AuthenticationMiddleware; session and user lookups stay on the primary."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.sticky = settings.CALORIES_REPLICA_STICKY_SECONDS
+
+    def _reads(self, request: Any) -> _Reads:
+        if request.method not in SAFE_METHODS:
+            return _Reads(replica=False)
+        now = time.time()
+        try:
+            until = float(request.COOKIES.get(COOKIE, 0))
+        except ValueError:
+            until = 0.0
+        if until > now:
+            return _Reads(replica=False)
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            wrote = cache.get(f"{WROTE_KEY_PREFIX}{user.pk}")
+            if wrote is not None and now - wrote < self.sticky:
+                return _Reads(replica=False)
+        return _Reads(replica=True)
+
+    def _finish(self, request: Any, response: Any, reads: _Reads) -> Any:
+        if reads.wrote or request.method not in SAFE_METHODS:
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                cache.set(f"{WROTE_KEY_PREFIX}{user.pk}", time.time(), self.sticky)
+            response.set_cookie(
+                COOKIE, f"{time.time() + self.sticky:.0f}", max_age=self.sticky,
+                httponly=True, samesite="Lax", secure=request.is_secure(),
+            )
+        return response
+
+    def __call__(self, request: Any) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+        reads = self._reads(request)
+        token = _current.set(reads)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, reads)
+
+    async def __acall__(self, request: Any) -> Any:
+        reads = await sync_to_async(self._reads)(request)
+        token = _current.set(reads)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return await sync_to_async(self._finish)(request, response, reads)
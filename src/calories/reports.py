@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/reports.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Nutrition trend reports over a date range.
+
+Everything is aggregated in SQL over DailyNutritionSummary (one row per
+logged day), so a one-year report reads at most 366 small rows no matter
+how many meals were logged.
+===========================================================================
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+from django.db.models import Count, F, Sum  # type: ignore
+from django.db.models.functions import TruncMonth, TruncWeek  # type: ignore
+
+from .models import NUTRIENT_FIELDS, DailyNutritionSummary
+
+GRANULARITIES = ("day", "week", "month")
+MAX_RANGE_DAYS = 3 * 366
+DEFAULT_TOLERANCE = 0.10
+
+
+@dataclass
+class TrendReport:
+    start: date
+    end: date
+    granularity: str
+    target: float | None
+    tolerance: float
+    periods: list[dict[str, Any]] = field(default_factory=list)
+    summary: dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _pct(value: float, target: float | None) -> float | None:
+    return round(100.0 * value / target, 1) if target else None
+
+
+def _period_rows(user: Any, start: date, end: date, granularity: str) -> list[dict[str, Any]]:
+    qs = DailyNutritionSummary.objects.for_range(user, start, end).order_by()
+    if granularity == "day":
+        rows = qs.annotate(period=F("date")).values("period", "entries", *NUTRIENT_FIELDS)
+        return [{**r, "days_logged": 1} for r in rows.order_by("period")]
+    trunc = TruncWeek("date") if granularity == "week" else TruncMonth("date")
+    return list(
+        qs.annotate(period=trunc)
+        .values("period")
+        .annotate(
+            days_logged=Count("id"), entries=Sum("entries"), **{k: Sum(k) for k in NUTRIENT_FIELDS}
+        )
+        .order_by("period")
+    )
+
+
+def _streaks(
+    daily: dict[date, float], start: date, end: date, target: float, tolerance: float,
+) -> tuple[int, int, int]:
+    """(adherent days, current streak, longest streak); a day adheres when logged
+    within ``tolerance`` of target. The current streak ends at ``end``, or the day
+    before when ``end`` has no entries yet (a day still in progress)."""
+    adherent = {d for d, kcal in daily.items() if abs(kcal - target) <= tolerance * target}
+    longest = run = 0
+    day = start
+    while day <= end:
+        run = run + 1 if day in adherent else 0
+        longest = max(longest, run)
+        day += timedelta(days=1)
+    current = 0
+    day = end if end in daily else end - timedelta(days=1)
+    while day >= start and day in adherent:
+        current += 1
+        day -= timedelta(days=1)
+    return len(adherent), current, longest
+
+
+def trend_report(
+    user: Any,
+    start: date,
+    end: date,
+    granularity: str = "day",
+    target: float | None = None,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> TrendReport:
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {GRANULARITIES}")
+    if end < start:
+        raise ValueError("'to' must not be before 'from'")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"Range is limited to {MAX_RANGE_DAYS} days")
+    if not 0 <= tolerance < 1:
+        raise ValueError("tolerance must be at least 0 and below 1")
+
+    report = TrendReport(start, end, granularity, round(target, 2) if target else None, tolerance)
+    for row in _period_rows(user, start, end, granularity):
+        avg = row["kcal"] / row["days_logged"]
+        report.periods.append({
+            "period": row["period"],
+            "days_logged": row["days_logged"],
+            "entries": row["entries"],
+            **{k: round(row[k], 2) for k in NUTRIENT_FIELDS},
+            "avg_kcal": round(avg, 2),
+            "avg_vs_target_pct": _pct(avg, target),
+        })
+
+    daily = dict(
+        DailyNutritionSummary.objects.for_range(user, start, end).values_list("date", "kcal")
+    )
+    days_in_range = (end - start).days + 1
+    total_kcal = sum(daily.values())
+    logged = len(daily)
+    summary: dict[str, Any] = {
+        "days_in_range": days_in_range,
+        "days_logged": logged,
+        "total_kcal": round(total_kcal, 2),
+        "avg_kcal_logged_days": round(total_kcal / logged, 2) if logged else None,
+        "avg_kcal_all_days": round(total_kcal / days_in_range, 2),
+    }
+    if target:
+        adherent, current, longest = _streaks(daily, start, end, target, tolerance)
+        summary.update({
+            "avg_vs_target_pct": _pct(total_kcal / logged, target) if logged else None,
+            "adherent_days": adherent,
+            "adherence_rate": round(adherent / days_in_range, 3),
+            "current_streak": current,
+            "longest_streak": longest,
+        })
+    report.summary = summary
+    return report
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/rollups.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Incremental maintenance of DailyNutritionSummary.
+
+Writers call meal_added / meal_removed / meal_changed (or the batch forms
+meals_added / meals_removed) after touching a MealEntry; each applies a
+signed delta to the affected (user, date) rows, updates the user's food
+usage (calories.favorites) and marks the user's pages changed
+(calories.freshness).
+recompute() refreshes chosen days from MealEntry (the background job run
+after a food's nutrients change); rebuild() and find_drift() cover every day.
+All three count archived meals (calories.archive) as well.
+===========================================================================
+"""
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date
+from itertools import groupby
+from typing import Any
+
+from django.db import transaction  # type: ignore
+from django.db.models import F  # type: ignore
+
+from . import archive, catalog, favorites, freshness
+from .models import NUTRIENT_FIELDS, DailyNutritionSummary, FoodItem, MealEntry
+
+
+@dataclass(frozen=True)
+class MealSnapshot:
+    """The parts of a MealEntry that feed its day's rollup, captured before an edit."""
+    user_id: int
+    date: date
+    food_id: int
+    quantity_g: float
+    logged: tuple[float, ...] | None = None
+
+    @classmethod
+    def of(cls, meal: MealEntry) -> MealSnapshot:
+        logged = meal.logged_per_100g()
+        return cls(
+            meal.user_id, meal.date, meal.food_id, meal.quantity_g,
+            tuple(logged[k] for k in NUTRIENT_FIELDS) if logged else None,
+        )
+
+
+def nutrients_for(food: FoodItem, quantity_g: float) -> dict[str, float]:
+    factor = quantity_g / 100.0
+    return {
+        "kcal": food.calories_per_100g * factor,
+        "protein_g": food.protein_g * factor,
+        "carbs_g": food.carbs_g * factor,
+        "fat_g": food.fat_g * factor,
+    }
+
+
+def _apply(user_id: int, day: date, values: dict[str, float], sign: int) -> None:
+    with transaction.atomic():
+        DailyNutritionSummary.objects.get_or_create(user_id=user_id, date=day)
+        rows = DailyNutritionSummary.objects.filter(user_id=user_id, date=day)
+        rows.update(
+            entries=F("entries") + sign,
+            **{k: F(k) + sign * values[k] for k in NUTRIENT_FIELDS},
+        )
+        rows.filter(entries__lte=0).delete()
+    freshness.changed(freshness.user_scope(user_id))
+
+
+def meal_nutrients(meal: MealEntry | MealSnapshot) -> dict[str, float]:
+    """Nutrients from the values logged on the meal, else its loaded food, else
+    the catalog snapshot (no query), else the database for newer foods."""
+    logged = meal.logged_per_100g() if isinstance(meal, MealEntry) else (
+        dict(zip(NUTRIENT_FIELDS, meal.logged)) if meal.logged else None
+    )
+    if logged is not None:
+        return {k: v * meal.quantity_g / 100.0 for k, v in logged.items()}
+    if isinstance(meal, MealEntry) and MealEntry.food.is_cached(meal):
+        return nutrients_for(meal.food, meal.quantity_g)
+    values = catalog.nutrients(meal.food_id, meal.quantity_g)
+    if values is None:
+        values = nutrients_for(FoodItem.objects.get(pk=meal.food_id), meal.quantity_g)
+    return values
+
+
+def meal_added(meal: MealEntry) -> None:
+    _apply(meal.user_id, meal.date, meal_nutrients(meal), +1)
+    favorites.used([meal])
+
+
+def meals_added(meals: list[MealEntry]) -> None:
+    """Batch form of meal_added: a constant number of queries however many days are touched."""
+    days: dict[tuple[int, date], DailyNutritionSummary] = {}
+    for meal in meals:
+        key = (meal.user_id, meal.date)
+        summary = days.get(key)
+        if summary is None:
+            summary = days[key] = DailyNutritionSummary(user_id=key[0], date=key[1])
+        for k, v in meal_nutrients(meal).items():
+            setattr(summary, k, getattr(summary, k) + v)
+        summary.entries += 1
+    if not days:
+        return
+    users = {u for u, _ in days}
+    with transaction.atomic():
+        existing = DailyNutritionSummary.objects.select_for_update().filter(
+            user_id__in=users, date__in={d for _, d in days}
+        )
+        changed = []
+        for row in existing:
+            delta = days.pop((row.user_id, row.date), None)
+            if delta is not None:
+                for k in (*NUTRIENT_FIELDS, "entries"):
+                    setattr(row, k, getattr(row, k) + getattr(delta, k))
+                changed.append(row)
+        DailyNutritionSummary.objects.bulk_update(changed, [*NUTRIENT_FIELDS, "entries"])
+        DailyNutritionSummary.objects.bulk_create(days.values())
+        favorites.used(meals)
+    freshness.changed(*(freshness.user_scope(u) for u in users))
+
+
+def meal_removed(meal: MealEntry | MealSnapshot, food: FoodItem | None = None) -> None:
+    logged = meal.logged if isinstance(meal, MealSnapshot) else None
+    values = nutrients_for(food, meal.quantity_g) if food and not logged else meal_nutrients(meal)
+    _apply(meal.user_id, meal.date, values, -1)
+    favorites.unused([meal])
+
+
+def meals_removed(meals: list[MealEntry]) -> None:
+    """Batch form of meal_removed: one delta per (user, date), a constant
+    number of queries however many meals or days are touched."""
+    days: dict[tuple[int, date], dict[str, float]] = {}
+    for meal in meals:
+        delta = days.setdefault(
+            (meal.user_id, meal.date), dict.fromkeys((*NUTRIENT_FIELDS, "entries"), 0)
+        )
+        for k, v in meal_nutrients(meal).items():
+            delta[k] += v
+        delta["entries"] += 1
+    if not days:
+        return
+    users = {u for u, _ in days}
+    with transaction.atomic():
+        existing = DailyNutritionSummary.objects.select_for_update().filter(
+            user_id__in=users, date__in={d for _, d in days}
+        )
+        changed, emptied = [], []
+        for row in existing:
+            delta = days.get((row.user_id, row.date))
+            if delta is None:
+                continue
+            for k, v in delta.items():
+                setattr(row, k, getattr(row, k) - v)
+            if row.entries > 0:
+                changed.append(row)
+            else:
+                emptied.append(row.pk)
+        DailyNutritionSummary.objects.bulk_update(changed, [*NUTRIENT_FIELDS, "entries"])
+        DailyNutritionSummary.objects.filter(pk__in=emptied).delete()
+        favorites.unused(meals)
+    freshness.changed(*(freshness.user_scope(u) for u in users))
+
+
+def meal_changed(before: MealSnapshot, meal: MealEntry) -> None:
+    """Move an edited entry's contribution, handling date, food and quantity changes."""
+    if before == MealSnapshot.of(meal):
+        return
+    old_food = meal.food if before.food_id == meal.food_id else None
+    meal_removed(before, food=old_food)
+    meal_added(meal)
+
+
+def recompute(days: Iterable[tuple[int, date]]) -> int:
+    """Recompute the summary rows for ``(user_id, date)`` pairs from MealEntry,
+    e.g. after a food's nutrient values changed. Returns the rows written."""
+    days = set(days)
+    if not days:
+        return 0
+    users, dates = {u for u, _ in days}, {d for _, d in days}
+    with transaction.atomic():
+        # Lock the rows first so a concurrent meal_added waits for us.
+        existing = {
+            (r.user_id, r.date): r
+            for r in DailyNutritionSummary.objects.select_for_update().filter(
+                user_id__in=users, date__in=dates
+            )
+        }
+        fresh = {
+            (r["user_id"], r["date"]): r
+            for r in MealEntry.objects.filter(user_id__in=users, date__in=dates)
+            .grouped_totals("user_id", "date")
+        }
+        for r in archive.daily_totals(days):
+            key = (r["user_id"], r["date"])
+            fresh[key] = _combined([fresh[key], r]) if key in fresh else r
+        changed, created, gone = [], [], []
+        for key in days:
+            row, values = existing.get(key), fresh.get(key)
+            if values is None:
+                if row is not None:
+                    gone.append(row.pk)
+            elif row is None:
+                created.append(DailyNutritionSummary(**values))
+            else:
+                for k in (*NUTRIENT_FIELDS, "entries"):
+                    setattr(row, k, values[k])
+                changed.append(row)
+        DailyNutritionSummary.objects.bulk_update(changed, [*NUTRIENT_FIELDS, "entries"])
+        DailyNutritionSummary.objects.bulk_create(created)
+        DailyNutritionSummary.objects.filter(pk__in=gone).delete()
+    freshness.changed(*(freshness.user_scope(u) for u in users))
+    return len(changed) + len(created)
+
+
+def _day_key(row: dict[str, Any]) -> tuple[date, int]:
+    return row["date"], row["user_id"]
+
+
+def _combined(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "user_id": rows[0]["user_id"],
+        "date": rows[0]["date"],
+        **{k: sum(r[k] for r in rows) for k in ("entries", *NUTRIENT_FIELDS)},
+    }
+
+
+def _aggregated() -> Iterator[dict[str, Any]]:
+    """Per-(user, date) totals over live and archived meals, by (date, user)."""
+    live = (
+        MealEntry.objects.grouped_totals("user_id", "date")
+        .order_by("date", "user_id")
+        .iterator(chunk_size=5000)
+    )
+    for _, rows in groupby(heapq.merge(live, archive.daily_totals(), key=_day_key), key=_day_key):
+        rows = list(rows)
+        yield rows[0] if len(rows) == 1 else _combined(rows)
+
+
+def rebuild(batch_size: int = 5000) -> int:
+    """Recreate every summary row from MealEntry; returns the number of rows written."""
+    written = 0
+    with transaction.atomic():
+        DailyNutritionSummary.objects.all().delete()
+        batch: list[DailyNutritionSummary] = []
+        for row in _aggregated():
+            batch.append(DailyNutritionSummary(**row))
+            if len(batch) >= batch_size:
+                DailyNutritionSummary.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        DailyNutritionSummary.objects.bulk_create(batch)
+        written += len(batch)
+    return written
+
+
+def find_drift(tolerance: float = 0.01) -> list[dict[str, Any]]:
+    """Compare stored summaries with a fresh aggregation and list mismatching days."""
+    rows = DailyNutritionSummary.objects.values("user_id", "date", "entries", *NUTRIENT_FIELDS)
+    stored = {(s["user_id"], s["date"]): s for s in rows}
+    drift = []
+    for row in _aggregated():
+        key = (row["user_id"], row["date"])
+        have = stored.pop(key, None)
+        if have is None or have["entries"] != row["entries"] or any(
+            abs((have[k] or 0.0) - (row[k] or 0.0)) > tolerance for k in NUTRIENT_FIELDS
+        ):
+            drift.append({"user_id": key[0], "date": key[1], "expected": row, "stored": have})
+    for key, have in stored.items():
+        drift.append({"user_id": key[0], "date": key[1], "expected": None, "stored": have})
+    return drift
+
+
+def _day_row(user: Any, day: date) -> Any:
+    rows = DailyNutritionSummary.objects.filter(user=user, date=day)
+    return rows.values("entries", *NUTRIENT_FIELDS)
+
+
+def day_totals(user: Any, day: date) -> dict[str, float]:
+    """Rounded totals for one day read from the rollup (a single indexed row)."""
+    return _rounded(_day_row(user, day).first())
+
+
+async def aday_totals(user: Any, day: date) -> dict[str, float]:
+    return _rounded(await _day_row(user, day).afirst())
+
+
+def _rounded(row: dict[str, Any] | None) -> dict[str, float]:
+    if row is None:
+        return {"entries": 0, **{k: 0.0 for k in NUTRIENT_FIELDS}}
+    return {"entries": row["entries"], **{k: round(row[k], 2) for k in NUTRIENT_FIELDS}}
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/search.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+In-memory ranked food search: word prefixes plus trigram similarity.
+
+Each worker process holds one FoodSearchIndex built lazily from FoodItem.
+FoodItem signals report committed writes through food_saved()/food_deleted(),
+which log each change in Django's cache under a version counter; other
+processes replay the log instead of rebuilding their copy.
+===========================================================================
+"""
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+import unicodedata
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+from django.core.cache import cache  # type: ignore
+
+VERSION_KEY = "calories:food-search:version"
+CHANGE_KEY = "calories:food-search:change:{}"
+CHANGE_TIMEOUT = 24 * 60 * 60
+MAX_REPLAY = 1000
+MAX_LIMIT = 50
+_PREFIX_CANDIDATES = 200
+_WORDS_PER_TOKEN = 20
+_MIN_SIMILARITY = 0.3
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def trigrams(text: str) -> set[str]:
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space."""
+    grams: set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    id: int
+    name: str
+    score: float
+
+
+class _Column:
+    """Growable numpy column (amortised O(1) append)."""
+
+    def __init__(self, dtype: type) -> None:
+        self.data = np.zeros(1024, dtype=dtype)
+        self.size = 0
+
+    def append(self, value: object) -> None:
+        if self.size == len(self.data):
+            self.data = np.resize(self.data, len(self.data) * 2)
+        self.data[self.size] = value
+        self.size += 1
+
+    @property
+    def view(self) -> np.ndarray:
+        return self.data[: self.size]
+
+
+class FoodSearchIndex:
+    """Two-level index: query words are matched against the word vocabulary by
+    prefix and trigram similarity, then expanded to foods via word postings.
+
+    Foods are stored in append-only slots; removing or renaming a food leaves a
+    dead slot behind until the next full build.
+    """
+
+    def __init__(self, items: Iterable[tuple[int, str]] = ()) -> None:
+        self._lock = threading.RLock()
+        self.build(items)
+
+    def build(self, items: Iterable[tuple[int, str]]) -> None:
+        with self._lock:
+            self._ids: list[int] = []
+            self._names: list[str] = []
+            self._norm: list[str] = []
+            self._slot_of: dict[int, int] = {}
+            self._alive = _Column(bool)
+            self._length = _Column(np.float32)
+            # vocabulary
+            self._word_id: dict[str, int] = {}
+            self._words: list[str] = []
+            self._sorted_words: list[str] = []
+            # postings are lists while building, numpy arrays afterwards (so a
+            # large catalog does not leave millions of GC-tracked lists around)
+            self._word_slots: list = []
+            # trigram index over alphabetic words only; ids here index _fuzzy_words
+            self._fuzzy_words: list[int] = []
+            self._word_grams = _Column(np.float32)
+            self._gram_words: dict[str, list[int] | np.ndarray] = {}
+            for food_id, name in items:
+                self._add_slot(food_id, name, incremental=False)
+            self._sorted_words = sorted(self._words)
+            self._word_slots = [np.asarray(p, dtype=np.int64) for p in self._word_slots]
+            self._gram_words = {
+                g: np.asarray(p, dtype=np.int64) for g, p in self._gram_words.items()
+            }
+
+    @staticmethod
+    def _push(
+        postings: list[int] | np.ndarray, value: int, incremental: bool,
+    ) -> list[int] | np.ndarray:
+        if incremental:
+            return np.append(np.asarray(postings, dtype=np.int64), np.int64(value))
+        postings.append(value)
+        return postings
+
+    def _word(self, word: str, incremental: bool) -> int:
+        wid = self._word_id.get(word)
+        if wid is None:
+            wid = self._word_id[word] = len(self._words)
+            self._words.append(word)
+            self._word_slots.append([])
+            if not word.isdigit():
+                fid = len(self._fuzzy_words)
+                self._fuzzy_words.append(wid)
+                grams = trigrams(word)
+                self._word_grams.append(len(grams))
+                for g in grams:
+                    self._gram_words[g] = self._push(self._gram_words.get(g, []), fid, incremental)
+            if incremental:
+                bisect.insort(self._sorted_words, word)
+        return wid
+
+    def _add_slot(self, food_id: int, name: str, incremental: bool) -> None:
+        slot = len(self._ids)
+        norm = normalize(name)
+        self._ids.append(food_id)
+        self._names.append(name)
+        self._norm.append(norm)
+        self._alive.append(True)
+        self._length.append(min(len(norm), 100))
+        self._slot_of[food_id] = slot
+        for word in set(norm.split()):
+            wid = self._word(word, incremental)
+            self._word_slots[wid] = self._push(self._word_slots[wid], slot, incremental)
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def add(self, food_id: int, name: str) -> None:
+        with self._lock:
+            self.remove(food_id)
+            self._add_slot(food_id, name, incremental=True)
+
+    def remove(self, food_id: int) -> None:
+        with self._lock:
+            slot = self._slot_of.pop(food_id, None)
+            if slot is not None:
+                self._alive.data[slot] = False
+
+    def _similar_words(self, token: str) -> list[tuple[int, float]]:
+        """Vocabulary words matching ``token``: exact 1.0, prefix 0.9, else trigram Jaccard."""
+        matches: dict[int, float] = {}
+        lo = bisect.bisect_left(self._sorted_words, token)
+        for word in self._sorted_words[lo:lo + _PREFIX_CANDIDATES]:
+            if not word.startswith(token):
+                break
+            matches[self._word_id[word]] = 1.0 if word == token else 0.9
+        grams = trigrams(token)
+        if len(token) >= 3 and grams:
+            postings = [self._gram_words[g] for g in grams if g in self._gram_words]
+            if postings:
+                fuzzy, shared = np.unique(np.concatenate(postings), return_counts=True)
+                jaccard = shared / (self._word_grams.view[fuzzy] + len(grams) - shared)
+                keep = jaccard >= _MIN_SIMILARITY
+                fuzzy, jaccard = fuzzy[keep], jaccard[keep]
+                if len(fuzzy) > _WORDS_PER_TOKEN:
+                    top = np.argpartition(jaccard, -_WORDS_PER_TOKEN)[-_WORDS_PER_TOKEN:]
+                    fuzzy, jaccard = fuzzy[top], jaccard[top]
+                for fid, sim in zip(fuzzy.tolist(), jaccard.tolist()):
+                    wid = self._fuzzy_words[fid]
+                    matches[wid] = max(matches.get(wid, 0.0), 0.8 * sim)
+        return list(matches.items())
+
+    def search(self, query: str, limit: int = 10) -> list[SearchHit]:
+        """Rank foods by how well their words cover the query's words."""
+        q = normalize(query)
+        limit = max(1, min(limit, MAX_LIMIT))
+        tokens = q.split()
+        if not tokens:
+            return []
+        with self._lock:
+            n = len(self._ids)
+            total = np.zeros(n, dtype=np.float32)
+            for token in tokens:
+                best = np.zeros(n, dtype=np.float32)
+                for wid, sim in self._similar_words(token):
+                    slots = self._word_slots[wid]
+                    best[slots] = np.maximum(best[slots], sim)
+                total += best
+            total /= len(tokens)
+            total -= 0.001 * self._length.view
+            candidates = np.flatnonzero(
+                (total > _MIN_SIMILARITY * 0.8 / len(tokens)) & self._alive.view
+            )
+            if len(candidates) > limit * 4:
+                candidates = candidates[np.argpartition(total[candidates], -limit * 4)[-limit * 4:]]
+            hits = []
+            for slot in candidates.tolist():
+                score = float(total[slot])
+                norm = self._norm[slot]
+                if norm == q:
+                    score += 1.0
+                elif norm.startswith(q):
+                    score += 0.5
+                hits.append(SearchHit(self._ids[slot], self._names[slot], round(score, 4)))
+        hits.sort(key=lambda h: (-h.score, h.name))
+        return hits[:limit]
+
+
+_index: FoodSearchIndex | None = None
+_index_version: int | None = None
+_index_lock = threading.Lock()
+_rebuild_thread: threading.Thread | None = None
+
+
+def _current_version() -> int:
+    return cache.get_or_set(VERSION_KEY, 0, timeout=None)
+
+
+def _next_version() -> int:
+    _current_version()
+    try:
+        return cache.incr(VERSION_KEY)
+    except ValueError:
+        return _current_version()
+
+
+def _build() -> FoodSearchIndex:
+    from .models import FoodItem
+
+    return FoodSearchIndex(FoodItem.objects.values_list("id", "name").iterator())
+
+
+def _apply(index: FoodSearchIndex, changes: list[tuple[int, str | None]]) -> None:
+    for food_id, name in changes:
+        if name is None:
+            index.remove(food_id)
+        else:
+            index.add(food_id, name)
+
+
+def _catch_up(version: int) -> bool:
+    """Replay the changes logged after _index_version; False if any is missing."""
+    global _index_version
+    keys = [CHANGE_KEY.format(v) for v in range(_index_version + 1, version + 1)]
+    if len(keys) > MAX_REPLAY:
+        return False
+    logged = cache.get_many(keys)
+    if len(logged) < len(keys):
+        return False
+    for key in keys:
+        _apply(_index, logged[key])
+    _index_version = version
+    return True
+
+
+def _rebuild(version: int) -> None:
+    global _index, _index_version
+    from django.db import connection  # type: ignore
+
+    try:
+        fresh = _build()
+        with _index_lock:
+            _index, _index_version = fresh, version
+    finally:
+        connection.close()
+
+
+def get_index() -> FoodSearchIndex:
+    """The process-wide index, kept current from the change log.
+
+    The first call builds it from the database. Later calls replay the changes
+    other processes logged; when the log has a gap (bulk writes, an evicted
+    entry, a cache flush) a thread rebuilds the index while this one keeps
+    serving.
+    """
+    global _index, _index_version, _rebuild_thread
+    version = _current_version()
+    if _index is not None and _index_version == version:
+        return _index
+    with _index_lock:
+        if _index is None:
+            _index, _index_version = _build(), version
+        elif _rebuild_thread is not None and _rebuild_thread.is_alive():
+            pass
+        elif _index_version > version or not _catch_up(version):
+            _rebuild_thread = threading.Thread(
+                target=_rebuild, args=(version,), name="food-search-rebuild", daemon=True,
+            )
+            _rebuild_thread.start()
+        return _index
+
+
+def _publish(changes: list[tuple[int, str | None]]) -> None:
+    """Log a committed change for the other processes and apply it here."""
+    global _index_version
+    version = _next_version()
+    cache.set(CHANGE_KEY.format(version), changes, CHANGE_TIMEOUT)
+    with _index_lock:
+        if _index is not None:
+            _apply(_index, changes)
+            if _index_version == version - 1:
+                _index_version = version
+
+
+def food_saved(food_id: int, name: str) -> None:
+    _publish([(food_id, name)])
+
+
+def food_deleted(food_id: int) -> None:
+    _publish([(food_id, None)])
+
+
+def catalog_changed() -> None:
+    """After bulk writes: rebuild here on next use; other processes rebuild in a thread."""
+    global _index
+    with _index_lock:
+        _index = None
+    _next_version()
+
+
+def search_foods(query: str, limit: int = 10) -> list[SearchHit]:
+    return get_index().search(query, limit)
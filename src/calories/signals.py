@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/signals.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Model signal handlers, connected in CaloriesConfig.ready().
+===========================================================================
+"""
+from __future__ import annotations
+
+from django.db import transaction  # type: ignore
+from django.db.models.signals import post_delete, post_save, pre_save  # type: ignore
+from django.dispatch import receiver  # type: ignore
+
+from . import catalog, energy, freshness, jobs, search
+from .models import NUTRIENT_COLUMNS, FoodItem, UserProfile
+
+
+@receiver(post_save, sender=UserProfile, dispatch_uid="calories.energy.profile_saved")
+@receiver(post_delete, sender=UserProfile, dispatch_uid="calories.energy.profile_deleted")
+def invalidate_energy_profile(sender, instance: UserProfile, **kwargs) -> None:
+    energy.invalidate(instance.user_id)
+    freshness.changed(freshness.user_scope(instance.user_id))
+
+
+@receiver(post_save, sender=FoodItem, dispatch_uid="calories.catalog.food_saved")
+@receiver(post_delete, sender=FoodItem, dispatch_uid="calories.catalog.food_deleted")
+def retire_catalog_snapshot(sender, instance: FoodItem, **kwargs) -> None:
+    # Again on commit, so no worker can rebuild from the pre-commit table
+    # under the new version.
+    catalog.catalog_changed()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(catalog.catalog_changed)
+    freshness.changed(freshness.CATALOG)
+
+
+@receiver(post_save, sender=FoodItem, dispatch_uid="calories.search.food_saved")
+def index_saved_food(sender, instance: FoodItem, **kwargs) -> None:
+    # On commit, so other processes never replay a write that rolled back.
+    food_id, name = instance.pk, instance.name
+    transaction.on_commit(lambda: search.food_saved(food_id, name))
+
+
+@receiver(post_delete, sender=FoodItem, dispatch_uid="calories.search.food_deleted")
+def unindex_deleted_food(sender, instance: FoodItem, **kwargs) -> None:
+    food_id = instance.pk
+    transaction.on_commit(lambda: search.food_deleted(food_id))
+
+
+@receiver(pre_save, sender=FoodItem, dispatch_uid="calories.jobs.food_nutrients_before")
+def remember_food_nutrients(sender, instance: FoodItem, **kwargs) -> None:
+    columns = list(NUTRIENT_COLUMNS.values())
+    instance._nutrients_before = (
+        FoodItem.objects.filter(pk=instance.pk).values_list(*columns).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=FoodItem, dispatch_uid="calories.jobs.food_nutrients_changed")
+def queue_rollup_recompute(sender, instance: FoodItem, created: bool, **kwargs) -> None:
+    before = getattr(instance, "_nutrients_before", None)
+    after = tuple(getattr(instance, c) for c in NUTRIENT_COLUMNS.values())
+    if not created and before is not None and tuple(before) != after:
+        # Same transaction as the edit: queued only if the edit commits.
+        jobs.enqueue("recompute_food_rollups", {"food_ids": [instance.pk]})
@@ -0,0 +1,64 @@
+/*
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/static/calories/js/food_picker.js
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Food picker for the meal form: the <select> starts with the user's recent
+and frequent foods; typing in the search box above it asks
+/foods/search/ and shows the matches first, selecting the best one.
+===========================================================================
+*/
+(function () {
+  "use strict";
+
+  const DELAY_MS = 200;
+  const LIMIT = 20;
+
+  function attach(box) {
+    const select = document.getElementById(box.dataset.foodPicker);
+    if (!select || !select.dataset.searchUrl) return;
+    const results = document.createElement("optgroup");
+    results.label = "Search results";
+    let timer = null;
+    let pending = null;
+
+    async function search(query) {
+      if (pending) pending.abort();
+      if (!query) {
+        results.replaceChildren();
+        results.remove();
+        return;
+      }
+      pending = new AbortController();
+      const url = `${select.dataset.searchUrl}?q=${encodeURIComponent(query)}&limit=${LIMIT}`;
+      try {
+        const response = await fetch(url, { signal: pending.signal, headers: { Accept: "application/json" } });
+        if (!response.ok) return;
+        const data = await response.json();
+        results.replaceChildren(...data.results.map((hit) => new Option(hit.name, hit.id)));
+      } catch (err) {
+        if (err.name !== "AbortError") throw err;
+        return;
+      }
+      // Right after the empty "---------" choice.
+      select.options[0].after(results);
+      if (results.children.length) select.value = results.children[0].value;
+    }
+
+    box.addEventListener("input", () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => search(box.value.trim()), DELAY_MS);
+    });
+    // Enter picks the best match instead of submitting the form.
+    box.addEventListener("keydown", (event) => {
+      if (event.key === "Enter") event.preventDefault();
+    });
+  }
+
+  document.querySelectorAll("input[data-food-picker]").forEach(attach);
+})();
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/sync.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Bulk meal logging for offline clients.
+
+A batch is validated with MealEntryForm's field rules, all referenced foods
+are fetched in one query, and new rows go in with a single bulk_create.
+Entries carrying a ``key`` already stored for the user are reported as
+duplicates instead of being inserted again, so retries are safe.
+===========================================================================
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings  # type: ignore
+from django.core.exceptions import ValidationError  # type: ignore
+from django.db import transaction  # type: ignore
+
+from . import rollups
+from .forms import MealEntryForm
+from .models import FoodItem, MealEntry
+
+MAX_BATCH = 1000
+KEY_MAX_LENGTH = MealEntry._meta.get_field("client_key").max_length
+
+
+@dataclass
+class SyncResult:
+    results: list[dict[str, Any]] = field(default_factory=list)
+    created: int = 0
+    duplicates: int = 0
+
+    @property
+    def errors(self) -> list[dict[str, Any]]:
+        return [r for r in self.results if r["status"] == "invalid"]
+
+
+def _clean_entry(
+    raw: Any, foods: dict[int, FoodItem],
+) -> tuple[dict[str, Any], dict[str, list[str]]]:
+    if not isinstance(raw, dict):
+        return {}, {"__all__": ["Each entry must be an object."]}
+    cleaned: dict[str, Any] = {}
+    errors: dict[str, list[str]] = {}
+    for name in ("date", "quantity_g"):
+        try:
+            cleaned[name] = MealEntryForm.base_fields[name].clean(raw.get(name))
+        except ValidationError as exc:
+            errors[name] = exc.messages
+    food = foods.get(_as_int(raw.get("food")))
+    if food is None:
+        errors["food"] = [MealEntryForm.base_fields["food"].error_messages["invalid_choice"]]
+    cleaned["food"] = food
+    key = raw.get("key")
+    if key is not None and (not isinstance(key, str) or not 0 < len(key) <= KEY_MAX_LENGTH):
+        errors["key"] = [f"Must be a non-empty string of at most {KEY_MAX_LENGTH} characters."]
+    cleaned["key"] = key
+    return cleaned, errors
+
+
+def _as_int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def log_meals(user: Any, entries: list[Any]) -> SyncResult:
+    """Validate and insert a batch; nothing is written if any entry is invalid."""
+    food_ids = {_as_int(e.get("food")) for e in entries if isinstance(e, dict)} - {None}
+    foods = FoodItem.objects.in_bulk(food_ids)
+    keys = {e.get("key") for e in entries if isinstance(e, dict) and isinstance(e.get("key"), str)}
+    known = dict(
+        MealEntry.objects.filter(user=user, client_key__in=keys).values_list("client_key", "id")
+    ) if keys else {}
+
+    result = SyncResult()
+    pending: list[tuple[int, MealEntry]] = []
+    for index, raw in enumerate(entries):
+        cleaned, errors = _clean_entry(raw, foods)
+        if errors:
+            result.results.append({"index": index, "status": "invalid", "errors": errors})
+            continue
+        key = cleaned["key"]
+        if key is not None and key in known:
+            result.results.append(
+                {"index": index, "status": "duplicate", "id": known[key], "key": key}
+            )
+            result.duplicates += 1
+            continue
+        meal = MealEntry(user=user, date=cleaned["date"], food=cleaned["food"],
+                         quantity_g=cleaned["quantity_g"], client_key=key)
+        if getattr(settings, "CALORIES_SNAPSHOT_NUTRIENTS", False):
+            meal.log_nutrients(cleaned["food"])  # bulk_create skips MealEntry.save()
+        if key is not None:
+            known[key] = None  # a repeat later in this batch is a duplicate too
+        result.results.append({"index": index, "status": "created", "key": key})
+        pending.append((len(result.results) - 1, meal))
+
+    if result.errors:
+        return result
+    with transaction.atomic():
+        created = MealEntry.objects.bulk_create([m for _, m in pending])
+        rollups.meals_added(created)
+    for (slot, _), meal in zip(pending, created):
+        result.results[slot]["id"] = meal.pk
+        if meal.client_key is not None:
+            known[meal.client_key] = meal.pk
+    for r in result.results:
+        if r["status"] == "duplicate" and r["id"] is None:
+            r["id"] = known[r["key"]]
+    result.created = len(created)
+    return result
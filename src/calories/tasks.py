@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: src/calories/tasks.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+Background job handlers (see calories.jobs), registered on import from
+CaloriesConfig.ready().
+===========================================================================
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from django.db.models import Q  # type: ignore
+
+from . import rollups
+from .jobs import task
+from .models import MealEntry
+
+RECOMPUTE_CHUNK = 500
+
+
+@task("recompute_food_rollups")
+def recompute_food_rollups(payload: dict[str, Any]) -> dict[str, Any] | None:
+    """Refresh the daily summaries of every (user, date) that has an entry for
+    one of ``payload["food_ids"]``, RECOMPUTE_CHUNK pairs per job. Entries
+    with logged nutrients are skipped: their values did not change."""
+    food_ids = payload["food_ids"]
+    pairs = (
+        MealEntry.objects.filter(food_id__in=food_ids, logged_kcal_100g__isnull=True)
+        .order_by("user_id", "date")
+        .values_list("user_id", "date")
+        .distinct()
+    )
+    after = payload.get("after")
+    if after:
+        user_id, day = after[0], date.fromisoformat(after[1])
+        pairs = pairs.filter(Q(user_id__gt=user_id) | Q(user_id=user_id, date__gt=day))
+    chunk = list(pairs[: RECOMPUTE_CHUNK + 1])
+    rollups.recompute(chunk[:RECOMPUTE_CHUNK])
+    if len(chunk) <= RECOMPUTE_CHUNK:
+        return None
+    last_user, last_day = chunk[RECOMPUTE_CHUNK - 1]
+    return {"food_ids": food_ids, "after": [last_user, last_day.isoformat()]}
@@ -10,26 +10,39 @@ Updated: 2025-11-01
 License: MIT License (see LICENSE file for details)
 ===========================================================================
 """
+from django.conf import settings  # type: ignore
 from django.urls import path  # type: ignore
 from django.contrib.auth.views import LogoutView  # type: ignore
-from . import views
+from . import async_views, views
+
+# Hot paths get coroutine views under ASGI deployments (CALORIES_ASYNC_VIEWS=True).
+hot = async_views if getattr(settings, "CALORIES_ASYNC_VIEWS", False) else views
 
 urlpatterns = [
     path("register/", views.register_view, name="register"),
     path("login/", views.login_view, name="login"),
     path("logout/", LogoutView.as_view(), name="logout"),
 
-    path("", views.dashboard_view, name="dashboard"),
+    path("", hot.dashboard_view, name="dashboard"),
     path("calculator/", views.calculator_view, name="calculator"),
     path("profile/", views.profile_view, name="profile"),
+    path("reports/", views.report_view, name="report"),
+    path("reports/trend/", views.report_api_view, name="report_api"),
+    path("plan/", views.plan_view, name="plan"),
+    path("plan/generate/", views.plan_api_view, name="plan_api"),
+    path("projection/", views.projection_view, name="projection"),
+    path("projection/simulate/", views.projection_api_view, name="projection_api"),
 
     path("foods/", views.food_list_view, name="food_list"),
     path("foods/new/", views.food_create_view, name="food_create"),
+    path("foods/search/", hot.food_search_view, name="food_search"),
     path("foods/<int:pk>/edit/", views.food_update_view, name="food_update"),
     path("foods/<int:pk>/delete/", views.food_delete_view, name="food_delete"),
 
-    path("meals/", views.meal_list_view, name="meal_list"),
-    path("meals/new/", views.meal_create_view, name="meal_create"),
+    path("meals/", hot.meal_list_view, name="meal_list"),
+    path("meals/new/", hot.meal_create_view, name="meal_create"),
+    path("meals/export/", views.meal_export_view, name="meal_export"),
+    path("meals/bulk/", hot.meal_bulk_view, name="meal_bulk"),
     path("meals/<int:pk>/edit/", views.meal_update_view, name="meal_update"),
     path("meals/<int:pk>/delete/", views.meal_delete_view, name="meal_delete"),
 ]
\ No newline at end of file
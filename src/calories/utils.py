@@ -12,6 +12,9 @@ License: MIT License (see LICENSE file for details)
 """
 from __future__ import annotations
 from dataclasses import dataclass
+from collections.abc import Sequence
+
+import numpy as np
 
 
 @dataclass
@@ -21,6 +24,20 @@ class BmrResult:
     target_calories: float
 
 
+@dataclass
+class BmrBatch:
+    """Columnar BMR/TDEE/target results, one row per input profile."""
+    bmr: np.ndarray
+    tdee: np.ndarray
+    target_calories: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.bmr)
+
+    def __getitem__(self, i: int) -> BmrResult:
+        return BmrResult(float(self.bmr[i]), float(self.tdee[i]), float(self.target_calories[i]))
+
+
 _ACTIVITY_FACTORS = {
     "sedentary": 1.2,
     "light": 1.375,
@@ -29,6 +46,11 @@ _ACTIVITY_FACTORS = {
     "very_active": 1.9,
 }
 
+_GOAL_OFFSETS = {
+    "lose": -500.0,
+    "gain": 300.0,
+}
+
 
 def mifflin_st_jeor(sex: str, age: int, height_cm: float, weight_kg: float) -> float:
     """Compute BMR using Mifflin-St Jeor.
@@ -51,3 +73,52 @@ def target_calories_from_goal(tdee: float, goal: str) -> float:
     if goal == "gain":
         return tdee + 300
     return tdee
+
+
+# Batch (columnar) variants. Each mirrors its scalar counterpart operation by
+# operation in float64, so results are bit-identical to a per-row loop.
+def mifflin_st_jeor_batch(
+    sex: Sequence[str] | np.ndarray,
+    age: Sequence[int] | np.ndarray,
+    height_cm: Sequence[float] | np.ndarray,
+    weight_kg: Sequence[float] | np.ndarray,
+) -> np.ndarray:
+    """Vectorized Mifflin-St Jeor over equally sized columns."""
+    base = (
+        10 * np.asarray(weight_kg, dtype=np.float64)
+        + 6.25 * np.asarray(height_cm, dtype=np.float64)
+        - 5 * np.asarray(age, dtype=np.float64)
+    )
+    return np.where(np.asarray(sex) == "M", base + 5, base - 161)
+
+
+def tdee_from_bmr_batch(bmr: np.ndarray, activity_level: Sequence[str] | np.ndarray) -> np.ndarray:
+    levels = np.asarray(activity_level)
+    factors = np.full(levels.shape, 1.2, dtype=np.float64)
+    for level, factor in _ACTIVITY_FACTORS.items():
+        factors[levels == level] = factor
+    return np.asarray(bmr, dtype=np.float64) * factors
+
+
+def target_calories_from_goal_batch(
+    tdee: np.ndarray, goal: Sequence[str] | np.ndarray,
+) -> np.ndarray:
+    goals = np.asarray(goal)
+    offsets = np.zeros(goals.shape, dtype=np.float64)
+    for name, offset in _GOAL_OFFSETS.items():
+        offsets[goals == name] = offset
+    return np.asarray(tdee, dtype=np.float64) + offsets
+
+
+def energy_targets_batch(
+    sex: Sequence[str] | np.ndarray,
+    age: Sequence[int] | np.ndarray,
+    height_cm: Sequence[float] | np.ndarray,
+    weight_kg: Sequence[float] | np.ndarray,
+    activity_level: Sequence[str] | np.ndarray,
+    goal: Sequence[str] | np.ndarray,
+) -> BmrBatch:
+    """Compute BMR, TDEE and target calories for many profiles in one pass."""
+    bmr = mifflin_st_jeor_batch(sex, age, height_cm, weight_kg)
+    tdee = tdee_from_bmr_batch(bmr, activity_level)
+    return BmrBatch(bmr=bmr, tdee=tdee, target_calories=target_calories_from_goal_batch(tdee, goal))
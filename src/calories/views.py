@@ -14,18 +14,33 @@ Views: auth (register/login), dashboard, calculator, CRUD for food & meals, prof
 ===========================================================================
 """
 from __future__ import annotations
-from datetime import date
+from datetime import date, timedelta
 from django.contrib import messages  # type: ignore
 from django.contrib.auth import authenticate, login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import AuthenticationForm  # type: ignore
-from django.http import HttpRequest, HttpResponse
+from django.core.handlers.asgi import ASGIRequest  # type: ignore
+from django.db import IntegrityError, transaction
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_http_methods
 
 from .forms import RegisterForm, UserProfileForm, FoodItemForm, MealEntryForm
+from . import (
+    archive, energy, exports, freshness, http, planner, projection, reports, rollups, search, sync,
+)
 from .models import UserProfile, FoodItem, MealEntry
-from .utils import mifflin_st_jeor, tdee_from_bmr, target_calories_from_goal
+from .pagination import InvalidCursorError, paginate
+
+MEAL_ORDERING = ("-date", "-id")
+FOOD_ORDERING = ("name",)
 
 
 @require_http_methods(["GET", "POST"])
@@ -66,25 +81,24 @@ def profile_view(request: HttpRequest) -> HttpResponse:
 
 
 @login_required
+@freshness.conditional(freshness.USER, freshness.CATALOG, daily=True)
 def dashboard_view(request: HttpRequest) -> HttpResponse:
-    profile = get_object_or_404(UserProfile, user=request.user)
-    bmr = mifflin_st_jeor(profile.sex, profile.age, profile.height_cm, profile.weight_kg)
-    tdee = tdee_from_bmr(bmr, profile.activity_level)
-    target = target_calories_from_goal(tdee, profile.goal)
+    profile = energy.get_energy_profile(request.user.pk)
+    if profile is None:
+        raise Http404("No profile for this user.")
 
     today = date.today()
     meals = MealEntry.objects.filter(user=request.user, date=today).select_related("food")
-    consumed = sum(m.calories for m in meals)
-    remaining = round(max(target - consumed, 0), 2)
+    totals = rollups.day_totals(request.user, today)
+    consumed = totals["kcal"]
+    remaining = round(max(profile.target - consumed, 0), 2)
 
     ctx = {
-        "profile": profile,
-        "bmr": round(bmr, 2),
-        "tdee": round(tdee, 2),
-        "target": round(target, 2),
+        **profile.rounded(),
         "today": today,
         "meals": meals,
-        "consumed": round(consumed, 2),
+        "consumed": consumed,
+        "totals": totals,
         "remaining": remaining,
     }
     return render(request, "calories/dashboard.html", ctx)
@@ -98,15 +112,9 @@ def calculator_view(request: HttpRequest) -> HttpResponse:
         form = UserProfileForm(request.POST, instance=profile)
         if form.is_valid():
             profile = form.save()
-            bmr = mifflin_st_jeor(profile.sex, profile.age, profile.height_cm, profile.weight_kg)
-            tdee = tdee_from_bmr(bmr, profile.activity_level)
-            target = target_calories_from_goal(tdee, profile.goal)
+            result = energy.prime(profile)
             messages.success(request, "Calculated daily target calories.")
-            return render(
-                request,
-                "calories/calculator.html",
-                {"form": form, "bmr": round(bmr, 2), "tdee": round(tdee, 2), "target": round(target, 2)},
-            )
+            return render(request, "calories/calculator.html", {"form": form, **result.rounded()})
     else:
         form = UserProfileForm(instance=profile)
     return render(request, "calories/calculator.html", {"form": form})
@@ -114,9 +122,20 @@ def calculator_view(request: HttpRequest) -> HttpResponse:
 
 # Food CRUD
 @login_required
+@freshness.conditional(freshness.CATALOG)
 def food_list_view(request: HttpRequest) -> HttpResponse:
-    foods = FoodItem.objects.all().order_by("name")
-    return render(request, "calories/food_list.html", {"foods": foods})
+    try:
+        page = paginate(
+            FoodItem.objects.all(),
+            FOOD_ORDERING,
+            after=request.GET.get("after"),
+            before=request.GET.get("before"),
+            size=http.size_param(request, default=100),
+        )
+    except InvalidCursorError:
+        return HttpResponseBadRequest("Invalid page cursor")
+    ctx = {"foods": page.items, "page": page, **http.page_urls(request, page)}
+    return render(request, "calories/food_list.html", ctx)
 
 
 @login_required
@@ -151,21 +170,58 @@ def food_delete_view(request: HttpRequest, pk: int) -> HttpResponse:
     return redirect("food_list")
 
 
-# Meals CRUD
 @login_required
+@require_http_methods(["GET"])
+def food_search_view(request: HttpRequest) -> JsonResponse:
+    """Autocomplete endpoint: ``/foods/search/?q=chiken&limit=10``."""
+    query, limit = http.search_params(request)
+    return http.search_response(query, search.search_foods(query, limit))
+
+
+@login_required
+@freshness.conditional(freshness.USER, freshness.CATALOG, freshness.ARCHIVE)
 def meal_list_view(request: HttpRequest) -> HttpResponse:
+    try:
+        start, end = http.date_param(request, "from"), http.date_param(request, "to")
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
     meals = MealEntry.objects.filter(user=request.user).select_related("food")
-    return render(request, "calories/meal_list.html", {"meals": meals})
+    if start:
+        meals = meals.filter(date__gte=start)
+    if end:
+        meals = meals.filter(date__lte=end)
+    after, before = request.GET.get("after"), request.GET.get("before")
+    try:
+        page = paginate(
+            meals,
+            MEAL_ORDERING,
+            after=after,
+            before=before,
+            size=http.size_param(request),
+            merge=archive.history_merge(request.user.pk, start, end, MEAL_ORDERING, after, before),
+        )
+    except InvalidCursorError:
+        return HttpResponseBadRequest("Invalid page cursor")
+    ctx = {
+        "meals": page.items,
+        "page": page,
+        "date_from": start,
+        "date_to": end,
+        **http.page_urls(request, page),
+    }
+    return render(request, "calories/meal_list.html", ctx)
 
 
 @login_required
 @require_http_methods(["GET", "POST"])
 def meal_create_view(request: HttpRequest) -> HttpResponse:
-    form = MealEntryForm(request.POST or None)
+    form = MealEntryForm(request.POST or None, user=request.user)
     if request.method == "POST" and form.is_valid():
         meal = form.save(commit=False)
         meal.user = request.user
-        meal.save()
+        with transaction.atomic():
+            meal.save()
+            rollups.meal_added(meal)
         messages.success(request, "Meal recorded.")
         return redirect("meal_list")
     return render(request, "calories/meal_form.html", {"form": form})
@@ -175,9 +231,12 @@ def meal_create_view(request: HttpRequest) -> HttpResponse:
 @require_http_methods(["GET", "POST"])
 def meal_update_view(request: HttpRequest, pk: int) -> HttpResponse:
     meal = get_object_or_404(MealEntry, pk=pk, user=request.user)
-    form = MealEntryForm(request.POST or None, instance=meal)
+    before = rollups.MealSnapshot.of(meal)
+    form = MealEntryForm(request.POST or None, instance=meal, user=request.user)
     if request.method == "POST" and form.is_valid():
-        form.save()
+        with transaction.atomic():
+            meal = form.save()
+            rollups.meal_changed(before, meal)
         messages.success(request, "Meal updated.")
         return redirect("meal_list")
     return render(request, "calories/meal_form.html", {"form": form})
@@ -186,8 +245,185 @@ def meal_update_view(request: HttpRequest, pk: int) -> HttpResponse:
 @login_required
 @require_http_methods(["POST"])
 def meal_delete_view(request: HttpRequest, pk: int) -> HttpResponse:
-    meal = get_object_or_404(MealEntry, pk=pk, user=request.user)
-    meal.delete()
+    meal = get_object_or_404(MealEntry.objects.select_related("food"), pk=pk, user=request.user)
+    with transaction.atomic():
+        meal.delete()
+        rollups.meal_removed(meal)
     messages.info(request, "Meal deleted.")
     return redirect("meal_list")
 
+
+@login_required
+@require_http_methods(["POST"])
+def meal_bulk_view(request: HttpRequest) -> JsonResponse:
+    """Log a batch of meals: ``{"entries": [{"date", "food", "quantity_g", "key"?}, ...]}``.
+
+    Responds 201 with per-entry results, 400 (nothing written) if any entry is
+    invalid, or 409 if a concurrent request inserted one of the same keys.
+    """
+    entries, error = http.bulk_entries(request)
+    if error is not None:
+        return error
+    try:
+        result = sync.log_meals(request.user, entries)
+    except IntegrityError:
+        return http.bulk_conflict()
+    return http.bulk_response(result)
+
+
+@login_required
+@require_http_methods(["GET"])
+def meal_export_view(request: HttpRequest) -> HttpResponse:
+    """Stream the user's meal history: ``/meals/export/?format=ndjson&from=2025-01-01``."""
+    fmt = request.GET.get("format", "csv")
+    if fmt not in exports.FORMATS:
+        return HttpResponseBadRequest("format must be csv or ndjson")
+    try:
+        start, end = http.date_param(request, "from"), http.date_param(request, "to")
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    chunks = exports.encode(exports.meal_rows(request.user, start, end), fmt)
+    if isinstance(request, ASGIRequest):
+        chunks = exports.astream(chunks)
+    response = StreamingHttpResponse(chunks, content_type=exports.FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="meals.{fmt}"'
+    return response
+
+
+def _trend_report(request: HttpRequest) -> reports.TrendReport:
+    """Build the report from query params; raises ValueError on bad input."""
+    end = http.date_param(request, "to") or date.today()
+    start = http.date_param(request, "from") or end - timedelta(days=29)
+    tolerance = http.number_param(request, "tolerance", reports.DEFAULT_TOLERANCE)
+    profile = energy.get_energy_profile(request.user.pk)
+    return reports.trend_report(
+        request.user,
+        start,
+        end,
+        granularity=request.GET.get("granularity", "day"),
+        target=profile.target if profile else None,
+        tolerance=tolerance,
+    )
+
+
+@login_required
+@require_http_methods(["GET"])
+def report_view(request: HttpRequest) -> HttpResponse:
+    try:
+        report = _trend_report(request)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    ctx = {"report": report, "granularities": reports.GRANULARITIES}
+    return render(request, "calories/report.html", ctx)
+
+
+@login_required
+@require_http_methods(["GET"])
+def report_api_view(request: HttpRequest) -> JsonResponse:
+    """``/reports/trend/?from=2025-01-01&to=2025-12-31&granularity=week``"""
+    try:
+        report = _trend_report(request)
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse(report.as_dict())
+
+
+def _meal_plan(request: HttpRequest) -> planner.MealPlan:
+    """Build a plan for the user's target (or ``kcal``) from query params;
+    raises ValueError on bad input."""
+    profile = energy.get_energy_profile(request.user.pk)
+    kcal = http.number_param(request, "kcal", profile.target if profile else None)
+    if kcal is None:
+        raise ValueError("kcal is required until the profile is filled in")
+    defaults = [round(share * 100) for share in planner.DEFAULT_SPLIT]
+    names = ("protein", "carbs", "fat")
+    percents = [http.number_param(request, name, d) for name, d in zip(names, defaults)]
+    if any(p < 0 for p in percents) or sum(percents) <= 0:
+        raise ValueError("protein, carbs and fat percentages must be 0 or more with a positive sum")
+    return planner.plan_meals(
+        kcal,
+        split=[p / sum(percents) for p in percents],
+        items=http.number_param(request, "items", planner.DEFAULT_ITEMS, int),
+        tolerance=http.number_param(request, "tolerance", planner.DEFAULT_TOLERANCE),
+        seed=http.number_param(request, "seed", 0, int),
+        exclude=http.id_list_param(request, "exclude"),
+    )
+
+
+@login_required
+@require_http_methods(["GET"])
+def plan_view(request: HttpRequest) -> HttpResponse:
+    try:
+        plan = _meal_plan(request)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    params = request.GET.copy()
+    params["seed"] = http.number_param(request, "seed", 0, int) + 1
+    ctx = {"plan": plan, "another_url": f"?{params.urlencode()}"}
+    return render(request, "calories/plan.html", ctx)
+
+
+@login_required
+@require_http_methods(["GET"])
+def plan_api_view(request: HttpRequest) -> JsonResponse:
+    """``/plan/generate/?kcal=2200&protein=30&carbs=40&fat=30&items=5&seed=1``"""
+    try:
+        plan = _meal_plan(request)
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse(plan.as_dict())
+
+
+def _projection(request: HttpRequest) -> projection.Projection:
+    """Scenarios from query params over the user's profile, which is only
+    read (unlike calculator_view); raises ValueError on bad input."""
+    profile = UserProfile.objects.filter(user=request.user).first()
+    baseline = {"sex": request.GET.get("sex") or getattr(profile, "sex", None)}
+    for name, cast in (("age", int), ("height_cm", float), ("weight_kg", float)):
+        baseline[name] = http.number_param(request, name, getattr(profile, name, None), cast)
+    missing = [name for name, value in baseline.items() if value is None]
+    if missing:
+        raise ValueError(f"{', '.join(missing)} required until the profile is filled in")
+    return projection.cached_projection(
+        **baseline,
+        activity_levels=http.list_param(request, "activity", list(projection.ACTIVITY_LEVELS)),
+        goals=http.list_param(request, "goal", list(projection.GOALS)),
+        weight_deltas_kg=http.list_param(request, "delta", [0.0], float),
+        weeks=http.number_param(request, "weeks", projection.DEFAULT_WEEKS, int),
+        adaptive=request.GET.get("adaptive") in ("1", "true", "on"),
+    )
+
+
+@login_required
+@require_http_methods(["GET"])
+def projection_view(request: HttpRequest) -> HttpResponse:
+    try:
+        result = _projection(request)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    weeks = result.checkpoints()
+    rows = [(s, [s["weights_kg"][w] for w in weeks]) for s in result.scenarios]
+    ctx = {
+        "projection": result,
+        "weeks": weeks,
+        "rows": rows,
+        "activity_levels": UserProfile.Activity.choices,
+        "goals": UserProfile.Goal.choices,
+        "selected_activities": {s["activity_level"] for s in result.scenarios},
+        "selected_goals": {s["goal"] for s in result.scenarios},
+        "deltas": ",".join(
+            f"{d:g}" for d in dict.fromkeys(s["weight_delta_kg"] for s in result.scenarios)
+        ),
+    }
+    return render(request, "calories/projection.html", ctx)
+
+
+@login_required
+@require_http_methods(["GET"])
+def projection_api_view(request: HttpRequest) -> JsonResponse:
+    """``/projection/simulate/?activity=light,active&goal=lose&delta=-5,0&weeks=52``"""
+    try:
+        result = _projection(request)
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse(result.as_dict())
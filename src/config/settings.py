@@ -46,6 +46,10 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
+# Server-Timing header, slow-request log and per-URL histograms (manage.py request_timings).
+if os.getenv("CALORIES_REQUEST_TIMING", "False").lower() == "true":
+    MIDDLEWARE.insert(0, "calories.instrumentation.RequestTimingMiddleware")
+CALORIES_SLOW_REQUEST_MS = float(os.getenv("CALORIES_SLOW_REQUEST_MS", 500))
 
 ROOT_URLCONF = "config.urls"
 
@@ -67,14 +71,90 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 ASGI_APPLICATION = "config.asgi.application"
+# Route dashboard/meal list/meal create/JSON endpoints to calories.async_views.
+# Enable when serving config.asgi with an ASGI server (uvicorn, daphne, ...).
+CALORIES_ASYNC_VIEWS = os.getenv("CALORIES_ASYNC_VIEWS", "False").lower() == "true"
 
-# Database: SQLite default
+# Database: SQLite default, tuned for concurrent readers and writers.
+# WAL lets reads proceed while a write is in progress; BEGIN IMMEDIATE takes
+# the write lock up front so busy_timeout applies instead of failing with
+# "database is locked" on a read-to-write upgrade. Set DJANGO_SQLITE_TUNING=False
+# to get SQLite's defaults back.
+CONN_MAX_AGE = os.getenv("DJANGO_CONN_MAX_AGE", "0")
+SQLITE_TUNING = os.getenv("DJANGO_SQLITE_TUNING", "True").lower() == "true"
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -64 * 1024)),  # negative = KiB
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+}
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Seconds to keep a connection open between requests (0 = per request,
+        # "none" = forever); health checks revalidate reused connections.
+        "CONN_MAX_AGE": None if CONN_MAX_AGE.lower() == "none" else int(CONN_MAX_AGE),
+        "CONN_HEALTH_CHECKS": os.getenv("DJANGO_CONN_HEALTH_CHECKS", "True").lower() == "true",
+    }
+}
+if SQLITE_TUNING:
+    DATABASES["default"]["OPTIONS"] = {
+        "init_command": ";".join(f"PRAGMA {k}={v}" for k, v in SQLITE_PRAGMAS.items()),
+        "transaction_mode": os.getenv("SQLITE_TRANSACTION_MODE", "IMMEDIATE"),
+    }
+# Read replicas (calories.replicas): GET requests read from them, writes and
+# reads shortly after a write go to "default". DJANGO_READ_REPLICAS lists
+# comma-separated SQLite files added as replica1..N with the default's
+# settings; `manage.py sync_replicas` copies db.sqlite3 into them. For other
+# engines add the replica aliases to DATABASES and CALORIES_READ_REPLICAS.
+READ_REPLICAS = [p.strip() for p in os.getenv("DJANGO_READ_REPLICAS", "").split(",") if p.strip()]
+for number, name in enumerate(READ_REPLICAS, start=1):
+    DATABASES[f"replica{number}"] = {
+        **DATABASES["default"], "NAME": name, "TEST": {"MIRROR": "default"},
+    }
+CALORIES_READ_REPLICAS = [f"replica{number}" for number in range(1, len(READ_REPLICAS) + 1)]
+if CALORIES_READ_REPLICAS:
+    DATABASE_ROUTERS = ["calories.replicas.ReplicaRouter"]
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.contrib.auth.middleware.AuthenticationMiddleware") + 1,
+        "calories.replicas.ReplicaMiddleware",
+    )
+# Read-your-writes window after a write, the lag beyond which a replica is
+# skipped (keep it below the window) and how often each process re-checks.
+CALORIES_REPLICA_STICKY_SECONDS = int(os.getenv("CALORIES_REPLICA_STICKY_SECONDS", 10))
+CALORIES_REPLICA_MAX_LAG_SECONDS = float(os.getenv("CALORIES_REPLICA_MAX_LAG_SECONDS", 5))
+CALORIES_REPLICA_CHECK_SECONDS = float(os.getenv("CALORIES_REPLICA_CHECK_SECONDS", 5))
+
+# Cache: per-process memory by default. Point DJANGO_CACHE_BACKEND/LOCATION at a
+# shared backend (e.g. django.core.cache.backends.redis.RedisCache + redis://...)
+# so cached energy profiles, search-index versions and page version stamps are
+# shared by all workers; without DEBUG the per-process default raises the
+# calories.W001 system check warning.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", "calories"),
     }
 }
+CALORIES_ENERGY_CACHE_TIMEOUT = int(os.getenv("CALORIES_ENERGY_CACHE_TIMEOUT", 24 * 3600))
+# Weight projections (calories.projection) are cached by their parameters.
+CALORIES_PROJECTION_CACHE_TIMEOUT = int(os.getenv("CALORIES_PROJECTION_CACHE_TIMEOUT", 24 * 3600))
+# Memory-mapped FoodItem nutrient snapshot (calories.catalog); must be a
+# directory every worker can read and write (shared storage across hosts).
+CALORIES_CATALOG_DIR = os.getenv("CALORIES_CATALOG_DIR", str(BASE_DIR / "var" / "catalog"))
+# Copy a food's per-100g values onto each MealEntry when it is logged, so
+# later edits to the food do not rewrite history. Off: entries follow the
+# food, and `manage.py run_jobs` refreshes the affected daily summaries.
+CALORIES_SNAPSHOT_NUTRIENTS = os.getenv("CALORIES_SNAPSHOT_NUTRIENTS", "False").lower() == "true"
+# Monthly MealEntry archive (calories.archive): `manage.py archive_meals`
+# moves whole months older than CALORIES_ARCHIVE_AFTER_DAYS into this
+# directory, which every web worker must be able to read.
+CALORIES_ARCHIVE_DIR = os.getenv("CALORIES_ARCHIVE_DIR", str(BASE_DIR / "var" / "archive"))
+CALORIES_ARCHIVE_AFTER_DAYS = int(os.getenv("CALORIES_ARCHIVE_AFTER_DAYS", 730))
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
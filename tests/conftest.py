@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/conftest.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _data_dirs(settings, tmp_path):
+    """Keep catalog snapshots and meal archives written by any test out of var/."""
+    settings.CALORIES_CATALOG_DIR = str(tmp_path / "catalog")
+    settings.CALORIES_ARCHIVE_DIR = str(tmp_path / "archive")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_search_index():
+    """Build the food search index from each test's own rows, not an earlier test's."""
+    from calories import search
+
+    search._index = None
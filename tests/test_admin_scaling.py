@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_admin_scaling.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from harness import seed
+
+from calories import favorites, rollups
+from calories.models import FoodUsage, MealEntry
+from calories.pagination import EstimatedCountPaginator
+from calories.templatetags.calories_admin import distinct_dates
+
+CHANGELIST = "/admin/calories/mealentry/"
+
+
+def _changelist_queries(admin_client, **params):
+    with CaptureQueriesContext(connection) as ctx:
+        r = admin_client.get(CHANGELIST, params)
+    assert r.status_code == 200
+    return [q["sql"] for q in ctx.captured_queries]
+
+
+@pytest.mark.parametrize("users,meals_per_user", [(2, 10), (40, 60)])
+def test_changelist_query_count_is_flat(admin_client, db, users, meals_per_user):
+    seed(users=users, foods=50, meals_per_user=meals_per_user, days=800)
+    queries = _changelist_queries(admin_client)
+    assert len(queries) <= 12
+    assert not any("DISTINCT" in q for q in queries)
+    assert not any('FROM "auth_user"' in q and "WHERE" not in q for q in queries)
+
+
+def test_user_filter_and_drill_down(admin_client, db):
+    seed(users=3, foods=20, meals_per_user=30, days=800)
+    user_id = MealEntry.objects.values_list("user_id", flat=True).first()
+    year = MealEntry.objects.filter(user_id=user_id).latest("date").date.year
+    r = admin_client.get(CHANGELIST, {"user__id__exact": user_id, "date__year": year})
+    shown = {m.user_id for m in r.context["cl"].result_list}
+    assert shown == {user_id}
+    assert f'value="{user_id}" selected' in r.content.decode()
+
+
+def test_distinct_dates_matches_orm(db):
+    seed(users=2, foods=10, meals_per_user=80, days=900)
+    qs = MealEntry.objects.all()
+    for kind in ("year", "month", "day"):
+        assert distinct_dates(qs, "date", kind) == list(qs.dates("date", kind))
+    since = qs.filter(date__gte=date(2025, 1, 1))
+    assert distinct_dates(since, "date", "month") == list(since.dates("date", "month"))
+
+
+def test_estimated_count_skips_count_star(db, monkeypatch):
+    seed(users=2, foods=10, meals_per_user=50)
+    monkeypatch.setattr(EstimatedCountPaginator, "threshold", 10)
+    with CaptureQueriesContext(connection) as ctx:
+        count = EstimatedCountPaginator(MealEntry.objects.all(), 20).count
+    assert count >= MealEntry.objects.count()
+    assert not any("COUNT(" in q["sql"] for q in ctx.captured_queries)
+    assert EstimatedCountPaginator(MealEntry.objects.filter(user_id=0), 20).count == 0
+    assert EstimatedCountPaginator(MealEntry.objects.filter(quantity_g__gt=0), 20).count == 10
+
+
+def test_food_autocomplete_is_prefix_search(admin_client, db):
+    seed(users=1, foods=300, meals_per_user=0)
+    r = admin_client.get("/admin/autocomplete/", {
+        "term": "food 000012", "app_label": "calories", "model_name": "mealentry",
+        "field_name": "food",
+    })
+    assert [x["text"] for x in r.json()["results"]] == [f"Food {i:07d}" for i in range(120, 130)]
+
+
+def _bulk_delete_queries(admin_client, ids):
+    data = {"action": "delete_selected", "post": "yes", "_selected_action": ids}
+    with CaptureQueriesContext(connection) as ctx:
+        assert admin_client.post(CHANGELIST, data).status_code == 302
+    return len(ctx.captured_queries)
+
+
+def test_bulk_delete_updates_rollups_once_per_day(admin_client, db):
+    seed(users=3, foods=20, meals_per_user=60, days=30)
+    first, second = (
+        list(MealEntry.objects.filter(user_id=user_id).values_list("id", flat=True))
+        for user_id in MealEntry.objects.values_list("user_id", flat=True).distinct()[:2]
+    )
+    few = _bulk_delete_queries(admin_client, first[:3])
+    many = _bulk_delete_queries(admin_client, second)
+    assert many <= few  # a whole user's history costs no more than three meals
+    assert rollups.find_drift() == []
+    usage = sorted(FoodUsage.objects.values_list("user_id", "food_id", "uses"))
+    favorites.rebuild()
+    assert sorted(FoodUsage.objects.values_list("user_id", "food_id", "uses")) == usage
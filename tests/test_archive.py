@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_archive.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import io
+import json
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+
+from calories import archive, exports, rollups
+from calories.models import DailyNutritionSummary, FoodItem, MealEntry
+
+
+@pytest.fixture
+def diary(db, settings, tmp_path):
+    settings.CALORIES_ARCHIVE_DIR = str(tmp_path)
+    u = User.objects.create_user("ivy", password="pass12345")
+    other = User.objects.create_user("jon", password="pass12345")
+    rice = FoodItem.objects.create(name="Rice", calories_per_100g=130, carbs_g=28)
+    meals = [
+        MealEntry(user=u, date=date(2023, 1, 1) + timedelta(days=d), food=rice, quantity_g=100 + d)
+        for d in range(0, 75, 3)  # January to mid-March 2023
+    ]
+    meals.append(MealEntry(user=other, date=date(2023, 1, 5), food=rice, quantity_g=50))
+    MealEntry.objects.bulk_create(meals)
+    rollups.rebuild()
+    return u, other, rice
+
+
+def test_archive_moves_whole_months_and_keeps_summaries(diary, tmp_path):
+    u, other, _ = diary
+    summaries = list(DailyNutritionSummary.objects.values_list("user_id", "date", "kcal"))
+    out = io.StringIO()
+    call_command("archive_meals", "--older-than-days", "0", "--dry-run", stdout=out)
+    assert out.getvalue().splitlines()[:3] == ["2023-01", "2023-02", "2023-03"]
+    assert archive.archive_month("2023-01") == 12
+    assert archive.archive_month("2023-02") == 9
+
+    assert not MealEntry.objects.filter(date__lt=date(2023, 3, 1)).exists()
+    parts = json.loads((tmp_path / archive.MANIFEST).read_text())["partitions"]
+    assert parts["2023-01"]["rows"] == 12 and parts["2023-01"]["users"] == 2
+    assert (tmp_path / "meals-2023-02.npz").exists()
+    # Reports keep reading the summaries; a full rebuild counts the archive.
+    assert list(DailyNutritionSummary.objects.values_list("user_id", "date", "kcal")) == summaries
+    assert rollups.find_drift() == []
+    rollups.rebuild()
+    rebuilt = list(DailyNutritionSummary.objects.values_list("user_id", "date", "kcal"))
+    assert rebuilt == [(user, day, pytest.approx(kcal)) for user, day, kcal in summaries]
+
+
+def test_archive_is_idempotent_and_merges_late_rows(diary):
+    u, _, rice = diary
+    archive.archive_month("2023-01")
+    assert archive.archive_month("2023-01") == 0
+    MealEntry.objects.create(user=u, date=date(2023, 1, 2), food=rice, quantity_g=10)
+    assert archive.archive_month("2023-01") == 1
+    assert archive.manifest()["2023-01"]["rows"] == 13
+
+
+def test_rows_of_an_uncommitted_archive_run_are_not_counted_twice(client, diary):
+    u, other, _ = diary
+    before = list(exports.meal_rows())
+    with pytest.raises(RuntimeError), transaction.atomic():
+        archive.archive_month("2023-01")  # files published, then the DELETE rolls back
+        raise RuntimeError
+    assert archive.manifest()["2023-01"]["rows"] == 12 and MealEntry.objects.count() == 26
+    assert list(exports.meal_rows()) == before
+    assert rollups.find_drift() == []
+    client.force_login(other)
+    assert len(client.get("/meals/").context["meals"]) == 1
+    assert archive.archive_month("2023-01") == 12
+    assert archive.manifest()["2023-01"]["rows"] == 12 and list(exports.meal_rows()) == before
+
+
+def test_meal_list_pages_across_live_and_archived_rows(client, diary):
+    u, _, rice = diary
+    archive.archive_month("2023-01")
+    archive.archive_month("2023-02")
+    client.force_login(u)
+    expected = list(
+        MealEntry.objects.filter(user=u).values_list("date", flat=True)
+    ) + [date(2023, 1, 1) + timedelta(days=d) for d in range(57, -1, -3)]
+
+    seen, path, pages = [], "/meals/?size=7", []
+    while path:
+        response = client.get(path)
+        assert response.status_code == 200
+        pages.append(response.context["page"])
+        seen += [m.date for m in response.context["meals"]]
+        path = response.context["next_url"] and "/meals/" + response.context["next_url"]
+    assert seen == expected
+    assert any(getattr(m, "archived", False) for m in pages[-1].items)
+    assert b"Archived" in response.content and b"Rice" in response.content
+
+    # Paging back from the last page returns the previous one.
+    back = client.get("/meals/" + response.context["prev_url"])
+    assert [m.pk for m in back.context["meals"]] == [m.pk for m in pages[-2].items]
+
+    filtered = client.get("/meals/", {"from": "2023-02-01", "to": "2023-02-28"})
+    assert [m.date.month for m in filtered.context["meals"]] == [2] * 9
+
+
+def test_export_includes_archived_rows_in_date_order(diary):
+    u, other, _ = diary
+    before = list(exports.meal_rows())
+    archive.archive_month("2023-01")
+    assert list(exports.meal_rows()) == before
+    assert [r[2] for r in exports.meal_rows(user=other)] == [date(2023, 1, 5)]
+
+
+def test_archived_nutrients_are_frozen_and_restore_brings_rows_back(
+    diary, django_capture_on_commit_callbacks,
+):
+    u, other, rice = diary
+    archive.archive_month("2023-01")
+    with django_capture_on_commit_callbacks(execute=True):
+        rice.calories_per_100g = 200
+        rice.save()
+    assert exports.meal_rows(user=other).__next__()[5] == 65.0
+
+    out = io.StringIO()
+    call_command("restore_meals", "2023-01", stdout=out)
+    assert "2023-01: 12 meals restored." in out.getvalue()
+    assert "2023-01" not in archive.manifest()
+    # Logged values were not snapshotted, so restored rows follow the food again.
+    assert DailyNutritionSummary.objects.get(user=other, date=date(2023, 1, 5)).kcal == 100.0
+    assert MealEntry.objects.filter(date__month=1, date__year=2023).count() == 12
+
+    with pytest.raises(Exception, match="No archived partition"):
+        call_command("restore_meals", "2023-01")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_async_views.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import importlib
+import json
+from datetime import date
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import AsyncClient
+from django.urls import clear_url_caches
+
+from calories import async_views, search
+from calories.models import FoodItem, MealEntry, UserProfile
+
+
+def _reload_urls():
+    # The project resolver caches the included app patterns, so reload both.
+    import calories.urls
+    import config.urls
+
+    importlib.reload(calories.urls)
+    importlib.reload(config.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_urls(settings):
+    settings.CALORIES_ASYNC_VIEWS = True
+    _reload_urls()
+    yield
+    settings.CALORIES_ASYNC_VIEWS = False
+    _reload_urls()
+
+
+def test_async_paths_serve_same_pages(db, async_urls):
+    from django.urls import resolve
+
+    assert resolve("/").func.__name__ == async_views.dashboard_view.__name__
+    assert resolve("/").func.__module__ == "calories.async_views"
+
+    u = User.objects.create_user("pia", password="pass12345")
+    UserProfile.objects.create(user=u, sex="F", age=28, height_cm=165, weight_kg=60)
+    food = FoodItem.objects.create(name="Quinoa", calories_per_100g=120)
+    search.catalog_changed()
+    client = AsyncClient()
+
+    @async_to_sync
+    async def run():
+        assert (await client.get("/")).status_code == 302
+        await client.aforce_login(u)
+        meal = {"date": date.today(), "food": food.pk, "quantity_g": 200}
+        created = await client.post("/meals/new/", meal)
+        assert created.status_code == 302
+        bulk = await client.post(
+            "/meals/bulk/",
+            json.dumps({"entries": [{"date": "2025-01-01", "food": food.pk, "quantity_g": 50}]}),
+            content_type="application/json",
+        )
+        assert bulk.status_code == 201
+        dash = await client.get("/")
+        assert dash.status_code == 200 and dash.context["consumed"] == 240.0
+        listing = await client.get("/meals/", {"size": 1})
+        assert len(listing.context["meals"]) == 1 and listing.context["next_url"]
+        found = await client.get("/foods/search/", {"q": "quinoa"})
+        assert found.json()["results"][0]["id"] == food.pk
+
+    run()
+    assert MealEntry.objects.filter(user=u).count() == 2
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_catalog.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+from datetime import date
+
+import numpy as np
+import pytest
+from django.contrib.auth.models import User
+
+from calories import catalog
+from calories.models import FoodItem, MealEntry
+
+
+@pytest.fixture
+def catalog_dir(settings, tmp_path):
+    settings.CALORIES_CATALOG_DIR = str(tmp_path)
+    catalog.catalog_changed()
+    return tmp_path
+
+
+def test_empty_catalog(catalog_dir, db):
+    snap = catalog.get_snapshot()
+    assert len(snap) == 0 and 1 not in snap and catalog.nutrients(1, 100) is None
+
+
+def test_snapshot_lookup_and_versioning(catalog_dir, db):
+    oats = FoodItem.objects.create(
+        name="Oats", calories_per_100g=389, protein_g=17, carbs_g=66, fat_g=7
+    )
+    FoodItem.objects.create(
+        name="Milk", calories_per_100g=64, protein_g=3.3, carbs_g=4.8, fat_g=3.6
+    )
+    snap = catalog.get_snapshot()
+    assert isinstance(snap.columns, np.memmap) and len(snap) == 2
+    assert catalog.nutrients(oats.pk, 50) == {
+        "kcal": 194.5, "protein_g": 8.5, "carbs_g": 33.0, "fat_g": 3.5,
+    }
+    assert catalog.nutrients(oats.pk + 100, 50) is None
+    assert snap.kcal([oats.pk, oats.pk + 100], [200, 100])[0] == pytest.approx(778)
+
+    oats.calories_per_100g = 400
+    oats.save()
+    assert catalog.get_snapshot() is not snap
+    assert catalog.nutrients(oats.pk, 100)["kcal"] == 400
+    snapshot = f"catalog-{catalog.current_version()}.npy"
+    assert [p.name for p in catalog_dir.glob("*.npy")] == [snapshot]
+
+
+def test_meal_calories_skip_food_fetch(catalog_dir, db, django_assert_num_queries):
+    u = User.objects.create_user("cat", password="pass12345")
+    food = FoodItem.objects.create(name="Rice", calories_per_100g=130)
+    meal_id = MealEntry.objects.create(user=u, date=date(2025, 5, 1), food=food, quantity_g=250).pk
+    catalog.get_snapshot()
+    meals = list(MealEntry.objects.filter(pk=meal_id))
+    with django_assert_num_queries(0):
+        assert meals[0].calories == 325.0
+
+
+def test_version_file_is_shared_between_processes(catalog_dir, db):
+    food = FoodItem.objects.create(name="Beans", calories_per_100g=120)
+    snap = catalog.get_snapshot()
+    # Another worker changes the food and bumps the version; no signal runs here.
+    FoodItem.objects.filter(pk=food.pk).update(calories_per_100g=140)
+    (catalog_dir / catalog.VERSION_FILE).write_text("from-another-process")
+    assert catalog.current_version() == "from-another-process"
+    assert catalog.get_snapshot() is not snap
+    assert catalog.nutrients(food.pk, 100)["kcal"] == 140
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_conditional_get.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.checks import run_checks
+
+from calories import checks, freshness, rollups
+from calories.models import FoodItem, MealEntry, UserProfile
+
+
+@pytest.fixture
+def user_client(client, db):
+    u = User.objects.create_user("etag", password="pass12345")
+    UserProfile.objects.create(user=u, sex="F", age=30, height_cm=165, weight_kg=60)
+    client.force_login(u)
+    client.get("/foods/new/")  # sets the CSRF cookie that is part of every ETag
+    return client, u
+
+
+def _validators(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    return response["ETag"], response["Last-Modified"]
+
+
+@pytest.mark.parametrize("path", ["/", "/meals/", "/foods/"])
+def test_unchanged_page_is_304_without_queries(user_client, django_assert_max_num_queries, path):
+    client, _ = user_client
+    etag, modified = _validators(client, path)
+    assert etag.startswith('W/"')
+    # Only the session and user lookups made by login_required.
+    with django_assert_max_num_queries(2):
+        response = client.get(path, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304 and response["ETag"] == etag
+    assert client.get(path, HTTP_IF_MODIFIED_SINCE=modified).status_code == 304
+    assert client.get(path + "?size=5", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_meal_write_changes_user_pages_only(user_client, django_capture_on_commit_callbacks):
+    client, u = user_client
+    food = FoodItem.objects.create(name="Rice", calories_per_100g=130)
+    before = {p: _validators(client, p) for p in ("/", "/meals/", "/foods/")}
+    with django_capture_on_commit_callbacks(execute=True):
+        meal = MealEntry.objects.create(user=u, date=date.today(), food=food, quantity_g=100)
+        rollups.meal_added(meal)
+    for path in ("/", "/meals/"):
+        etag, modified = before[path]
+        assert client.get(path, HTTP_IF_NONE_MATCH=etag).status_code == 200
+        # Seconds only move forward, even for a change in the same second.
+        assert client.get(path, HTTP_IF_MODIFIED_SINCE=modified).status_code == 200
+    assert client.get("/foods/", HTTP_IF_NONE_MATCH=before["/foods/"][0]).status_code == 304
+
+
+def test_food_and_profile_edits_change_stamps(user_client, django_capture_on_commit_callbacks):
+    client, u = user_client
+    food = FoodItem.objects.create(name="Egg", calories_per_100g=155)
+    foods_etag, _ = _validators(client, "/foods/")
+    with django_capture_on_commit_callbacks(execute=True):
+        food.calories_per_100g = 143
+        food.save()
+    assert client.get("/foods/", HTTP_IF_NONE_MATCH=foods_etag).status_code == 200
+
+    dashboard_etag, _ = _validators(client, "/")
+    with django_capture_on_commit_callbacks(execute=True):
+        UserProfile.objects.filter(user=u).update(weight_kg=58)
+        UserProfile.objects.get(user=u).save()
+    assert client.get("/", HTTP_IF_NONE_MATCH=dashboard_etag).status_code == 200
+
+
+def test_stamp_waits_for_commit(user_client, django_capture_on_commit_callbacks):
+    client, u = user_client
+    scope = freshness.user_scope(u.pk)
+    stamp = freshness.stamps([scope])
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        freshness.changed(scope)
+    assert freshness.stamps([scope]) == stamp and len(callbacks) == 1
+    callbacks[0]()
+    assert freshness.stamps([scope])[0][0] > stamp[0][0]
+
+
+def test_pending_messages_skip_validators(user_client):
+    client, _ = user_client
+    etag, _ = _validators(client, "/foods/")
+    client.post("/foods/new/", {"name": "Oats", "calories_per_100g": 389, "protein_g": 17,
+                                "carbs_g": 66, "fat_g": 7})
+    response = client.get("/foods/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200 and not response.has_header("ETag")
+    assert b"Food added." in response.content
+
+
+def test_per_process_cache_warns_in_the_system_check(settings):
+    settings.DEBUG = False
+    [warning] = checks.check_shared_cache()
+    assert warning.id == "calories.W001" and not warning.is_serious()
+    assert "calories.W001" in [e.id for e in run_checks(tags=["caches"])]
+    settings.DEBUG = True
+    assert checks.check_shared_cache() == []
+    settings.DEBUG = False
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+    assert checks.check_shared_cache() == []
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_energy_cache.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from calories import energy
+from calories.models import UserProfile
+
+
+def test_dashboard_skips_profile_query_when_warm(client, db, django_assert_num_queries):
+    cache.clear()
+    u = User.objects.create_user("lena", password="pass12345")
+    UserProfile.objects.create(
+        user=u, sex="M", age=30, height_cm=180, weight_kg=80, activity_level="moderate"
+    )
+    client.force_login(u)
+    client.get("/")  # warm
+
+    before = energy.cache_stats()
+    # session + user, today's meals, today's rollup row; no UserProfile query
+    with django_assert_num_queries(4) as ctx:
+        r = client.get("/")
+    assert not any("calories_userprofile" in q["sql"] for q in ctx.captured_queries)
+    assert r.context["target"] == round(1780 * 1.55, 2)
+    assert energy.cache_stats()["hits"] == before["hits"] + 1
+
+
+def test_profile_save_invalidates(client, db):
+    cache.clear()
+    u = User.objects.create_user("milo", password="pass12345")
+    profile = UserProfile.objects.create(user=u, sex="F", age=40, height_cm=160, weight_kg=70)
+    assert energy.get_energy_profile(u.pk).bmr == 10 * 70 + 6.25 * 160 - 5 * 40 - 161
+
+    client.force_login(u)
+    client.post("/profile/", {"sex": "F", "age": 40, "height_cm": 160, "weight_kg": 60,
+                              "activity_level": "sedentary", "goal": "lose"})
+    assert energy.get_energy_profile(u.pk).bmr == 10 * 60 + 6.25 * 160 - 5 * 40 - 161
+
+    profile.delete()
+    assert energy.get_energy_profile(u.pk) is None
+
+
+def test_invalidation_during_a_miss_is_not_overwritten(db, monkeypatch):
+    cache.clear()
+    u = User.objects.create_user("nora", password="pass12345")
+    profile = UserProfile.objects.create(user=u, sex="F", age=40, height_cm=160, weight_kg=70)
+    compute = energy.compute
+
+    def save_meanwhile(loaded):
+        # Another request saves the profile after this one read it.
+        profile.weight_kg = 60
+        profile.save()
+        return compute(loaded)
+
+    monkeypatch.setattr(energy, "compute", save_meanwhile)
+    assert energy.get_energy_profile(u.pk).bmr == 10 * 70 + 6.25 * 160 - 5 * 40 - 161
+    monkeypatch.setattr(energy, "compute", compute)
+    assert energy.get_energy_profile(u.pk).bmr == 10 * 60 + 6.25 * 160 - 5 * 40 - 161
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_exports.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import csv
+import io
+import json
+from datetime import date
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import AsyncClient
+
+from calories import exports
+from calories.models import FoodItem, MealEntry
+
+
+def _seed():
+    u = User.objects.create_user("gus", password="pass12345")
+    other = User.objects.create_user("hana", password="pass12345")
+    pasta = FoodItem.objects.create(
+        name="Pasta", calories_per_100g=131, protein_g=5, carbs_g=25, fat_g=1.1
+    )
+    for day in (1, 2, 3):
+        MealEntry.objects.create(user=u, date=date(2025, 5, day), food=pasta, quantity_g=150)
+    MealEntry.objects.create(user=other, date=date(2025, 5, 2), food=pasta, quantity_g=10)
+    return u
+
+
+def test_export_view_streams_user_rows_in_range(client, db):
+    client.force_login(_seed())
+    r = client.get("/meals/export/", {"format": "csv", "from": "2025-05-02"})
+    assert r.streaming and r["Content-Type"] == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(b"".join(r.streaming_content).decode())))
+    assert [row["date"] for row in rows] == ["2025-05-02", "2025-05-03"]
+    assert {row["user"] for row in rows} == {"gus"}
+    assert rows[0]["kcal"] == "196.5" and rows[0]["carbs_g"] == "37.5"
+
+    assert client.get("/meals/export/", {"from": "yesterday"}).status_code == 400
+
+
+def test_export_view_streams_asynchronously_under_asgi(db):
+    u = _seed()
+    client = AsyncClient()
+
+    @async_to_sync
+    async def fetch():
+        await client.aforce_login(u)
+        r = await client.get("/meals/export/", {"format": "ndjson"})
+        assert r.is_async
+        return b"".join([chunk async for chunk in r.streaming_content])
+
+    records = [json.loads(line) for line in fetch().decode().splitlines()]
+    assert [r["date"] for r in records] == ["2025-05-01", "2025-05-02", "2025-05-03"]
+
+
+def test_csv_cells_that_spreadsheets_would_run_are_quoted():
+    names = ["=HYPERLINK(\"http://x\")", "+1", "-1", "@SUM(A1)", "\tx", "\rx", "Pasta"]
+    rows = [(i, "gus", date(2025, 5, 1), name, -5.0, 0, 0, 0, 0) for i, name in enumerate(names)]
+    lines = "".join(exports.encode(rows, "csv"))
+    parsed = list(csv.DictReader(io.StringIO(lines)))
+    assert [row["food"] for row in parsed] == ["'" + n for n in names[:-1]] + ["Pasta"]
+    assert parsed[0]["quantity_g"] == "-5.0"
+
+
+def test_export_command_covers_all_users(db):
+    _seed()
+    out = io.StringIO()
+    call_command("export_meals", "--format", "ndjson", "--to", "2025-05-02", stdout=out)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(r["user"], r["date"]) for r in records] == [
+        ("gus", "2025-05-01"), ("gus", "2025-05-02"), ("hana", "2025-05-02"),
+    ]
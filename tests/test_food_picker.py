@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_food_picker.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import re
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+
+from calories import favorites
+from calories.models import FoodItem, FoodUsage, MealEntry
+
+
+@pytest.fixture
+def diner(client, db):
+    u = User.objects.create_user("pia", password="pass12345")
+    foods = FoodItem.objects.bulk_create(
+        FoodItem(name=f"Catalog food {i:04d}", calories_per_100g=100) for i in range(300)
+    )
+    client.force_login(u)
+    return client, u, foods
+
+
+def _log(client, food, day, grams=100):
+    response = client.post("/meals/new/", {"date": day, "food": food.pk, "quantity_g": grams})
+    assert response.status_code == 302
+
+
+def _options(response):
+    return [int(v) for v in re.findall(r'<option value="(\d+)"', response.content.decode())]
+
+
+def test_form_lists_recent_and_frequent_foods_only(diner, django_capture_on_commit_callbacks):
+    client, u, foods = diner
+    with django_capture_on_commit_callbacks(execute=True):
+        for days_ago in range(4):
+            _log(client, foods[10], date.today() - timedelta(days=10 + days_ago))
+        _log(client, foods[20], date.today() - timedelta(days=30))
+        _log(client, foods[30], date.today())
+
+    response = client.get("/meals/new/")
+    assert response.status_code == 200
+    # Latest first, then by use count; never the other 297 foods.
+    assert _options(response) == [foods[30].pk, foods[10].pk, foods[20].pk]
+    assert 'data-search-url="/foods/search/"' in response.content.decode()
+    assert b"calories/js/food_picker.js" in response.content
+    assert FoodUsage.objects.get(user=u, food=foods[10]).uses == 4
+
+
+def test_form_cost_does_not_grow_with_catalog(diner, django_assert_max_num_queries):
+    client, _, foods = diner
+    _log(client, foods[1], date.today())
+    client.get("/meals/new/")
+    # Session, user and one primary-key lookup of the picked foods' names.
+    with django_assert_max_num_queries(3):
+        assert client.get("/meals/new/").status_code == 200
+
+
+def test_any_catalog_food_validates_by_id(diner):
+    client, u, foods = diner
+    _log(client, foods[299], date.today())
+    assert MealEntry.objects.filter(user=u, food=foods[299]).exists()
+    meal = {"date": date.today(), "food": 10 ** 9, "quantity_g": 100}
+    response = client.post("/meals/new/", meal)
+    assert response.status_code == 200 and "food" in response.context["form"].errors
+
+
+def test_edit_form_keeps_current_food_and_removals_forget(
+    diner, django_capture_on_commit_callbacks,
+):
+    client, u, foods = diner
+    with django_capture_on_commit_callbacks(execute=True):
+        _log(client, foods[5], date.today())
+    meal = MealEntry.objects.get(user=u)
+    with django_capture_on_commit_callbacks(execute=True):
+        FoodUsage.objects.filter(user=u).delete()
+        favorites._changed([u.pk])
+    assert _options(client.get(f"/meals/{meal.pk}/edit/")) == [foods[5].pk]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _log(client, foods[6], date.today())
+        edit = {"date": date.today(), "food": foods[7].pk, "quantity_g": 50}
+        client.post(f"/meals/{meal.pk}/edit/", edit)
+    assert set(FoodUsage.objects.filter(user=u).values_list("food_id", "uses")) == {
+        (foods[6].pk, 1), (foods[7].pk, 1),
+    }
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(f"/meals/{meal.pk}/delete/")
+    assert favorites.food_ids(u.pk) == [foods[6].pk]
+
+
+def test_rebuild_matches_incremental_usage(diner):
+    client, u, foods = diner
+    for i in range(6):
+        _log(client, foods[i % 2], date.today() - timedelta(days=i))
+    before = set(FoodUsage.objects.values_list("user_id", "food_id", "uses", "last_used"))
+    assert favorites.rebuild() == 2
+    assert set(FoodUsage.objects.values_list("user_id", "food_id", "uses", "last_used")) == before
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_import_foods.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import io
+import json
+import sys
+
+from django.core.management import call_command
+
+from calories.imports import import_foods
+from calories.models import FoodItem
+
+
+def test_csv_import_upserts_and_rejects(db, tmp_path):
+    FoodItem.objects.create(name="Banana", calories_per_100g=1)
+    src = tmp_path / "foods.csv"
+    src.write_text(
+        "name,calories_per_100g,protein_g,carbs_g,fat_g\n"
+        "Banana,89,1.1,22.8,0.3\n"
+        "Lentils,116,9,20,0.4\n"
+        ",50,0,0,0\n"
+        "Bad,lots,0,0,0\n"
+    )
+    stats = import_foods(str(src), batch_size=2)
+    assert (stats.read, stats.created, stats.updated, stats.rejected) == (4, 1, 1, 2)
+    assert [r["line"] for r in stats.rejects] == [4, 5]
+    assert FoodItem.objects.get(name="Banana").calories_per_100g == 89
+    assert FoodItem.objects.count() == 2
+
+
+def test_ndjson_command_writes_rejects(db, tmp_path):
+    src = tmp_path / "foods.ndjson"
+    rows = [
+        {"name": "Tofu", "calories_per_100g": 76, "protein_g": 8, "carbs_g": 1.9, "fat_g": 4.8},
+        {"name": "Tofu", "calories_per_100g": 80, "protein_g": 8, "carbs_g": 2, "fat_g": 5},
+        {"name": "x" * 200, "calories_per_100g": 1, "protein_g": 0, "carbs_g": 0, "fat_g": 0},
+    ]
+    src.write_text("\n".join(json.dumps(r) for r in rows) + "\nnot json\n")
+    rejects = tmp_path / "rejects.ndjson"
+
+    call_command("import_foods", str(src), "--rejects", str(rejects))
+
+    assert FoodItem.objects.get(name="Tofu").calories_per_100g == 80
+    assert len(rejects.read_text().splitlines()) == 2
+
+
+def test_stdin_import_leaves_stdin_open(db, monkeypatch):
+    row = {"name": "Kale", "calories_per_100g": 49, "protein_g": 4.3, "carbs_g": 9, "fat_g": 0.9}
+    stdin = io.StringIO(json.dumps(row) + "\n")
+    monkeypatch.setattr(sys, "stdin", stdin)
+    stats = import_foods("-", fmt="ndjson")
+    assert stats.created == 1 and not stdin.closed
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_jobs.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import F
+
+from calories import jobs, rollups, tasks
+from calories.imports import import_foods
+from calories.models import DailyNutritionSummary, FoodItem, Job, MealEntry
+
+
+def _log(user, food, day, grams):
+    meal = MealEntry.objects.create(user=user, date=day, food=food, quantity_g=grams)
+    rollups.meal_added(meal)
+    return meal
+
+
+def _kcal(user, day):
+    return DailyNutritionSummary.objects.get(user=user, date=day).kcal
+
+
+@pytest.fixture
+def diary(db):
+    u = User.objects.create_user("jobs", password="pass12345")
+    rice = FoodItem.objects.create(name="Rice", calories_per_100g=130)
+    egg = FoodItem.objects.create(name="Egg", calories_per_100g=155, protein_g=13)
+    _log(u, rice, date(2025, 5, 1), 200)
+    _log(u, egg, date(2025, 5, 1), 100)
+    _log(u, rice, date(2025, 5, 2), 100)
+    return u, rice, egg
+
+
+def test_food_edit_queues_recompute(diary):
+    u, rice, egg = diary
+    assert not Job.objects.exists()
+    rice.name = "White rice"
+    rice.save()
+    assert not Job.objects.exists()  # nutrients unchanged
+
+    rice.calories_per_100g = 150
+    rice.save()
+    job = Job.objects.get()
+    assert (job.kind, job.payload, job.status) == (
+        "recompute_food_rollups", {"food_ids": [rice.pk]}, "queued",
+    )
+    assert _kcal(u, date(2025, 5, 1)) == 415  # stale until the worker runs
+
+    assert jobs.drain() == 1
+    assert _kcal(u, date(2025, 5, 1)) == 455 and _kcal(u, date(2025, 5, 2)) == 150
+    assert Job.objects.get().status == Job.Status.DONE
+    assert rollups.find_drift() == []
+
+
+def test_recompute_continues_in_chunks(diary, monkeypatch):
+    u, rice, egg = diary
+    monkeypatch.setattr(tasks, "RECOMPUTE_CHUNK", 1)
+    FoodItem.objects.filter(pk=rice.pk).update(calories_per_100g=100)
+    jobs.enqueue("recompute_food_rollups", {"food_ids": [rice.pk]})
+    assert jobs.drain() == 2
+    assert list(Job.objects.values_list("payload", flat=True).order_by("id")) == [
+        {"food_ids": [rice.pk]},
+        {"food_ids": [rice.pk], "after": [u.pk, "2025-05-01"]},
+    ]
+    assert rollups.find_drift() == []
+
+
+def test_import_update_queues_changed_foods(diary, tmp_path):
+    u, rice, egg = diary
+    path = tmp_path / "foods.csv"
+    path.write_text(
+        "name,calories_per_100g,protein_g,carbs_g,fat_g\n"
+        "Rice,130,0,0,0\nEgg,143,12.6,0.7,9.5\nOats,389,17,66,7\n"
+    )
+    import_foods(str(path))
+    assert Job.objects.get().payload == {"food_ids": [egg.pk]}
+    jobs.drain()
+    assert _kcal(u, date(2025, 5, 1)) == 403
+    assert rollups.find_drift() == []
+
+
+def test_snapshot_nutrients_keep_history(db, settings):
+    settings.CALORIES_SNAPSHOT_NUTRIENTS = True
+    u = User.objects.create_user("hist", password="pass12345")
+    rice = FoodItem.objects.create(name="Rice", calories_per_100g=130)
+    egg = FoodItem.objects.create(name="Egg", calories_per_100g=155)
+    meal = _log(u, rice, date(2025, 5, 1), 200)
+    assert meal.logged_kcal_100g == 130
+
+    rice.calories_per_100g = 150
+    rice.save()
+    jobs.drain()
+    meal.refresh_from_db()
+    assert meal.calories == 260 and _kcal(u, date(2025, 5, 1)) == 260
+
+    meal = MealEntry.objects.get(pk=meal.pk)
+    before = rollups.MealSnapshot.of(meal)
+    meal.food = egg
+    meal.save()
+    rollups.meal_changed(before, meal)
+    assert meal.logged_kcal_100g == 155 and _kcal(u, date(2025, 5, 1)) == 310
+    assert rollups.find_drift() == []
+
+
+def test_failed_job_retries_then_fails(db, monkeypatch):
+    calls = []
+
+    def explode(payload):
+        calls.append(payload)
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(jobs.HANDLERS, "explode", explode)
+    job = jobs.enqueue("explode", {"n": 1})
+    jobs.drain()
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (Job.Status.QUEUED, 1) and "boom" in job.last_error
+    assert job.run_after > job.updated_at
+
+    for _ in range(2, jobs.MAX_ATTEMPTS + 1):
+        Job.objects.filter(pk=job.pk).update(run_after=job.created_at)
+        jobs.drain()
+    job.refresh_from_db()
+    assert (job.status, job.attempts, len(calls)) == (
+        Job.Status.FAILED, jobs.MAX_ATTEMPTS, jobs.MAX_ATTEMPTS,
+    )
+
+
+def test_stale_jobs_requeued_and_worker_command(diary):
+    u, rice, egg = diary
+    job = jobs.enqueue("recompute_food_rollups", {"food_ids": [egg.pk]})
+    assert [j.pk for j in jobs.claim("dead-worker")] == [job.pk]
+    assert jobs.drain() == 0
+    Job.objects.filter(pk=job.pk).update(locked_at=job.created_at - timedelta(hours=1))
+    call_command("run_jobs", "--burst")
+    job.refresh_from_db()
+    assert job.status == Job.Status.DONE and job.attempts == 1
+
+
+def test_requeued_batch_jobs_are_not_run_twice(db, monkeypatch):
+    calls = []
+
+    def slow(payload):
+        calls.append(payload["n"])
+        if payload["n"] == 0:
+            # The first job outlives STALE_AFTER: the rest of the batch looks
+            # abandoned, so another worker requeues and runs it.
+            Job.objects.filter(status=Job.Status.RUNNING).exclude(payload__n=0).update(
+                locked_at=F("locked_at") - jobs.STALE_AFTER - timedelta(minutes=1),
+            )
+            assert jobs.work("other-worker", burst=True) == 2
+
+    monkeypatch.setitem(jobs.HANDLERS, "slow", slow)
+    for n in range(3):
+        jobs.enqueue("slow", {"n": n})
+    assert jobs.work("worker", burst=True, batch=3) == 1
+    assert calls == [0, 1, 2]
+    assert set(Job.objects.values_list("status", "attempts")) == {(Job.Status.DONE, 1)}
+
+
+def test_started_job_is_restamped(db, monkeypatch):
+    monkeypatch.setitem(jobs.HANDLERS, "noop", lambda payload: None)
+    job = jobs.enqueue("noop")
+    [claimed] = jobs.claim("worker")
+    Job.objects.filter(pk=job.pk).update(locked_at=job.created_at - timedelta(hours=1))
+    assert jobs.start(claimed, "worker") and not jobs.start(claimed, "other-worker")
+    assert jobs.requeue_stale() == 0
+
+
+def test_unknown_kind_rejected(db):
+    with pytest.raises(ValueError):
+        jobs.enqueue("nope")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_load_generator.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import random
+import time
+
+import pytest
+from bench_load import ACTIONS, MIXES, InProcessSession, Recorder, VirtualUser, parse_mix, summarize
+from django.contrib.auth.models import User
+from harness import seed
+
+from calories.models import MealEntry
+
+
+def test_mixes_only_name_known_actions():
+    for mix in MIXES.values():
+        assert set(mix) <= ACTIONS
+    assert parse_mix("dashboard=5,log_meal") == {"dashboard": 5, "log_meal": 1}
+    with pytest.raises(ValueError, match="unknown action"):
+        parse_mix("dashboard=5,explode=1")
+
+
+def test_every_action_succeeds_in_process(db):
+    usernames = seed(users=2, foods=20, meals_per_user=5)
+    recorder = Recorder(start_at=time.perf_counter())
+    food_ids = list(MealEntry.objects.values_list("food_id", flat=True))
+    user = VirtualUser(InProcessSession, usernames[0], food_ids, random.Random(1), recorder)
+    assert user.login()
+    for action in sorted(ACTIONS):
+        getattr(user, action)()
+    assert recorder.errors == {}
+    expected = {"login", "dashboard", "meal_create", "meal_bulk", "register", "plan_api"}
+    assert expected <= set(recorder.samples)
+    assert MealEntry.objects.count() == 2 * 5 + 1 + 5
+    assert User.objects.filter(username__startswith="load-").count() == 1
+
+
+def test_summary_merges_processes_per_url_name():
+    parts = [
+        {"samples": {"dashboard": [1.0, 2.0, 3.0]}, "errors": {}},
+        {"samples": {"dashboard": [4.0], "meal_create": [10.0, 20.0]},
+         "errors": {"meal_create": {"database_locked": 1}}},
+    ]
+    totals = summarize(parts, seconds=2.0)
+    assert totals["requests"] == 6 and totals["rps"] == 3.0
+    dashboard = totals["urls"]["dashboard"]
+    assert dashboard["p50_ms"] == 3.0 and dashboard["p99_ms"] == 4.0
+    assert totals["urls"]["meal_create"]["error_rate"] == 0.5
+    assert totals["error_kinds"] == {"database_locked": 1}
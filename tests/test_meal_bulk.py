@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_meal_bulk.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import json
+from datetime import date
+
+from django.contrib.auth.models import User
+
+from calories import rollups
+from calories.models import DailyNutritionSummary, FoodItem, MealEntry
+
+
+def _post(client, entries):
+    body = json.dumps({"entries": entries})
+    return client.post("/meals/bulk/", body, content_type="application/json")
+
+
+def test_bulk_sync_is_batched_and_idempotent(client, db, django_assert_max_num_queries):
+    u = User.objects.create_user("nina", password="pass12345")
+    foods = [FoodItem.objects.create(name=f"Food {i}", calories_per_100g=100 + i) for i in range(5)]
+    client.force_login(u)
+    entries = [
+        {
+            "date": f"2025-06-{1 + i % 3:02d}", "food": foods[i % 5].pk, "quantity_g": 50,
+            "key": f"k{i}",
+        }
+        for i in range(200)
+    ]
+
+    # Includes the two calories.favorites writes (insert-or-ignore, one UPDATE).
+    with django_assert_max_num_queries(14):
+        r = _post(client, entries)
+    assert r.status_code == 201
+    assert r.json()["created"] == 200
+    assert MealEntry.objects.filter(user=u).count() == 200
+    assert DailyNutritionSummary.objects.get(user=u, date=date(2025, 6, 1)).entries == 67
+    assert rollups.find_drift() == []
+
+    new = {"date": "2025-06-04", "food": foods[0].pk, "quantity_g": 1, "key": "new"}
+    retry = _post(client, entries[:10] + [new])
+    assert retry.json()["created"] == 1 and retry.json()["duplicates"] == 10
+    assert MealEntry.objects.filter(user=u).count() == 201
+
+
+def test_bulk_sync_rejects_whole_batch_on_invalid_entry(client, db):
+    u = User.objects.create_user("omar", password="pass12345")
+    food = FoodItem.objects.create(name="Plum", calories_per_100g=46)
+    client.force_login(u)
+    r = _post(client, [
+        {"date": "2025-06-01", "food": food.pk, "quantity_g": 80},
+        {"date": "not-a-date", "food": 999999, "quantity_g": "x"},
+    ])
+    assert r.status_code == 400
+    assert set(r.json()["results"][1]["errors"]) == {"date", "food", "quantity_g"}
+    assert MealEntry.objects.count() == 0
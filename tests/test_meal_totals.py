@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_meal_totals.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+from datetime import date
+
+from django.contrib.auth.models import User
+
+from calories.models import FoodItem, MealEntry
+
+
+def test_totals_and_daily_totals_match_python_sum(db, django_assert_num_queries):
+    u = User.objects.create_user("bob", password="pass12345")
+    oats = FoodItem.objects.create(
+        name="Oats", calories_per_100g=389, protein_g=16.9, carbs_g=66.3, fat_g=6.9
+    )
+    egg = FoodItem.objects.create(
+        name="Egg", calories_per_100g=155, protein_g=13, carbs_g=1.1, fat_g=11
+    )
+    d1, d2 = date(2025, 1, 1), date(2025, 1, 2)
+    MealEntry.objects.create(user=u, date=d1, food=oats, quantity_g=80)
+    MealEntry.objects.create(user=u, date=d1, food=egg, quantity_g=120)
+    MealEntry.objects.create(user=u, date=d2, food=egg, quantity_g=50)
+
+    with django_assert_num_queries(1):
+        totals = MealEntry.objects.filter(user=u, date=d1).totals()
+    assert totals["entries"] == 2
+    assert totals["kcal"] == round(389 * 0.8 + 155 * 1.2, 2)
+    assert totals["protein_g"] == round(16.9 * 0.8 + 13 * 1.2, 2)
+
+    with django_assert_num_queries(1):
+        days = MealEntry.objects.daily_totals(u, (d1, d2))
+    assert [d["date"] for d in days] == [d1, d2]
+    assert days[1]["kcal"] == 77.5 and days[1]["entries"] == 1
+
+    annotated = MealEntry.objects.with_nutrients().get(user=u, date=d2)
+    assert round(annotated.kcal, 2) == annotated.calories
+
+
+def test_dashboard_shows_consumed_totals(client, db):
+    from calories.models import UserProfile
+
+    u = User.objects.create_user("carol", password="pass12345")
+    UserProfile.objects.create(user=u, sex="F", age=28, height_cm=165, weight_kg=60)
+    rice = FoodItem.objects.create(name="Rice", calories_per_100g=130)
+    client.force_login(u)
+    client.post("/meals/new/", {"date": date.today(), "food": rice.pk, "quantity_g": 250})
+
+    r = client.get("/")
+    assert r.status_code == 200
+    assert r.context["consumed"] == 325.0
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_pagination.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+
+from calories.models import FoodItem, MealEntry
+from calories.pagination import paginate
+
+
+def test_keyset_pages_walk_forward_and_back(db):
+    u = User.objects.create_user("ivan", password="pass12345")
+    food = FoodItem.objects.create(name="Soup", calories_per_100g=40)
+    start = date(2025, 1, 1)
+    # two entries per day so ties on date are broken by id
+    for i in range(10):
+        day = start + timedelta(days=i // 2)
+        MealEntry.objects.create(user=u, date=day, food=food, quantity_g=i + 1)
+    expected = list(MealEntry.objects.filter(user=u).order_by("-date", "-id"))
+    ordering = ("-date", "-id")
+
+    seen, page = [], paginate(MealEntry.objects.filter(user=u), ordering, size=3)
+    while True:
+        seen.extend(page.items)
+        if not page.has_next:
+            break
+        page = paginate(MealEntry.objects.filter(user=u), ordering, after=page.next_cursor, size=3)
+    assert seen == expected
+
+    back = paginate(MealEntry.objects.filter(user=u), ordering, before=page.prev_cursor, size=3)
+    assert back.items == expected[6:9]
+
+
+def test_meal_list_view_filters_and_pages(client, db):
+    u = User.objects.create_user("jade", password="pass12345")
+    food = FoodItem.objects.create(name="Kiwi", calories_per_100g=61)
+    for day in range(1, 8):
+        MealEntry.objects.create(user=u, date=date(2025, 2, day), food=food, quantity_g=100)
+    client.force_login(u)
+
+    r = client.get("/meals/", {"from": "2025-02-02", "to": "2025-02-06", "size": 3})
+    assert [m.date.day for m in r.context["meals"]] == [6, 5, 4]
+    r = client.get("/meals/" + r.context["next_url"])
+    assert [m.date.day for m in r.context["meals"]] == [3, 2]
+    assert r.context["next_url"] is None
+
+    assert client.get("/meals/", {"after": "garbage"}).status_code == 400
+
+
+def test_food_list_pages_by_name(client, db):
+    client.force_login(User.objects.create_user("kai", password="pass12345"))
+    for name in ["Pear", "Apple", "Fig", "Date", "Lime"]:
+        FoodItem.objects.create(name=name, calories_per_100g=50)
+    r = client.get("/foods/", {"size": 2})
+    assert [f.name for f in r.context["foods"]] == ["Apple", "Date"]
+    r = client.get("/foods/" + r.context["next_url"])
+    assert [f.name for f in r.context["foods"]] == ["Fig", "Lime"]
+    r = client.get("/foods/" + r.context["prev_url"])
+    assert [f.name for f in r.context["foods"]] == ["Apple", "Date"]
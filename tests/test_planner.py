@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_planner.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import numpy as np
+import pytest
+from django.contrib.auth.models import User
+
+from calories import catalog, planner
+from calories.models import FoodItem, UserProfile
+
+
+def _columns(n, seed=1):
+    rng = np.random.default_rng(seed)
+    protein, carbs, fat = rng.gamma(1.5, 5, n), rng.gamma(1.2, 15, n), rng.gamma(1.0, 6, n)
+    columns = np.vstack([4 * protein + 4 * carbs + 9 * fat, protein, carbs, fat])
+    columns[:, 0] = np.nan  # id 0 is never a food
+    return columns
+
+
+@pytest.fixture
+def no_names(monkeypatch):
+    monkeypatch.setattr(planner, "_food_names", lambda ids: {})
+
+
+@pytest.mark.parametrize("kcal,split", [(1500, (0.30, 0.40, 0.30)), (2600, planner.DEFAULT_SPLIT)])
+def test_plan_hits_target_within_tolerance(no_names, kcal, split):
+    plan = planner.plan_meals(kcal, split=split, columns=_columns(20000))
+    assert plan.within_tolerance and len(plan.items) == planner.DEFAULT_ITEMS
+    target = planner.macro_targets(kcal, split)
+    for value, name in zip(target, ("kcal", "protein_g", "carbs_g", "fat_g")):
+        assert abs(plan.totals[name] / value - 1) <= plan.tolerance
+    ids = [item["food_id"] for item in plan.items]
+    assert len(set(ids)) == len(ids) and 0 not in ids
+    grams = [item["grams"] for item in plan.items]
+    assert all(planner.MIN_GRAMS <= g <= planner.MAX_GRAMS and g % 5 == 0 for g in grams)
+
+
+def test_plan_is_seeded_and_honours_exclude(no_names):
+    columns = _columns(5000)
+    first = planner.plan_meals(2000, columns=columns)
+    assert planner.plan_meals(2000, columns=columns).items == first.items
+    excluded = [item["food_id"] for item in first.items]
+    other = planner.plan_meals(2000, columns=columns, exclude=excluded)
+    assert not {item["food_id"] for item in other.items} & set(excluded)
+
+
+def test_time_budget_bounds_hopeless_plans(no_names):
+    # Two foods cannot carry 4000 kcal at 400 g each: best effort, on time.
+    plan = planner.plan_meals(4000, items=2, columns=_columns(100000), time_budget_ms=50)
+    assert not plan.within_tolerance and len(plan.items) == 2
+    assert plan.attempts >= 1 and plan.elapsed_ms < 200
+
+
+def test_tolerant_attempt_beats_lower_error(no_names, monkeypatch):
+    # The first attempt misses the tolerance but has the lowest weighted error.
+    improve, attempts = planner._Search.improve, []
+
+    def skewed(self, chosen, grams, deadline):
+        chosen, grams = improve(self, chosen, grams, deadline)
+        attempts.append(len(attempts) + 1)
+        return chosen, grams * 0.5 if attempts == [1] else grams
+
+    monkeypatch.setattr(planner._Search, "improve", skewed)
+    monkeypatch.setattr(planner._Search, "error", lambda self, c, g: float(len(attempts) > 1))
+    plan = planner.plan_meals(2000, columns=_columns(20000))
+    assert plan.attempts >= 2 and plan.within_tolerance
+
+
+def test_empty_catalog_and_bad_input(no_names):
+    plan = planner.plan_meals(2000, columns=np.full((4, 3), np.nan))
+    assert plan.items == [] and not plan.within_tolerance
+    for kwargs in ({"kcal": 0}, {"kcal": float("nan")}, {"kcal": 2000, "split": (0.5, 0.5, 0.5)},
+                   {"kcal": 2000, "split": (float("nan"), 0.5, 0.5)},
+                   {"kcal": 2000, "split": (-0.2, 0.6, 0.6)},
+                   {"kcal": 2000, "items": 0}, {"kcal": 2000, "tolerance": 0}):
+        with pytest.raises(ValueError):
+            planner.plan_meals(columns=_columns(10), **kwargs)
+
+
+def test_zero_share_is_left_out_of_the_error(no_names):
+    plan = planner.plan_meals(2000, split=(0, 0.5, 0.5), columns=_columns(20000))
+    assert plan.target["protein_g"] == 0 and plan.deviation_pct["protein_g"] is None
+    assert all(np.isfinite(list(plan.totals.values())))
+    assert all(np.isfinite([v for v in plan.deviation_pct.values() if v is not None]))
+    assert abs(plan.deviation_pct["kcal"]) <= plan.tolerance * 100
+
+
+@pytest.fixture
+def planner_client(client, db, settings, tmp_path):
+    settings.CALORIES_CATALOG_DIR = str(tmp_path)
+    u = User.objects.create_user("plan", password="pass12345")
+    UserProfile.objects.create(user=u, sex="M", age=30, height_cm=180, weight_kg=80)
+    FoodItem.objects.bulk_create([
+        FoodItem(name="Chicken breast", calories_per_100g=165, protein_g=31, carbs_g=0, fat_g=3.6),
+        FoodItem(name="Rice", calories_per_100g=130, protein_g=2.7, carbs_g=28, fat_g=0.3),
+        FoodItem(name="Olive oil", calories_per_100g=884, protein_g=0, carbs_g=0, fat_g=100),
+        FoodItem(name="Oats", calories_per_100g=389, protein_g=17, carbs_g=66, fat_g=7),
+        FoodItem(name="Greek yogurt", calories_per_100g=97, protein_g=9, carbs_g=3.6, fat_g=5),
+        FoodItem(name="Banana", calories_per_100g=89, protein_g=1.1, carbs_g=23, fat_g=0.3),
+        FoodItem(name="Almonds", calories_per_100g=579, protein_g=21, carbs_g=22, fat_g=50),
+    ])
+    catalog.catalog_changed()
+    client.force_login(u)
+    return client
+
+
+def test_plan_api_and_page(planner_client):
+    body = planner_client.get("/plan/generate/?kcal=2000&protein=30&carbs=40&fat=30").json()
+    assert body["target"]["kcal"] == 2000 and body["split"]["protein"] == pytest.approx(0.3)
+    assert body["within_tolerance"] and {i["name"] for i in body["items"]} <= set(
+        FoodItem.objects.values_list("name", flat=True)
+    )
+    # Without kcal the profile's target is used.
+    assert planner_client.get("/plan/generate/").json()["target"]["kcal"] > 2000
+    page = planner_client.get("/plan/?items=4")
+    assert page.status_code == 200 and page.content.count(b"<td>Total</td>") == 1
+    assert b"seed=1" in page.content
+
+
+def test_plan_rejects_bad_params(planner_client):
+    assert planner_client.get("/plan/generate/?kcal=lots").status_code == 400
+    nan = planner_client.get("/plan/generate/?kcal=nan")
+    assert nan.status_code == 400 and nan.json() == {"error": "kcal must be a finite number"}
+    assert planner_client.get("/plan/generate/?kcal=inf").status_code == 400
+    assert planner_client.get("/plan/generate/?protein=-10").status_code == 400
+    assert planner_client.get("/plan/generate/?protein=0&carbs=50&fat=50").status_code == 200
+    assert planner_client.get("/plan/generate/?items=50").json()["error"].startswith("items")
+    assert planner_client.get("/plan/?exclude=1,x").status_code == 400
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_projection.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import itertools
+
+import numpy as np
+import pytest
+from django.contrib.auth.models import User
+
+from calories import projection
+from calories.models import UserProfile
+from calories.utils import mifflin_st_jeor, target_calories_from_goal, tdee_from_bmr
+
+
+def _scalar_weights(sex, age, height, weight, activity, goal, weeks, adaptive=False):
+    intake, weights = None, [weight]
+    for _ in range(weeks):
+        tdee = tdee_from_bmr(mifflin_st_jeor(sex, age, height, weight), activity)
+        if intake is None or adaptive:
+            intake = target_calories_from_goal(tdee, goal)
+        weight += (intake - tdee) * 7 / projection.KCAL_PER_KG
+        weight = max(weight, projection.MIN_WEIGHT_KG)
+        weights.append(weight)
+    return weights
+
+
+@pytest.mark.parametrize("adaptive", [False, True])
+def test_simulation_matches_week_by_week_formulas(adaptive):
+    grid = list(itertools.product(projection.ACTIVITY_LEVELS, projection.GOALS, (-10.0, 0.0, 7.5)))
+    activity, goal, delta = (np.array(column) for column in zip(*grid))
+    weights, intakes, tdees = projection.simulate(
+        "F", 41, 165.0, 72.0 + delta, activity, goal, 52, adaptive
+    )
+    assert weights.shape == intakes.shape == tdees.shape == (len(grid), 53)
+    for i, (a, g, d) in enumerate(grid):
+        assert weights[i].tolist() == _scalar_weights("F", 41, 165.0, 72.0 + d, a, g, 52, adaptive)
+
+
+def test_fixed_intake_deficit_shrinks_as_weight_falls():
+    goals = ["lose", "maintain", "gain"]
+    result = projection.project("M", 30, 180.0, 90.0, ["moderate"], goals, weeks=104)
+    lose, maintain, gain = result.scenarios
+    assert maintain["change_kg"] == 0 and lose["change_kg"] < 0 < gain["change_kg"]
+    losses = -np.diff(lose["weights_kg"])
+    assert losses[0] > losses[-1] > 0  # BMR falls with weight, so the loss slows down
+    assert lose["final_tdee_kcal"] < lose["tdee_kcal"]
+    assert lose["final_intake_kcal"] == lose["intake_kcal"]
+    # Recomputing the target keeps the 500 kcal deficit, so the loss stays linear.
+    adaptive = projection.project(
+        "M", 30, 180.0, 90.0, ["moderate"], ["lose"], weeks=104, adaptive=True
+    )
+    assert adaptive.scenarios[0]["final_weight_kg"] < lose["final_weight_kg"]
+    assert result.checkpoints() == [18, 36, 54, 72, 90, 104]
+
+
+def test_bad_input_is_rejected():
+    profile = {"sex": "M", "age": 30, "height_cm": 180.0, "weight_kg": 80.0}
+    for kwargs in ({"sex": "X"}, {"age": 0}, {"activity_levels": ["couch"]}, {"goals": ["bulk"]},
+                   {"weeks": 0}, {"weeks": projection.MAX_WEEKS + 1}, {"weight_deltas_kg": [-60]},
+                   {"weight_deltas_kg": range(200)}, {"weight_kg": float("nan")},
+                   {"height_cm": float("inf")}, {"weight_deltas_kg": [float("nan")]}):
+        with pytest.raises(ValueError):
+            projection.project(**{**profile, **kwargs})
+
+
+@pytest.fixture
+def coach(client, db):
+    u = User.objects.create_user("coach", password="pass12345")
+    UserProfile.objects.create(
+        user=u, sex="M", age=30, height_cm=180, weight_kg=80, goal="maintain"
+    )
+    client.force_login(u)
+    return u, client
+
+
+def test_api_is_cached_by_parameters_and_leaves_profile_alone(
+    coach, django_assert_max_num_queries, monkeypatch,
+):
+    u, client = coach
+    url = "/projection/simulate/?activity=light,active&goal=lose&goal=gain&delta=-5,0&weeks=12"
+    response = client.get(url)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["baseline"] == {"sex": "M", "age": 30, "height_cm": 180.0, "weight_kg": 80.0}
+    assert len(body["scenarios"]) == 8 and len(body["scenarios"][0]["weights_kg"]) == 13
+    first = body["scenarios"][:3]
+    assert [(s["activity_level"], s["goal"], s["weight_delta_kg"]) for s in first] == [
+        ("light", "lose", -5.0), ("light", "lose", 0.0), ("light", "gain", -5.0),
+    ]
+
+    assert client.get("/projection/simulate/?weeks=lots").status_code == 400
+    assert client.get("/projection/simulate/?goal=bulk").status_code == 400
+    for bad in ("weight_kg=nan", "height_cm=inf", "delta=nan", "delta=0,-inf"):
+        assert client.get(f"/projection/simulate/?{bad}").status_code == 400, bad
+
+    monkeypatch.setattr(
+        projection, "project", lambda **kw: pytest.fail("not served from the cache")
+    )
+    with django_assert_max_num_queries(3):  # session, user, profile
+        assert client.get(url).json() == body
+    profile = UserProfile.objects.get(user=u)
+    assert (profile.weight_kg, profile.goal) == (80, "maintain")
+
+
+def test_html_view_and_missing_profile(coach, client):
+    page = client.get("/projection/?weight_kg=95&weeks=8&activity=sedentary")
+    assert page.status_code == 200
+    assert page.content.decode().count("<tr>") == 1 + len(projection.GOALS)
+    assert page.context["projection"].baseline["weight_kg"] == 95
+    UserProfile.objects.all().delete()
+    assert client.get("/projection/").status_code == 400
+    assert client.get("/projection/?sex=F&age=50&height_cm=160&weight_kg=70").status_code == 200
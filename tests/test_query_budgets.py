@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_query_budgets.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+SQL query budgets for the main views. Counts must not grow with the data,
+so each view is checked against a small and a larger seed; a new N+1 fails
+here before it shows up in benchmarks/bench_views.py.
+===========================================================================
+"""
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from harness import seed
+
+from calories.models import UserProfile
+
+# Counts include the session and user lookups made by login_required.
+QUERY_BUDGETS = {
+    "/": 5,
+    "/meals/": 3,
+    "/foods/": 3,
+    "/calculator/": 3,
+    "/meals/new/": 5,
+}
+
+
+@pytest.mark.parametrize("meals_per_user", [5, 60])
+@pytest.mark.parametrize("path", sorted(QUERY_BUDGETS))
+def test_view_query_budget(client, db, django_assert_max_num_queries, path, meals_per_user):
+    usernames = seed(users=2, foods=30, meals_per_user=meals_per_user)
+    user = User.objects.get(username=usernames[0])
+    client.force_login(user)
+    cache.clear()
+    with django_assert_max_num_queries(QUERY_BUDGETS[path]):
+        assert client.get(path).status_code == 200
+
+
+def test_calculator_post_query_budget(client, db, django_assert_max_num_queries):
+    user = User.objects.get(username=seed(users=1, foods=5, meals_per_user=5)[0])
+    client.force_login(user)
+    profile = UserProfile.objects.get(user=user)
+    fields = ("sex", "age", "height_cm", "weight_kg", "activity_level", "goal")
+    data = {f: getattr(profile, f) for f in fields}
+    with django_assert_max_num_queries(4):
+        assert client.post("/calculator/", data).status_code == 200
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_query_plans.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+EXPLAIN the queries the hot views actually run: each MealEntry/FoodItem
+read must be an index SEARCH, never a full table SCAN.
+===========================================================================
+"""
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from harness import seed
+
+from calories.models import FoodItem
+
+
+def _plans(client, path, table):
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(path).status_code == 200
+    plans = []
+    with connection.cursor() as cursor:
+        for q in ctx.captured_queries:
+            if f'FROM "{table}"' in q["sql"]:
+                cursor.execute("EXPLAIN QUERY PLAN " + q["sql"])
+                plans.append(" / ".join(row[-1] for row in cursor.fetchall()))
+    assert plans, f"no {table} query on {path}"
+    return plans
+
+
+@pytest.fixture
+def seeded_client(client, db):
+    usernames = seed(users=20, foods=300, meals_per_user=100)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    client.force_login(User.objects.get(username=usernames[0]))
+    return client
+
+
+@pytest.mark.parametrize("path", ["/", "/meals/", "/meals/?from=2025-01-01&to=2025-06-30"])
+def test_meal_reads_use_user_date_index(seeded_client, path):
+    for plan in _plans(seeded_client, path, "calories_mealentry"):
+        assert "meal_user_date_id_idx" in plan, plan
+        assert "SCAN calories_mealentry" not in plan, plan
+        assert "TEMP B-TREE" not in plan, plan  # ordering comes from the index
+
+
+def test_food_name_prefix_uses_index(db):
+    seed(users=1, foods=500, meals_per_user=0)
+    qs = FoodItem.objects.name_prefix("food 000012")
+    plan = qs.explain()
+    assert "food_name_upper_idx" in plan and "SCAN" not in plan, plan
+    assert qs.count() == 10
+    assert FoodItem.objects.name_prefix("FOOD 0000123").get().name == "Food 0000123"
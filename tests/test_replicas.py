@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_replicas.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import time
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.utils import load_backend
+from django.test import Client
+
+from calories import replicas
+from calories.models import FoodItem, MealEntry
+
+
+@pytest.fixture
+def replica(transactional_db, settings, tmp_path):
+    """A second SQLite file as ``replica1``, routed like DJANGO_READ_REPLICAS does."""
+    path = tmp_path / "replica.sqlite3"
+    # A connection outside settings.DATABASES, which the test case would refuse.
+    primary = connections["default"].settings_dict
+    connections["replica1"] = load_backend(primary["ENGINE"]).DatabaseWrapper(
+        {**primary, "NAME": str(path)}, "replica1",
+    )
+    settings.DATABASE_ROUTERS = ["calories.replicas.ReplicaRouter"]
+    settings.CALORIES_READ_REPLICAS = ["replica1"]
+    settings.CALORIES_REPLICA_CHECK_SECONDS = 0
+    after_auth = settings.MIDDLEWARE.index(
+        "django.contrib.auth.middleware.AuthenticationMiddleware"
+    ) + 1
+    settings.MIDDLEWARE = [
+        *settings.MIDDLEWARE[:after_auth],
+        "calories.replicas.ReplicaMiddleware",
+        *settings.MIDDLEWARE[after_auth:],
+    ]
+    replicas.reset_health()
+    yield path
+    connections["replica1"].close()
+    del connections["replica1"]
+    replicas.reset_health()
+
+
+def _settle(user):
+    # Pretend the user's last write is older than the sticky window.
+    cache.set(f"{replicas.WROTE_KEY_PREFIX}{user.pk}", time.time() - 3600, None)
+
+
+@pytest.fixture
+def diner(replica, client):
+    user = User.objects.create_user("kai", password="pass12345")
+    client.force_login(user)
+    rice = FoodItem.objects.create(name="Rice", calories_per_100g=130)
+    MealEntry.objects.create(user=user, date=date.today(), food=rice, quantity_g=100)
+    replicas.copy_to_replica("replica1")
+    # Only on the primary from here on.
+    beans = FoodItem.objects.create(name="Beans", calories_per_100g=120)
+    MealEntry.objects.create(user=user, date=date.today(), food=beans, quantity_g=80)
+    _settle(user)
+    return user, client, beans
+
+
+def test_router_sends_only_request_reads_to_a_healthy_replica(settings, monkeypatch):
+    settings.CALORIES_READ_REPLICAS = ["replica1"]
+    monkeypatch.setattr(replicas, "healthy", lambda alias: True)
+    router = replicas.ReplicaRouter()
+    assert router.db_for_read(MealEntry) == "default"  # commands, jobs, shell
+    token = replicas._current.set(replicas._Reads(replica=True))
+    try:
+        assert router.db_for_read(MealEntry) == "replica1"
+        assert router.db_for_write(MealEntry) == "default"
+        assert router.db_for_read(MealEntry) == "default"  # read-your-writes within the request
+    finally:
+        replicas._current.reset(token)
+    assert router.allow_migrate("replica1", "calories") is False
+    assert router.allow_migrate("default", "calories") is None
+
+
+def test_get_reads_replica_and_writes_stick_to_primary(diner):
+    user, client, beans = diner
+    page = client.get("/meals/").content.decode()
+    assert "Rice" in page and "Beans" not in page  # the replica's copy
+
+    meal = {"date": date.today(), "food": beans.pk, "quantity_g": 50}
+    response = client.post("/meals/new/", meal)
+    assert response.status_code == 302
+    assert replicas.COOKIE in response.cookies
+    assert "Beans" in client.get("/meals/").content.decode()
+
+    # Another device of the same user: no cookie, but the change is recent.
+    client.cookies.pop(replicas.COOKIE)
+    assert "Beans" in client.get("/meals/").content.decode()
+    _settle(user)
+    assert "Beans" not in client.get("/meals/").content.decode()
+
+
+def test_only_the_users_own_writes_pin_them_to_the_primary(diner, django_user_model):
+    _, client, beans = diner
+    admin = django_user_model.objects.create_superuser("ada", password="pass12345")
+    other = Client()
+    other.force_login(admin)
+    edit = {"name": "Black beans", "calories_per_100g": 130, "protein_g": 8, "carbs_g": 24,
+            "fat_g": 0.5}
+    assert other.post(f"/foods/{beans.pk}/edit/", edit).status_code == 302
+    assert "beans" not in client.get("/meals/").content.decode().lower()  # the replica's copy
+
+    cache.clear()  # a flushed or restarted cache has no recent writes on record
+    assert "beans" not in client.get("/meals/").content.decode().lower()
+
+
+def test_missing_or_lagging_replica_falls_back_to_primary(diner, replica, monkeypatch):
+    _, client, _ = diner
+    monkeypatch.setattr(replicas, "_sqlite_last_write", lambda alias="default": time.time() + 60)
+    assert replicas.replica_lag("replica1") > 5
+    assert "Beans" in client.get("/meals/").content.decode()
+
+    monkeypatch.undo()
+    replicas.reset_health()
+    assert "Beans" not in client.get("/meals/").content.decode()
+    connections["replica1"].close()
+    for suffix in ("", "-wal", "-shm"):
+        replica.with_name(replica.name + suffix).unlink(missing_ok=True)
+    assert replicas.replica_lag("replica1") is None
+    assert "Beans" in client.get("/meals/").content.decode()
+    assert not replica.exists()
+
+
+def test_transactions_read_from_primary(diner, settings):
+    token = replicas._current.set(replicas._Reads(replica=True))
+    try:
+        assert MealEntry.objects.count() == 1
+        with transaction.atomic():
+            assert MealEntry.objects.count() == 2
+    finally:
+        replicas._current.reset(token)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_reports.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+
+from calories import rollups
+from calories.models import FoodItem, MealEntry
+from calories.reports import trend_report
+
+
+def _log(user, food, day, grams):
+    rollups.meal_added(MealEntry.objects.create(user=user, date=day, food=food, quantity_g=grams))
+
+
+def test_trend_report_groups_and_streaks(db, django_assert_num_queries):
+    u = User.objects.create_user("quin", password="pass12345")
+    food = FoodItem.objects.create(name="Base", calories_per_100g=100, protein_g=10)
+    start = date(2025, 3, 3)  # a Monday
+    # 2000 kcal (on target) for days 0-4, 3000 on day 5, nothing on 6, on target 7-9
+    for i, grams in enumerate([2000, 2000, 2000, 2000, 2000, 3000, 0, 2000, 1000, 2000]):
+        if grams:
+            _log(u, food, start + timedelta(days=i), grams)
+    _log(u, food, start + timedelta(days=8), 1000)  # two entries that day
+
+    with django_assert_num_queries(2):
+        report = trend_report(u, start, start + timedelta(days=9), "week", target=2000)
+
+    assert [p["period"] for p in report.periods] == [start, start + timedelta(days=7)]
+    assert report.periods[0]["days_logged"] == 6 and report.periods[0]["kcal"] == 13000
+    assert report.periods[1]["entries"] == 4
+    assert report.summary["adherent_days"] == 8
+    assert report.summary["longest_streak"] == 5
+    assert report.summary["current_streak"] == 3
+
+
+def test_report_views(client, db):
+    u = User.objects.create_user("rosa", password="pass12345")
+    client.force_login(u)
+    assert client.get("/reports/").status_code == 200
+    params = {"from": "2025-01-01", "to": "2025-03-31", "granularity": "month"}
+    r = client.get("/reports/trend/", params)
+    assert r.status_code == 200 and r.json()["summary"]["days_in_range"] == 90
+    assert client.get("/reports/trend/", {"granularity": "year"}).status_code == 400
+    for tolerance in ("nan", "inf", "-0.1", "1", "lots"):
+        assert client.get("/reports/trend/", {"tolerance": tolerance}).status_code == 400
+    assert client.get("/reports/trend/", {"tolerance": "0.05"}).json()["tolerance"] == 0.05
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_request_timing.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import json
+import logging
+from io import StringIO
+
+import pytest
+from django.conf import settings as django_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+
+from calories import checks
+from calories.models import UserProfile
+
+MIDDLEWARE = "calories.instrumentation.RequestTimingMiddleware"
+
+
+@pytest.fixture
+def timed_client(client, db, settings):
+    settings.MIDDLEWARE = [MIDDLEWARE, *(m for m in django_settings.MIDDLEWARE if m != MIDDLEWARE)]
+    cache.clear()
+    u = User.objects.create_user("tim", password="pass12345")
+    UserProfile.objects.create(user=u, sex="F", age=40, height_cm=165, weight_kg=60,
+                               activity_level="light", goal="maintain")
+    client.force_login(u)
+    return client
+
+
+def _metrics(header):
+    return {m.split(";")[0].strip(): m for m in header.split(",")}
+
+
+def test_server_timing_header(timed_client, settings):
+    settings.CALORIES_SLOW_REQUEST_MS = 10_000
+    r = timed_client.get("/")
+    metrics = _metrics(r["Server-Timing"])
+    assert {"sql", "render", "formula", "view", "total"} <= set(metrics)
+    assert 'queries"' in metrics["sql"]
+
+
+def test_slow_requests_logged_with_worst_queries(timed_client, settings, caplog):
+    settings.CALORIES_SLOW_REQUEST_MS = 0
+    with caplog.at_level(logging.WARNING, logger="calories.slow_requests"):
+        timed_client.get("/meals/")
+    entry = json.loads(caplog.records[-1].getMessage())
+    assert entry["url_name"] == "meal_list" and entry["queries"] >= 1
+    assert entry["worst_queries"][0]["sql"].startswith("SELECT")
+
+
+def test_request_timings_command(timed_client, monkeypatch):
+    with pytest.raises(CommandError, match="shared cache"):
+        call_command("request_timings", stdout=StringIO())
+    # Same process as the middleware here, so the local cache stands in for a shared one.
+    monkeypatch.setattr(checks, "shared_cache", lambda alias="default": True)
+    for _ in range(3):
+        timed_client.get("/foods/")
+    out = StringIO()
+    call_command("request_timings", "--json", stdout=out)
+    assert json.loads(out.getvalue())["food_list"]["count"] == 3
+    call_command("request_timings", "--reset", stdout=StringIO())
+    out = StringIO()
+    call_command("request_timings", stdout=out)
+    assert "No requests recorded" in out.getvalue()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_rollups.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+from datetime import date
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from calories import rollups
+from calories.models import DailyNutritionSummary, FoodItem, MealEntry
+
+
+def _summary(user, day):
+    return DailyNutritionSummary.objects.filter(user=user, date=day).first()
+
+
+def test_views_keep_summary_in_step(client, db):
+    u = User.objects.create_user("dana", password="pass12345")
+    apple = FoodItem.objects.create(name="Apple", calories_per_100g=52, carbs_g=14)
+    bread = FoodItem.objects.create(name="Bread", calories_per_100g=265, protein_g=9)
+    d1, d2 = date(2025, 3, 1), date(2025, 3, 2)
+    client.force_login(u)
+
+    client.post("/meals/new/", {"date": d1, "food": apple.pk, "quantity_g": 200})
+    client.post("/meals/new/", {"date": d1, "food": bread.pk, "quantity_g": 50})
+    s = _summary(u, d1)
+    assert s.entries == 2 and round(s.kcal, 2) == 236.5
+
+    meal = MealEntry.objects.get(user=u, food=apple)
+    client.post(f"/meals/{meal.pk}/edit/", {"date": d2, "food": bread.pk, "quantity_g": 100})
+    assert _summary(u, d1).entries == 1 and round(_summary(u, d1).kcal, 2) == 132.5
+    assert round(_summary(u, d2).kcal, 2) == 265.0 and round(_summary(u, d2).protein_g, 2) == 9.0
+
+    client.post(f"/meals/{meal.pk}/delete/")
+    assert _summary(u, d2) is None
+    assert rollups.find_drift() == []
+
+
+def test_rebuild_command_fixes_drift(db):
+    u = User.objects.create_user("erin", password="pass12345")
+    food = FoodItem.objects.create(name="Milk", calories_per_100g=64)
+    MealEntry.objects.create(user=u, date=date(2025, 3, 1), food=food, quantity_g=250)
+
+    with pytest.raises(CommandError):
+        call_command("rebuild_daily_summaries", "--check")
+    call_command("rebuild_daily_summaries")
+    call_command("rebuild_daily_summaries", "--check")
+    assert _summary(u, date(2025, 3, 1)).kcal == 160.0
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_search.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from calories import search
+from calories.models import FoodItem
+from calories.search import FoodSearchIndex
+
+
+def test_index_ranks_prefix_and_tolerates_typos():
+    idx = FoodSearchIndex([
+        (1, "Chicken breast, grilled"),
+        (2, "Chickpeas, canned"),
+        (3, "Brown rice"),
+        (4, "Rice cake"),
+    ])
+    assert {h.id for h in idx.search("chick")[:2]} == {1, 2}
+    assert idx.search("chiken brest")[0].id == 1
+    assert idx.search("rice", limit=1)[0].id in (3, 4)
+
+    idx.remove(3)
+    idx.add(5, "Rice noodles")
+    assert 3 not in {h.id for h in idx.search("rice")}
+    assert 5 in {h.id for h in idx.search("noodle")}
+
+
+def test_search_endpoint_tracks_committed_food_writes(
+    client, db, django_capture_on_commit_callbacks,
+):
+    client.force_login(User.objects.create_user("finn", password="pass12345"))
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post("/foods/new/", {"name": "Greek yogurt", "calories_per_100g": 59,
+                                    "protein_g": 10, "carbs_g": 3.6, "fat_g": 0.4})
+    r = client.get("/foods/search/", {"q": "yoghurt"})
+    assert r.status_code == 200
+    [hit] = r.json()["results"]
+    assert hit["name"] == "Greek yogurt"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        FoodItem.objects.filter(pk=hit["id"]).delete()  # bulk delete, as in the admin
+    assert client.get("/foods/search/", {"q": "yogurt"}).json()["results"] == []
+
+
+def test_other_processes_replay_logged_changes(db):
+    index = search.get_index()
+    # Another process saves a food and logs the change.
+    version = search._next_version()
+    cache.set(search.CHANGE_KEY.format(version), [(991, "Buckwheat groats")])
+    assert search.get_index() is index
+    assert search.search_foods("buckwheat")[0].id == 991
+
+
+def test_log_gap_rebuilds_off_the_request_path(transactional_db):
+    index = search.get_index()
+    FoodItem.objects.bulk_create([FoodItem(name="Spelt flour", calories_per_100g=338)])
+    search._next_version()  # a bulk import elsewhere: no change logged
+
+    assert search.get_index() is index  # keeps serving the old copy
+    search._rebuild_thread.join()
+    assert search.get_index() is not index
+    assert search.search_foods("spelt")[0].name == "Spelt flour"
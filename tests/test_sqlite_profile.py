@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_sqlite_profile.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+
+The tuned SQLite profile on a real file: pragmas are applied to every
+connection and readers keep going while several writers contend.
+===========================================================================
+"""
+import threading
+
+import pytest
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+WRITERS, READERS, ROWS_PER_WRITER = 4, 2, 100
+
+
+def _connect(path):
+    return DatabaseWrapper({**connections.settings["default"], "NAME": str(path)}, alias="profile")
+
+
+@pytest.mark.skipif(not settings.SQLITE_TUNING, reason="DJANGO_SQLITE_TUNING=False")
+def test_pragmas_applied(tmp_path, db):
+    conn = _connect(tmp_path / "p.sqlite3")
+    with conn.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode")
+        assert cursor.fetchone()[0].lower() == settings.SQLITE_PRAGMAS["journal_mode"].lower()
+        cursor.execute("PRAGMA busy_timeout")
+        assert cursor.fetchone()[0] == settings.SQLITE_PRAGMAS["busy_timeout"]
+    assert conn.transaction_mode == "IMMEDIATE"
+    conn.close()
+
+
+def test_reads_continue_while_writers_active(tmp_path, db):
+    path = tmp_path / "c.sqlite3"
+    setup = _connect(path)
+    with setup.cursor() as cursor:
+        cursor.execute("CREATE TABLE meal (id INTEGER PRIMARY KEY, kcal REAL)")
+    setup.close()
+
+    errors, reads, done = [], [], threading.Event()
+
+    def writer():
+        # Thread-local alias, so atomic() opens transactions with the configured
+        # transaction_mode (BEGIN IMMEDIATE) like the app's own writes.
+        connections["profile"] = conn = _connect(path)
+        try:
+            for i in range(ROWS_PER_WRITER):
+                with transaction.atomic(using="profile"), conn.cursor() as cursor:
+                    cursor.execute("INSERT INTO meal (kcal) VALUES (%s)", [i])
+        except Exception as exc:  # noqa: BLE001 - surfaced by the assertion below
+            errors.append(exc)
+        finally:
+            conn.close()
+            del connections["profile"]
+
+    def reader():
+        conn, n = _connect(path), 0
+        try:
+            while not done.is_set():
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT COUNT(*), SUM(kcal) FROM meal")
+                    cursor.fetchone()
+                n += 1
+        except Exception as exc:  # noqa: BLE001
+            errors.append(exc)
+        finally:
+            reads.append(n)
+            conn.close()
+
+    writers = [threading.Thread(target=writer) for _ in range(WRITERS)]
+    readers = [threading.Thread(target=reader) for _ in range(READERS)]
+    for t in readers + writers:
+        t.start()
+    for t in writers:
+        t.join()
+    done.set()
+    for t in readers:
+        t.join()
+
+    assert not errors, errors
+    check = _connect(path)
+    with check.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM meal")
+        assert cursor.fetchone()[0] == WRITERS * ROWS_PER_WRITER
+    check.close()
+    assert sum(reads) > 0
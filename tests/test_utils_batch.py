@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+===========================================================================
+Project: Django Calorie Calculator
+File: tests/test_utils_batch.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi-cs)
+Created: 2025-11-01
+Updated: 2025-11-01
+License: MIT License (see LICENSE file for details)
+===========================================================================
+"""
+import itertools
+
+import numpy as np
+
+from calories.utils import (
+    BmrResult,
+    energy_targets_batch,
+    mifflin_st_jeor,
+    target_calories_from_goal,
+    tdee_from_bmr,
+)
+
+
+def test_batch_matches_scalar_exactly():
+    combos = list(itertools.product(
+        ["M", "F"],
+        [18, 30, 67],
+        [150.5, 180.0],
+        [48.2, 80.0, 121.7],
+        ["sedentary", "light", "moderate", "active", "very_active", "unknown"],
+        ["lose", "maintain", "gain"],
+    ))
+    sex, age, height, weight, activity, goal = (list(col) for col in zip(*combos))
+
+    batch = energy_targets_batch(sex, age, height, weight, activity, goal)
+
+    assert len(batch) == len(combos)
+    for i, (s, a, h, w, act, g) in enumerate(combos):
+        bmr = mifflin_st_jeor(s, a, h, w)
+        tdee = tdee_from_bmr(bmr, act)
+        assert batch[i] == BmrResult(bmr, tdee, target_calories_from_goal(tdee, g))
+
+
+def test_batch_accepts_numpy_columns():
+    batch = energy_targets_batch(
+        np.array(["M"]), np.array([30]), np.array([180.0]), np.array([80.0]),
+        np.array(["moderate"]), np.array(["lose"]),
+    )
+    assert batch.bmr.tolist() == [1780.0]
+    assert batch.target_calories.tolist() == [1780.0 * 1.55 - 500]